@@ -3,35 +3,50 @@ import psutil
 import os
 from routes.home_routes import home_bp
 from routes.ai_routes import ai_bp
-from utils.rl_agent import start_continuous_rl_training
-from utils.live_monitor import LiveMonitor
-from utils.data_manager import shared_data_manager
+from routes.ingest_routes import ingest_bp
+from utils.services import BackgroundServices
 
-app = Flask(__name__)
+def create_app(config=None, services=None):
+    """
+    Build the Flask app and start its background services.
 
-# Register blueprints
-app.register_blueprint(home_bp)
-app.register_blueprint(ai_bp)
+    `services` is the role of this process (see utils/services.py):
+    'auto' elects one process to run LiveMonitor and the RL trainer, 'off'
+    starts nothing. It defaults to OPTIOS_SERVICES, else 'auto'.
+    """
+    app = Flask(__name__)
+    if config:
+        app.config.update(config)
 
-# Start background processes ONLY if we are in the main process (reloader safety)
-# The reloader spawns a child process. We want threads only in that child process or the main one if reloader is off.
-# WERKZEUG_RUN_MAIN is set by Flask when it spawns the child 'reloader' process.
-monitor = LiveMonitor(interval=5)
-rl_stop_event = None
+    # Register blueprints
+    app.register_blueprint(home_bp)
+    app.register_blueprint(ai_bp)
+    app.register_blueprint(ingest_bp)
 
-if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
-    monitor.start()
-    rl_stop_event = start_continuous_rl_training(interval=5)
+    # Resume the learned policy; OPTIOS_PRETRAIN=1 also replays optios.db before serving.
+    # OPTIOS_REWARD=simulation trains on simulated scheduler outcomes instead of sample deltas.
+    services = BackgroundServices(
+        services or os.environ.get('OPTIOS_SERVICES', 'auto'),
+        checkpoint_interval=float(os.environ.get('OPTIOS_CHECKPOINT_INTERVAL', 15)),
+        reward_mode=os.environ.get('OPTIOS_REWARD', 'delta'),
+        pretrain=os.environ.get('OPTIOS_PRETRAIN') == '1',
+    )
+    app.extensions['optios_services'] = services.start()
 
-# Inject context variables globally for templates
-@app.context_processor
-def inject_status():
-    return {
-        'cpu_count': psutil.cpu_count(logical=True),
-        'monitor_running': 'Yes' if monitor.running else 'No',
-        'rl_running': 'Yes' if rl_stop_event and not rl_stop_event.is_set() else 'No'
-    }
+    # Inject context variables globally for templates
+    @app.context_processor
+    def inject_status():
+        status = services.status()
+        return {
+            'cpu_count': psutil.cpu_count(logical=True),
+            'monitor_running': 'Yes' if status['monitor_running'] else 'No',
+            'rl_running': 'Yes' if status['rl_running'] else 'No'
+        }
+
+    return app
 
 if __name__ == '__main__':
     print("🟢 Flask app starting...")
-    app.run(debug=True, port=5001)
+    # The reloader runs the app in a child process (WERKZEUG_RUN_MAIN); only that one starts services
+    reloader_child = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    create_app(services=None if reloader_child else 'off').run(debug=True, port=5001)
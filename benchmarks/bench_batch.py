@@ -0,0 +1,72 @@
+"""
+Batch simulator benchmark: per-workload Python objects vs simulate_batch().
+
+Runs FCFS/SJF/RR over the same random workloads through the original
+per-object simulator, the event-driven engine and the vectorized batch path,
+and verifies the batch averages against the engine.
+
+    python -m benchmarks.bench_batch --workloads 20000 --processes 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.legacy import OSSimulator as LegacySimulator, Process
+from models import engine
+from models.batch import random_workloads
+from models.simulator import OSSimulator
+
+
+def run_legacy(bursts, arrivals, limit):
+    sim = LegacySimulator()
+    for b, a in zip(bursts[:limit].tolist(), arrivals[:limit].tolist()):
+        for name in ('fcfs', 'sjf', 'round_robin'):
+            sim.processes = [Process(i + 1, b[i], 1, 100, a[i]) for i in range(len(b))]
+            getattr(sim, name)()
+
+
+def run_engine(bursts, arrivals):
+    waits = np.empty((len(bursts), 3))
+    for w, (b, a) in enumerate(zip(bursts.tolist(), arrivals.tolist())):
+        for k, fn in enumerate((engine.fcfs, engine.sjf, engine.round_robin)):
+            waits[w, k] = sum(fn(a, b)[0]) / len(b)
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workloads', type=int, default=20000)
+    parser.add_argument('--processes', type=int, default=10)
+    parser.add_argument('--legacy-limit', type=int, default=1000,
+                        help='workloads to time through the legacy path (extrapolated)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    wl = random_workloads(args.workloads, args.processes, rng=args.seed)
+    bursts, arrivals = wl['bursts'], wl['arrivals']
+    limit = min(args.legacy_limit, args.workloads)
+
+    start = time.perf_counter()
+    run_legacy(bursts, arrivals, limit)
+    t_legacy = (time.perf_counter() - start) * args.workloads / limit
+
+    start = time.perf_counter()
+    expected = run_engine(bursts, arrivals)
+    t_engine = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = OSSimulator.simulate_batch(bursts, arrivals)
+    t_batch = time.perf_counter() - start
+
+    got = np.stack([r['Average Waiting Time'] for r in results.values()], axis=1)
+    assert np.allclose(got, expected), "batch results diverge from the engine"
+
+    print(f"{args.workloads} workloads x {args.processes} processes, FCFS+SJF+RR")
+    for label, t in (('legacy objects (extrapolated)', t_legacy), ('engine loop', t_engine),
+                     ('simulate_batch', t_batch)):
+        print(f"  {label:<30} {t:8.3f} s  {args.workloads / t:12.0f} workloads/s")
+
+
+if __name__ == '__main__':
+    main()
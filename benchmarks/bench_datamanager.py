@@ -0,0 +1,113 @@
+"""
+Sustained write throughput of DataManager.add_record().
+
+"before" is the original path: one sqlite3 connection, INSERT and commit per
+record on a rollback-journal database. "after" is the write-behind
+pipeline: records are queued and a background thread commits them in
+executemany batches over one WAL connection. Both report the producer-side
+rate and the end-to-end rate including the final flush.
+
+    python -m benchmarks.bench_datamanager --records 20000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from utils.data_manager import DataManager
+
+# The original statement, before the epoch-ms `ts` column existed
+LEGACY_INSERT_SQL = '''
+    INSERT INTO system_stats (timestamp, cpu_percent, memory_usage, ready_queue_size, avg_burst_time, avg_priority)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+def sample(i):
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'ready_queue_size': 400 + i % 50,
+        'avg_burst_time': 12.5,
+        'avg_priority': 4.2,
+        'memory_usage': 73.1,
+        'cpu_percent': 18.0
+    }
+
+
+def legacy_persist(db_path, record):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(LEGACY_INSERT_SQL, (
+        record['timestamp'], record['cpu_percent'], record['memory_usage'],
+        record['ready_queue_size'], record['avg_burst_time'], record['avg_priority']
+    ))
+    conn.commit()
+    conn.close()
+
+
+def fresh_manager(db_path, **kwargs):
+    # DataManager is a process-wide singleton; benchmarks need private instances
+    DataManager._instance = None
+    return DataManager(db_path=db_path, **kwargs)
+
+
+def count_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM system_stats').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def bench_before(tmp, records):
+    db_path = os.path.join(tmp, 'before.db')
+    fresh_manager(db_path, async_writes=False)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=DELETE')  # the original database never enabled WAL
+    conn.close()
+    start = time.perf_counter()
+    for i in range(records):
+        legacy_persist(db_path, sample(i))
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, count_rows(db_path), 0
+
+
+def bench_after(tmp, records, flush_size, flush_interval, max_queue):
+    db_path = os.path.join(tmp, 'after.db')
+    dm = fresh_manager(db_path, flush_size=flush_size, flush_interval=flush_interval,
+                       max_queue=max_queue)
+    start = time.perf_counter()
+    for i in range(records):
+        dm.add_record(sample(i))
+    produced = time.perf_counter() - start
+    dm.flush(timeout=60)
+    total = time.perf_counter() - start
+    dm.close()
+    return produced, total, count_rows(db_path), dm.writer_stats()['dropped']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--before-records', type=int, default=2000,
+                        help='records for the (slow) per-row commit path')
+    parser.add_argument('--flush-size', type=int, default=256)
+    parser.add_argument('--flush-interval', type=float, default=1.0)
+    parser.add_argument('--max-queue', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [
+            ('before (commit per row)', args.before_records, bench_before(tmp, args.before_records)),
+            ('after (write-behind WAL)', args.records,
+             bench_after(tmp, args.records, args.flush_size, args.flush_interval, args.max_queue)),
+        ]
+    print(f"{'path':<26} {'records':>8} {'producer rec/s':>15} {'end-to-end rec/s':>17} {'stored':>8} {'dropped':>8}")
+    for label, n, (produced, total, stored, dropped) in rows:
+        print(f"{label:<26} {n:>8} {n / produced:>15.0f} {n / total:>17.0f} {stored:>8} {dropped:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Scaling benchmark for the event-driven scheduling engine.
+
+Checks that FCFS/SJF/RR metrics match the original quadratic implementation
+on random workloads, then times both across growing process counts and
+reports the empirical growth exponent between consecutive sizes. SRTF,
+priority and MLFQ have no legacy counterpart and are timed on the engine
+only, as is every algorithm on `--cores` cores.
+
+    python -m benchmarks.bench_engine --sizes 1000,10000,100000,1000000
+    python -m benchmarks.bench_engine --sizes 10000,100000 --cores 8
+"""
+import argparse
+import math
+import random
+import time
+
+from benchmarks.legacy import OSSimulator as LegacySimulator, Process
+from models import engine
+from models.simulator import OSSimulator
+
+ALGORITHMS = ('fcfs', 'sjf', 'round_robin')
+ENGINE_ONLY = ('SRTF', 'PRIORITY', 'MLFQ')
+
+
+def random_processes(n, rng, arrival_span=10):
+    return [Process(i, rng.randint(2, 10), rng.randint(1, 5), rng.randint(50, 300),
+                    rng.randint(0, arrival_span - 1)) for i in range(1, n + 1)]
+
+
+def check_equivalence(trials=300, seed=0):
+    rng = random.Random(seed)
+    legacy = LegacySimulator()
+    current = OSSimulator(cores=1)
+    for trial in range(trials):
+        n = rng.randint(1, 60)
+        # wide arrival spans exercise idle gaps, narrow ones exercise ties
+        procs = random_processes(n, rng, arrival_span=rng.choice([1, 10, 5 * n + 1]))
+        for name in ALGORITHMS:
+            legacy.processes = [Process(p.pid, p.burst_time, p.priority, p.memory, p.arrival_time)
+                                for p in procs]
+            current.processes = [Process(p.pid, p.burst_time, p.priority, p.memory, p.arrival_time)
+                                 for p in procs]
+            expected = getattr(legacy, name)()
+            got = getattr(current, name)()
+            if expected != got:
+                raise AssertionError(f"{name} mismatch on trial {trial}: {expected} != {got}")
+            for a, b in zip(legacy.processes, current.processes):
+                if (a.waiting_time, a.turnaround_time) != (b.waiting_time, b.turnaround_time):
+                    raise AssertionError(f"{name} per-process mismatch on trial {trial} (pid {a.pid})")
+    print(f"✅ engine matches legacy FCFS/SJF/RR on {trials} random workloads")
+
+
+def _time_call(fn, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, legacy_max, repeat, seed=1, cores=1):
+    rng = random.Random(seed)
+    rows = []
+    for n in sizes:
+        # arrivals spread over roughly the total work so the ready set stays busy
+        procs = random_processes(n, rng, arrival_span=max(10, 5 * n))
+        arrivals = [p.arrival_time for p in procs]
+        bursts = [p.burst_time for p in procs]
+        priorities = [p.priority for p in procs]
+        legacy = LegacySimulator()
+        legacy.processes = procs
+        for name in ALGORITHMS:
+            fn = getattr(engine, name)
+            t_engine = _time_call(lambda: fn(arrivals, bursts), repeat)
+            t_legacy = None
+            if n <= legacy_max:
+                t_legacy = _time_call(getattr(legacy, name), 1)
+            rows.append((name, n, t_engine, t_legacy))
+        for name in ENGINE_ONLY:
+            t_engine = _time_call(lambda: engine.schedule(arrivals, bursts, name, priorities=priorities), repeat)
+            rows.append((name.lower(), n, t_engine, None))
+        if cores > 1:
+            for name in engine.ALGORITHMS:
+                t_engine = _time_call(lambda: engine.schedule(arrivals, bursts, name, cores, priorities), repeat)
+                rows.append((f"{name.lower()}/{cores}c", n, t_engine, None))
+    return rows
+
+
+def report(rows):
+    print(f"{'algorithm':<12} {'n':>9} {'engine s':>10} {'exp':>5} {'legacy s':>10} {'exp':>5} {'speedup':>9}")
+    prev = {}
+    for name, n, t_engine, t_legacy in rows:
+        exp_e = exp_l = ''
+        if name in prev:
+            pn, pe, pl = prev[name]
+            exp_e = f"{math.log(t_engine / pe) / math.log(n / pn):.2f}"
+            if t_legacy and pl:
+                exp_l = f"{math.log(t_legacy / pl) / math.log(n / pn):.2f}"
+        legacy_s = f"{t_legacy:.4f}" if t_legacy else '-'
+        speedup = f"{t_legacy / t_engine:.1f}x" if t_legacy else '-'
+        print(f"{name:<12} {n:>9} {t_engine:>10.4f} {exp_e:>5} {legacy_s:>10} {exp_l:>5} {speedup:>9}")
+        prev[name] = (n, t_engine, t_legacy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000,10000,100000,1000000')
+    parser.add_argument('--legacy-max', type=int, default=4000,
+                        help='largest workload to run through the quadratic implementation')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cores', type=int, default=1, help='also time every algorithm on this many cores')
+    parser.add_argument('--skip-check', action='store_true')
+    args = parser.parse_args()
+
+    if not args.skip_check:
+        check_equivalence()
+    sizes = [int(s) for s in args.sizes.split(',')]
+    report(run(sizes, args.legacy_max, args.repeat, cores=args.cores))
+
+
+if __name__ == '__main__':
+    main()
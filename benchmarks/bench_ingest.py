@@ -0,0 +1,131 @@
+"""
+Ingestion throughput of POST /ingest under a simulated fleet.
+
+Worker processes each play `--hosts` agents and POST gzip-compressed
+batches of `--batch-sizes` records over keep-alive connections for
+`--duration` seconds. Without --url a threaded server with a scratch
+database is started in this process, and after each run the rows that
+reached SQLite are counted to check nothing accepted was lost.
+
+    python -m benchmarks.bench_ingest --processes 4 --hosts 50 --batch-sizes 1,100,1000
+    python -m benchmarks.bench_ingest --url http://optios.internal:5001/ingest --duration 30
+"""
+import argparse
+import http.client
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from utils.ingest import encode_batch
+
+
+def fake_records(rng, n, now_ms):
+    return [{
+        'ts': now_ms + i,
+        'cpu_percent': round(rng.uniform(0, 100), 1),
+        'memory_usage': round(rng.uniform(20, 90), 1),
+        'ready_queue_size': rng.randint(50, 800),
+        'avg_burst_time': round(rng.uniform(1, 60), 2),
+        'avg_priority': round(rng.uniform(15, 25), 2),
+    } for i in range(n)]
+
+
+def run_agents(url, worker, hosts, batch_size, duration, seed):
+    """One load process: round-robins over its hosts until the deadline."""
+    parts = urllib.parse.urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    rng = random.Random(seed)
+    names = [f'load-{worker}-{i}' for i in range(hosts)]
+    sent = errors = 0
+    latencies = []
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        body, headers = encode_batch(names[i % hosts], fake_records(rng, batch_size, int(time.time() * 1000)))
+        started = time.perf_counter()
+        try:
+            conn.request('POST', parts.path or '/ingest', body, headers)
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        if resp.status == 202:
+            sent += batch_size
+        else:
+            errors += 1
+        i += 1
+    conn.close()
+    return sent, errors, latencies
+
+
+def start_local_server():
+    """Serve the app from a scratch directory; returns (url, shared_data_manager)."""
+    from werkzeug.serving import make_server
+
+    os.chdir(tempfile.mkdtemp(prefix='optios-ingest-'))
+    from app import create_app
+    from utils.data_manager import shared_data_manager
+
+    app = create_app(services='off')
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}/ingest', shared_data_manager
+
+
+def stored_rows(data_manager):
+    import sqlite3
+
+    data_manager.flush(timeout=60)
+    conn = sqlite3.connect(data_manager.db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM system_stats WHERE host LIKE 'load-%'").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='ingest endpoint of a running server (default: start one locally)')
+    parser.add_argument('--processes', type=int, default=4, help='load generator processes')
+    parser.add_argument('--hosts', type=int, default=50, help='simulated hosts per process')
+    parser.add_argument('--batch-sizes', default='1,100,1000', help='records per POST, one run per size')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    args = parser.parse_args()
+
+    # start the load processes before the local server changes directory
+    with multiprocessing.get_context('spawn').Pool(args.processes) as pool:
+        data_manager = None
+        url = args.url
+        if not url:
+            url, data_manager = start_local_server()
+        print(f"{args.processes} processes x {args.hosts} hosts -> {url}")
+        print(f"{'batch':>6} {'records/s':>12} {'batches/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'errors':>7} {'accepted':>9} {'stored':>9}")
+        for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+            before = stored_rows(data_manager) if data_manager else 0
+            jobs = [(url, w, args.hosts, batch_size, args.duration, w) for w in range(args.processes)]
+            started = time.perf_counter()
+            results = pool.starmap(run_agents, jobs)
+            elapsed = time.perf_counter() - started
+            sent = sum(r[0] for r in results)
+            errors = sum(r[1] for r in results)
+            latencies = sorted(x for r in results for x in r[2])
+            p50 = statistics.median(latencies) * 1000 if latencies else float('nan')
+            p99 = latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else float('nan')
+            stored = f"{stored_rows(data_manager) - before}" if data_manager else 'n/a'
+            print(f"{batch_size:>6} {sent / elapsed:>12,.0f} {len(latencies) / elapsed:>10,.1f} "
+                  f"{p50:>8.2f} {p99:>8.2f} {errors:>7} {sent:>9} {stored:>9}")
+
+
+if __name__ == '__main__':
+    main()
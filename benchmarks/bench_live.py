@@ -0,0 +1,81 @@
+"""
+Request-rate benchmark for /live on a single worker.
+
+"before" is the original handler, which blocked in
+psutil.cpu_percent(interval=0.2) and listed PIDs on every request; "after"
+is the current route serving the shared sampler snapshot. Requests go
+through the Flask test client, first back to back (one sync worker) and
+then from several threads (one threaded worker).
+
+    python -m benchmarks.bench_live --duration 3 --threads 20
+"""
+import argparse
+import random
+import threading
+import time
+
+import psutil
+from flask import Flask, jsonify
+
+from routes.home_routes import home_bp
+
+
+def legacy_live():
+    cpu = psutil.cpu_percent(interval=0.2)
+    memory = psutil.virtual_memory().percent
+    procs = len(psutil.pids())
+    avg_burst = random.uniform(5, 50) * (cpu / 100)
+    avg_priority = random.uniform(1, 10)
+    return jsonify({
+        'cpu': round(cpu, 2),
+        'memory': round(memory, 2),
+        'processes': int(procs),
+        'avg_burst_time': round(avg_burst, 2),
+        'avg_priority': round(avg_priority, 2)
+    })
+
+
+def make_app(max_age):
+    app = Flask(__name__)
+    app.config['LIVE_MAX_AGE'] = max_age
+    app.register_blueprint(home_bp)
+    app.add_url_rule('/live_legacy', 'live_legacy', legacy_live)
+    return app
+
+
+def hammer(app, path, duration, threads):
+    counts = [0] * threads
+    stop = time.perf_counter() + duration
+
+    def client(slot):
+        c = app.test_client()
+        while time.perf_counter() < stop:
+            assert c.get(path).status_code == 200
+            counts[slot] += 1
+
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--threads', type=int, default=20, help='concurrent viewers for the threaded run')
+    parser.add_argument('--max-age', type=float, default=1.0, help='LIVE_MAX_AGE staleness bound in seconds')
+    args = parser.parse_args()
+
+    app = make_app(args.max_age)
+    print(f"{'handler':<8} {'sync worker req/s':>18} {f'{args.threads} threads req/s':>18}")
+    for label, path in (('before', '/live_legacy'), ('after', '/live')):
+        sequential = hammer(app, path, args.duration, 1)
+        threaded = hammer(app, path, args.duration, args.threads)
+        print(f"{label:<8} {sequential:>18.1f} {threaded:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
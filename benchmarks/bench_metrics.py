@@ -0,0 +1,65 @@
+"""
+Per-call latency and allocation micro-benchmark for small workloads.
+
+Compares a full fcfs()/sjf()/round_robin() call on the original simulator
+(Process objects + pandas DataFrame in _metrics) with the current
+structure-of-arrays simulator, on the 10-process workloads /predict_live uses.
+
+    python -m benchmarks.bench_metrics --processes 10 --calls 20000
+"""
+import argparse
+import random
+import timeit
+import tracemalloc
+
+from benchmarks.legacy import OSSimulator as LegacySimulator
+from models.simulator import OSSimulator
+
+ALGORITHMS = ('fcfs', 'sjf', 'round_robin')
+
+
+def peak_alloc(fn, calls=50):
+    """Largest peak of traced memory over `calls` single calls, in bytes."""
+    fn()  # warm caches and lazy imports outside the trace
+    tracemalloc.start()
+    peak = 0
+    try:
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processes', type=int, default=10)
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    current = OSSimulator(cores=1)
+    current.randomize_processes(args.processes)
+    legacy = LegacySimulator()
+    legacy.processes = current.processes
+
+    legacy_calls = max(1, args.calls // 20)  # pandas path is far slower
+    print(f"{args.processes}-process workload, per call")
+    print(f"{'algorithm':<12} {'legacy us':>10} {'current us':>11} {'speedup':>8} "
+          f"{'legacy KiB':>11} {'current KiB':>12}")
+    for name in ALGORITHMS:
+        old, new = getattr(legacy, name), getattr(current, name)
+        assert old() == new(), f"{name} results differ"
+        t_old = min(timeit.repeat(old, number=legacy_calls, repeat=3)) / legacy_calls * 1e6
+        t_new = min(timeit.repeat(new, number=args.calls, repeat=3)) / args.calls * 1e6
+        m_old, m_new = peak_alloc(old), peak_alloc(new)
+        print(f"{name:<12} {t_old:>10.1f} {t_new:>11.1f} {t_old / t_new:>7.1f}x "
+              f"{m_old / 1024:>11.1f} {m_new / 1024:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Inference concurrency benchmark for RLSchedulerAgent.
+
+N reader threads call best_algorithm_for_state() while a trainer thread
+keeps applying Q-learning updates in batches. "before" is the original agent
+where readers and the trainer share one lock; "after" is the current agent
+with lock-free reads of published snapshots. Also compares the vectorized
+best_algorithms_for_states() with a per-state loop.
+
+    python -m benchmarks.bench_rl_agent --readers 1,4,16 --duration 2
+"""
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.legacy_rl_agent import RLSchedulerAgent as LegacyAgent
+from utils.rl_agent import RLSchedulerAgent
+
+
+def random_state(rng):
+    return [rng.randint(0, 600), rng.uniform(0, 50), rng.uniform(1, 10), rng.uniform(0, 100)]
+
+
+def run(agent, readers, duration, batch=10):
+    stop = threading.Event()
+    reads = [0] * readers
+    latencies = [[] for _ in range(readers)]
+    trained = [0]
+    batched = hasattr(agent, 'publish')
+
+    def reader(slot):
+        rng = random.Random(slot)
+        states = [random_state(rng) for _ in range(256)]
+        i = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            agent.best_algorithm_for_state(states[i & 255])
+            if i & 63 == 0:
+                latencies[slot].append(time.perf_counter() - start)
+            i += 1
+        reads[slot] = i
+
+    def trainer():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            for _ in range(batch):
+                s, ns = random_state(rng), random_state(rng)
+                if batched:
+                    agent.update(s, agent.choose_action(s), rng.uniform(-1, 1), ns, publish=False)
+                else:
+                    agent.update(s, agent.choose_action(s), rng.uniform(-1, 1), ns)
+                trained[0] += 1
+            if batched:
+                agent.publish()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=trainer))
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    lat = np.concatenate([np.array(l) for l in latencies if l]) * 1e6
+    return sum(reads) / duration, trained[0] / duration, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def bench_batch(n=100000):
+    agent = RLSchedulerAgent()
+    rng = random.Random(0)
+    states = np.array([random_state(rng) for _ in range(n)])
+    agent.learn_batch(states[:-1], np.random.default_rng(0).normal(size=n - 1), states[1:])
+    start = time.perf_counter()
+    looped = [agent.best_algorithm_for_state(s) for s in states.tolist()]
+    t_loop = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = agent.best_algorithms_for_states(states)
+    t_batch = time.perf_counter() - start
+    assert list(batched) == looped
+    print(f"\nbatch inference over {n} states: loop {n / t_loop:,.0f}/s, "
+          f"best_algorithms_for_states {n / t_batch:,.0f}/s ({t_loop / t_batch:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--readers', default='1,4,16')
+    parser.add_argument('--duration', type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'agent':<8} {'readers':>7} {'reads/s':>12} {'updates/s':>11} {'p50 us':>8} {'p99 us':>8}")
+    for readers in (int(r) for r in args.readers.split(',')):
+        for label, cls in (('before', LegacyAgent), ('after', RLSchedulerAgent)):
+            reads, updates, p50, p99 = run(cls(), readers, args.duration)
+            print(f"{label:<8} {readers:>7} {reads:>12,.0f} {updates:>11,.0f} {p50:>8.1f} {p99:>8.1f}")
+    bench_batch()
+
+
+if __name__ == '__main__':
+    main()
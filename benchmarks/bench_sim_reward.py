@@ -0,0 +1,68 @@
+"""
+Simulation-grounded reward benchmark.
+
+Measures how many transitions per second SimulationRewards scores with 1..N
+worker processes, then trains one agent per reward mode on the same states
+and reports how often each greedy policy picks the algorithm with the lowest
+simulated waiting time on held-out states.
+
+    python -m benchmarks.bench_sim_reward --states 50000 --workers 1,2,4,8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from utils.rl_agent import ACTION_MAP, RLSchedulerAgent, make_reward_fn
+from utils.sim_reward import simulated_waits
+
+
+def random_states(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(0, 600, n), rng.uniform(1, 20, n), rng.uniform(1, 10, n), rng.uniform(0, 100, n),
+    ]).astype(np.float64)
+
+
+def accuracy(agent, states):
+    algorithms = [ACTION_MAP[i] for i in range(len(ACTION_MAP))]
+    best = np.array(algorithms)[np.argmin(simulated_waits(states, algorithms, seed=1), axis=1)]
+    return float(np.mean(agent.best_algorithms_for_states(states) == best))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--states', type=int, default=50000)
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--holdout', type=int, default=5000)
+    args = parser.parse_args()
+
+    states = random_states(args.states, 0)
+    for workers in (int(w) for w in args.workers.split(',')):
+        reward_fn = make_reward_fn('simulation', workers)
+        try:
+            reward_fn(states[:16])  # start the pool outside the timing
+            start = time.perf_counter()
+            reward_fn(states)
+            elapsed = time.perf_counter() - start
+        finally:
+            reward_fn.close()
+        print(f"simulation reward, {workers} workers: {args.states / elapsed:,.0f} transitions/s")
+
+    holdout = random_states(args.holdout, 2)
+    for mode in ('delta', 'simulation'):
+        agent = RLSchedulerAgent()
+        reward_fn = make_reward_fn(mode)
+        try:
+            start = time.perf_counter()
+            agent.learn_batch(states[:-1], reward_fn(states[:-1], states[1:]), states[1:])
+            elapsed = time.perf_counter() - start
+        finally:
+            if hasattr(reward_fn, 'close'):
+                reward_fn.close()
+        print(f"{mode:<10} reward: trained in {elapsed:.1f}s, "
+              f"picks the fastest algorithm on {accuracy(agent, holdout) * 100:.1f}% of held-out states")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Cold-start cost of a fresh worker: import time and resident memory.
+
+Every round starts a new interpreter with `-X importtime` in a scratch
+directory, imports the app and builds it with services off, which is what a
+pre-forking server does before it serves. It reports the import time of the
+app module (from the importtime tree), the wall time until the app is ready,
+the worker's RSS and the slowest direct imports. It exits with status 1 when
+the median import time or RSS exceeds its budget, or when something that
+should load lazily was loaded at import: pandas, the shared singletons, or
+optios.db.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --rounds 10 --max-import-ms 200 --max-rss-mb 80
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only some requests or tools need
+HEAVY_MODULES = ('pandas', 'matplotlib')
+# (module, attribute) singletons that are created on first use
+SINGLETONS = (('utils.data_manager', 'shared_data_manager'),
+              ('utils.rl_agent', 'shared_rl_agent'),
+              ('utils.sampler', 'shared_sampler'),
+              ('utils.workload_capture', 'shared_collector'))
+
+CHILD = r'''
+import json, sys, time
+started = time.perf_counter()
+import app
+application = app.create_app(services='off')
+ready = time.perf_counter() - started
+import psutil
+print(json.dumps({
+    'ready': ready,
+    'rss': psutil.Process().memory_info().rss,
+    'heavy': [m for m in %r if m in sys.modules],
+    # vars(), not getattr(): a module __getattr__ would create the singleton
+    'singletons': [f'{m}.{a}' for m, a in %r if m in sys.modules and a in vars(sys.modules[m])],
+}))
+''' % (HEAVY_MODULES, SINGLETONS)
+
+
+def parse_importtime(stderr, module='app'):
+    """(cumulative seconds of `module`, [(seconds, name)] of its direct imports) from -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # the name is indented by two spaces per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative) / 1e6, name.strip()))
+    for end in range(len(entries) - 1, -1, -1):
+        if entries[end][0] == 0 and entries[end][2] == module:
+            break
+    else:
+        raise ValueError(f"{module} not found in the importtime output")
+    children = []
+    for depth, seconds, name in reversed(entries[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((seconds, name))
+    return entries[end][1], sorted(children, reverse=True)
+
+
+def measure():
+    """One fresh worker: import seconds, ready seconds, RSS bytes, direct imports and lazy-load violations."""
+    with tempfile.TemporaryDirectory(prefix='optios-startup-') as scratch:
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=scratch, env=env,
+                              capture_output=True, text=True, check=True)
+        created_db = os.path.exists(os.path.join(scratch, 'optios.db'))
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    seconds, children = parse_importtime(proc.stderr)
+    violations = [f'imported {m}' for m in result['heavy']] + [f'created {s}' for s in result['singletons']]
+    if created_db:
+        violations.append('created optios.db')
+    return {'import': seconds, 'ready': result['ready'], 'rss': result['rss'],
+            'children': children, 'violations': violations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=5, help='fresh interpreters to start')
+    parser.add_argument('--top', type=int, default=10, help='slowest direct imports of app to list')
+    parser.add_argument('--max-import-ms', type=float, default=250.0, help='budget for the median import time')
+    parser.add_argument('--max-rss-mb', type=float, default=100.0, help='budget for the median worker RSS')
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.rounds)]
+    import_ms = statistics.median(r['import'] for r in runs) * 1000
+    ready_ms = statistics.median(r['ready'] for r in runs) * 1000
+    rss_mb = statistics.median(r['rss'] for r in runs) / 2 ** 20
+    print(f"{args.rounds} fresh workers (median)")
+    print(f"  import app       {import_ms:8.1f} ms   budget {args.max_import_ms:.0f} ms")
+    print(f"  create_app ready {ready_ms:8.1f} ms")
+    print(f"  RSS              {rss_mb:8.1f} MiB  budget {args.max_rss_mb:.0f} MiB")
+    print("slowest direct imports of app (last run, cumulative):")
+    for seconds, name in runs[-1]['children'][:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    failures = sorted({v for r in runs for v in r['violations']})
+    if import_ms > args.max_import_ms:
+        failures.append(f"import time {import_ms:.1f} ms over budget")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.1f} MiB over budget")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ within budget")
+
+
+if __name__ == '__main__':
+    main()
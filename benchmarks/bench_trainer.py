@@ -0,0 +1,96 @@
+"""
+RL trainer throughput benchmark.
+
+"before" replays the original trainer: every tick it copies the history
+deque and re-learns the last 10 records with one locked agent.update() per
+transition. "after" feeds the same samples through the ExperienceBuffer and
+learns each new transition once with vectorized mini-batches. Also checks
+that the trainer keeps up when samples arrive `--rate` times faster than the
+monitor's default of one per 5 seconds.
+
+    python -m benchmarks.bench_trainer --samples 200000 --rate 100
+"""
+import argparse
+import collections
+import time
+
+import numpy as np
+
+from benchmarks.legacy_rl_agent import RLSchedulerAgent as LegacyAgent
+from utils.replay import ExperienceBuffer
+from utils.rl_agent import RLSchedulerAgent, transition_rewards
+from utils.state_encoder import STATE_FIELDS
+
+DEFAULT_SAMPLE_INTERVAL = 5.0
+
+
+def random_states(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(0, 600, n), rng.uniform(1, 20, n), rng.uniform(1, 10, n), rng.uniform(0, 100, n),
+    ]).astype(np.float64)
+
+
+def bench_legacy(states, per_tick):
+    # one tick per `per_tick` new samples, each tick retraining on the last 10 records
+    agent = LegacyAgent()
+    history = collections.deque(maxlen=200)
+    ticks = transitions = 0
+    start = time.perf_counter()
+    for lo in range(0, len(states), per_tick):
+        for row in states[lo:lo + per_tick].tolist():
+            history.append(dict(zip(STATE_FIELDS, row)))
+        batch = list(history)[-10:]
+        for i in range(len(batch) - 1):
+            s = [batch[i][f] for f in STATE_FIELDS]
+            n = [batch[i + 1][f] for f in STATE_FIELDS]
+            reward = float(transition_rewards(s, n)[0])
+            agent.update(s, agent.choose_action(s), reward, n)
+            transitions += 1
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    # at most the newest min(per_tick, 9) transitions of each tick were new
+    covered = min(transitions, min(per_tick, 9) * ticks, len(states) - 1)
+    return elapsed, transitions, covered
+
+
+def bench_buffer(states, per_tick):
+    agent = RLSchedulerAgent()
+    buffer = ExperienceBuffer(capacity=max(65536, 2 * per_tick))
+    cursor, previous, learned = 0, None, 0
+    start = time.perf_counter()
+    for lo in range(0, len(states), per_tick):
+        buffer.extend(states[lo:lo + per_tick])
+        cursor, new, _ = buffer.read_since(cursor)
+        if previous is not None:
+            new = np.vstack([previous, new])
+        previous = new[-1:]
+        if len(new) > 1:
+            learned += agent.learn_batch(new[:-1], transition_rewards(new[:-1], new[1:]), new[1:])
+    return time.perf_counter() - start, learned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, default=200000)
+    parser.add_argument('--rate', type=float, default=100, help='sampling rate relative to one sample per 5s')
+    parser.add_argument('--interval', type=float, default=5.0, help='trainer tick in seconds')
+    args = parser.parse_args()
+
+    states = random_states(args.samples)
+    samples_per_second = args.rate / DEFAULT_SAMPLE_INTERVAL
+    per_tick = max(1, int(round(samples_per_second * args.interval)))
+    print(f"{args.samples} samples at {samples_per_second:g}/s -> {per_tick} new samples per {args.interval:g}s tick")
+
+    elapsed, updates, covered = bench_legacy(states, per_tick)
+    print(f"before  {updates / elapsed:>12,.0f} updates/s   {covered:>9} of {args.samples - 1} "
+          f"transitions learned, {updates - covered} repeated")
+    elapsed, learned = bench_buffer(states, per_tick)
+    rate = learned / elapsed
+    print(f"after   {rate:>12,.0f} transitions/s   {learned:>9} of {args.samples - 1} transitions learned")
+    print(f"headroom at this sampling rate: {rate / samples_per_second:,.0f}x "
+          f"({elapsed / (args.samples / per_tick) * 1000:.2f} ms of training per tick)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Reference copy of the original lock-based RLSchedulerAgent, kept so
+benchmarks can report before/after numbers.
+"""
+import numpy as np
+import random
+import threading
+
+# Actions -> scheduling algorithms
+ACTION_MAP = {0: 'FCFS', 1: 'SJF', 2: 'RR'}
+
+class RLSchedulerAgent:
+    def __init__(self, n_states=200, alpha=0.2, gamma=0.9, epsilon=0.25):
+        self.n_states = n_states
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        # Q-table: n_states x n_actions
+        self.q_table = np.zeros((n_states, len(ACTION_MAP)))
+        self.lock = threading.Lock()
+
+    def _state_index(self, state):
+        # state: [ready_queue_size, avg_burst_time, avg_priority, memory_usage]
+        # Normalize components and combine to single index.
+        rq = min(int(state[0]), 100)   # clamp
+        burst = min(int(state[1]), 100)
+        mem = min(int(state[3]), 100)
+        # simple hashing into range
+        idx = (rq * 3 + burst * 5 + mem * 7) % self.n_states
+        return idx
+
+    def choose_action(self, state):
+        idx = self._state_index(state)
+        with self.lock:
+            if random.random() < self.epsilon:
+                return random.randint(0, len(ACTION_MAP)-1)
+            return int(np.argmax(self.q_table[idx]))
+
+    def action_name(self, action_idx):
+        return ACTION_MAP.get(action_idx, 'SJF')
+
+    def update(self, state, action, reward, next_state):
+        s = self._state_index(state)
+        ns = self._state_index(next_state)
+        with self.lock:
+            old = self.q_table[s, action]
+            best_next = np.max(self.q_table[ns])
+            new = old + self.alpha * (reward + self.gamma * best_next - old)
+            self.q_table[s, action] = new
+
+    def best_algorithm_for_state(self, state):
+        idx = self._state_index(state)
+        with self.lock:
+            action_idx = int(np.argmax(self.q_table[idx]))
+        return self.action_name(action_idx)
+
@@ -0,0 +1,405 @@
+"""
+Benchmark suite for the hot paths, with JSON results and baseline comparison.
+
+Covers OSSimulator.sjf/round_robin/_metrics, DataManager.add_record,
+RLSchedulerAgent.update/best_algorithm_for_state, the /live and
+/predict_live routes (through the Flask test client), each over a range of
+sizes, and the import time and RSS of a fresh worker. Every case reports one number with its unit and direction; `compare`
+flags cases that got worse than a baseline by more than a threshold.
+
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run --output results.json --save-baseline local
+    python -m benchmarks.suite run -k simulator --processes 10,1000 --compare local
+    python -m benchmarks.suite compare results.json --baseline local --threshold 0.2
+
+Cases run in a scratch directory, so they never touch optios.db or the
+prediction log of the working tree. `run --compare` and `compare` exit with
+status 1 when a regression is found.
+"""
+import argparse
+import contextlib
+import fnmatch
+import functools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(ROOT, 'benchmarks', 'baselines')
+
+DEFAULT_SIZES = {
+    'processes': (10, 100, 1000),
+    'rates': (100, 1000, 10000),
+    'readers': (1, 4, 16),
+}
+QUICK_SIZES = {
+    'processes': (10, 100),
+    'rates': (100, 1000),
+    'readers': (1, 4),
+}
+
+# name -> (parameter name or None, function(size, opts) -> result dict)
+CASES = {}
+
+
+def case(name, param=None):
+    def register(fn):
+        CASES[name] = (param, fn)
+        return fn
+    return register
+
+
+def per_op(fn, repeat=5, min_time=0.2):
+    """Median seconds per call of fn() over `repeat` rounds of about min_time each."""
+    timer = timeit.Timer(fn)
+    loops, elapsed = timer.autorange()
+    loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+    rounds = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+    return {'value': statistics.median(rounds), 'unit': 's/op', 'better': 'lower',
+            'spread': (max(rounds) - min(rounds)) / statistics.median(rounds)}
+
+
+def throughput(fn, threads, duration):
+    """Calls per second of fn() made from `threads` threads for `duration` seconds."""
+    counts = [0] * threads
+    stop = time.perf_counter() + duration
+
+    def worker(slot):
+        n = 0
+        while time.perf_counter() < stop:
+            fn()
+            n += 1
+        counts[slot] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return {'value': sum(counts) / (time.perf_counter() - start), 'unit': 'ops/s', 'better': 'higher'}
+
+
+def _simulator(processes):
+    from models.simulator import OSSimulator
+    sim = OSSimulator(cores=1)
+    # same workload on every run, so results are comparable with a baseline
+    random.seed(processes)
+    sim.randomize_processes(processes)
+    return sim
+
+
+@case('simulator.sjf', 'processes')
+def bench_sjf(processes, opts):
+    """Seconds per sjf() call on a random workload."""
+    sim = _simulator(processes)
+    return per_op(sim.sjf, opts.repeat, opts.min_time)
+
+
+@case('simulator.round_robin', 'processes')
+def bench_round_robin(processes, opts):
+    """Seconds per round_robin() call on a random workload."""
+    sim = _simulator(processes)
+    return per_op(sim.round_robin, opts.repeat, opts.min_time)
+
+
+@case('simulator.metrics', 'processes')
+def bench_metrics(processes, opts):
+    """Seconds per _metrics() call after a schedule has run."""
+    sim = _simulator(processes)
+    sim.fcfs()
+    return per_op(lambda: sim._metrics('FCFS'), opts.repeat, opts.min_time)
+
+
+def _fresh_manager(**kwargs):
+    from utils.data_manager import DataManager
+    # DataManager is a process-wide singleton; each case needs a private database
+    DataManager._instance = None
+    fd, path = tempfile.mkstemp(suffix='.db', dir='.')
+    os.close(fd)
+    return DataManager(db_path=path, **kwargs)
+
+
+@case('datamanager.add_record', 'rates')
+def bench_add_record(rate, opts):
+    """p99 latency of add_record() while records arrive at `rate` per second."""
+    dm = _fresh_manager()
+    try:
+        latencies = []
+        total = max(1, int(rate * opts.duration))
+        # pace in 10 ms slices so high rates are not limited by sleep granularity
+        per_slice = max(1, rate // 100)
+        start = time.perf_counter()
+        for i in range(total):
+            if i % per_slice == 0:
+                delay = start + i / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            record = {'ready_queue_size': i % 500, 'avg_burst_time': 12.5, 'avg_priority': 20.0,
+                      'memory_usage': 60.0, 'cpu_percent': 30.0}
+            t = time.perf_counter()
+            dm.add_record(record)
+            latencies.append(time.perf_counter() - t)
+        achieved = total / (time.perf_counter() - start)
+        dm.flush(timeout=60)
+        stats = dm.writer_stats()
+    finally:
+        dm.close()
+    latencies.sort()
+    return {'value': latencies[int(0.99 * (len(latencies) - 1))], 'unit': 's (p99)', 'better': 'lower',
+            'achieved_rate': achieved, 'dropped': stats.get('dropped', 0)}
+
+
+def _states(n=1024):
+    rng = random.Random(0)
+    return [[rng.randint(0, 600), rng.uniform(0, 100), rng.uniform(0, 39), rng.uniform(0, 100)]
+            for _ in range(n)]
+
+
+@case('rl.update')
+def bench_update(_, opts):
+    """One locked Q-learning step with snapshot publish."""
+    from utils.rl_agent import RLSchedulerAgent
+    agent = RLSchedulerAgent()
+    states = _states()
+    i = [0]
+
+    def step():
+        k = i[0] = (i[0] + 1) & 1023
+        agent.update(states[k], k % 3, 1.0, states[(k + 1) & 1023])
+    return per_op(step, opts.repeat, opts.min_time)
+
+
+@case('rl.best_algorithm_for_state', 'readers')
+def bench_best_algorithm(readers, opts):
+    """Lookups per second from concurrent reader threads."""
+    from utils.rl_agent import RLSchedulerAgent
+    agent = RLSchedulerAgent()
+    states = _states()
+    agent.learn_batch(states[:-1], [1.0] * (len(states) - 1), states[1:])
+    local = threading.local()
+
+    def lookup():
+        k = local.__dict__.setdefault('k', 0)
+        local.k = (k + 1) & 1023
+        agent.best_algorithm_for_state(states[k])
+    return throughput(lookup, readers, opts.duration)
+
+
+@functools.lru_cache(maxsize=None)
+def _app():
+    from app import create_app
+    return create_app(services='off')
+
+
+@case('http.live', 'readers')
+def bench_live(readers, opts):
+    """Requests per second through the Flask test client."""
+    app = _app()
+    clients = threading.local()
+
+    def get():
+        c = clients.__dict__.get('c')
+        if c is None:
+            c = clients.c = app.test_client()
+        assert c.get('/live').status_code == 200
+    return throughput(get, readers, opts.duration)
+
+
+@case('http.predict_live', 'readers')
+def bench_predict_live(readers, opts):
+    """Requests per second while a new sample arrives every 100 ms (cache misses included)."""
+    from utils.data_manager import shared_data_manager
+    app = _app()
+    clients = threading.local()
+    stop = threading.Event()
+
+    def produce():
+        i = 0
+        while not stop.wait(0.1):
+            i += 1
+            shared_data_manager.add_record({'ready_queue_size': 300 + i % 50, 'avg_burst_time': 12.5,
+                                            'avg_priority': 20.0, 'memory_usage': 60.0, 'cpu_percent': 30.0})
+
+    def get():
+        c = clients.__dict__.get('c')
+        if c is None:
+            c = clients.c = app.test_client()
+        assert c.get('/predict_live').status_code == 200
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        return throughput(get, readers, opts.duration)
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _startup(repeat):
+    from benchmarks.bench_startup import measure
+    return [measure() for _ in range(repeat)]
+
+
+@case('startup.import_app')
+def bench_startup_import(_, opts):
+    """Seconds to import app in a fresh interpreter (from -X importtime)."""
+    times = [r['import'] for r in _startup(opts.repeat)]
+    return {'value': statistics.median(times), 'unit': 's', 'better': 'lower',
+            'spread': (max(times) - min(times)) / statistics.median(times)}
+
+
+@case('startup.rss')
+def bench_startup_rss(_, opts):
+    """Resident memory of a fresh worker after create_app()."""
+    return {'value': statistics.median(r['rss'] for r in _startup(opts.repeat)) / 2 ** 20, 'unit': 'MiB',
+            'better': 'lower'}
+
+
+def selected_cases(patterns, sizes):
+    for name, (param, fn) in CASES.items():
+        if patterns and not any(fnmatch.fnmatch(name, f'*{p}*') for p in patterns):
+            continue
+        for size in (sizes[param] if param else (None,)):
+            key = f'{name}[{param}={size}]' if param else name
+            yield key, fn, size
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run(args):
+    sizes = dict(QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    for param in sizes:
+        value = getattr(args, param)
+        if value:
+            sizes[param] = tuple(int(v) for v in value.split(','))
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='optios-bench-')
+    cwd = os.getcwd()
+    # keep the app's relative files (optios.db, prediction log, checkpoint) out of the tree
+    os.environ.setdefault('OPTIOS_PREDICTION_LOG', os.path.join(workdir, 'rl_predictions.csv'))
+    os.environ.setdefault('OPTIOS_CHECKPOINT', os.path.join(workdir, 'rl_checkpoint.npz'))
+    os.chdir(workdir)
+    try:
+        for key, fn, size in selected_cases(args.k, sizes):
+            # the app's startup messages would otherwise end up in the JSON on stdout
+            with contextlib.redirect_stdout(sys.stderr):
+                result = fn(size, args)
+            results[key] = result
+            print(f"{key:<45} {result['value']:>14.6g} {result['unit']}", file=sys.stderr)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {'meta': metadata(), 'results': results}
+
+
+def load(path_or_name):
+    path = path_or_name
+    if not os.path.exists(path):
+        path = os.path.join(BASELINE_DIR, f'{path_or_name}.json')
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold):
+    """Rows of (case, baseline, current, relative change, regressed) for cases in both."""
+    rows = []
+    for key, now in current['results'].items():
+        before = baseline['results'].get(key)
+        if not before or not before['value']:
+            continue
+        change = (now['value'] - before['value']) / before['value']
+        worse = change if now['better'] == 'lower' else -change
+        rows.append((key, before['value'], now['value'], change, worse > threshold))
+    return rows
+
+
+def report(rows, threshold, file=sys.stdout):
+    regressions = 0
+    for key, before, now, change, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        regressions += regressed
+        print(f"{key:<45} {before:>12.6g} -> {now:>12.6g}  {change:+7.1%}  {flag}", file=file)
+    print(f"{regressions} regression(s) beyond {threshold:.0%} in {len(rows)} compared case(s)", file=file)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='list the benchmark cases')
+
+    p_run = sub.add_parser('run', help='run the suite and print JSON results')
+    p_run.add_argument('-k', action='append', help='only cases whose name contains this (repeatable)')
+    p_run.add_argument('--quick', action='store_true', help='smaller sizes and shorter runs')
+    p_run.add_argument('--processes', help='processes per workload, e.g. 10,100,1000')
+    p_run.add_argument('--rates', help='records per second offered to add_record, e.g. 100,1000')
+    p_run.add_argument('--readers', help='concurrent readers/clients, e.g. 1,4,16')
+    p_run.add_argument('--repeat', type=int, default=5, help='timing rounds per latency case')
+    p_run.add_argument('--min-time', type=float, default=0.2, help='seconds per timing round')
+    p_run.add_argument('--duration', type=float, default=2.0, help='seconds per throughput case')
+    p_run.add_argument('--output', help='write results to this file instead of stdout')
+    p_run.add_argument('--save-baseline', metavar='NAME', help='also store results as benchmarks/baselines/NAME.json')
+    p_run.add_argument('--compare', metavar='BASELINE', help='compare against a baseline name or file')
+    p_run.add_argument('--threshold', type=float, default=0.2, help='relative slowdown that counts as a regression')
+
+    p_cmp = sub.add_parser('compare', help='compare a results file with a baseline')
+    p_cmp.add_argument('results')
+    p_cmp.add_argument('--baseline', default='default', help='baseline name or file')
+    p_cmp.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for name, (param, fn) in CASES.items():
+            print(f"{name:<32} {param or '-':<10} {(fn.__doc__ or '').strip()}")
+        return 0
+
+    if args.command == 'compare':
+        return 1 if report(compare(load(args.results), load(args.baseline), args.threshold), args.threshold) else 0
+
+    if args.quick:
+        args.repeat, args.min_time, args.duration = 3, 0.05, 0.5
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f'{args.save_baseline}.json'), 'w') as f:
+            f.write(text + '\n')
+    if args.compare:
+        # keep stdout parseable when the JSON went there
+        out = sys.stdout if args.output else sys.stderr
+        return 1 if report(compare(results, load(args.compare), args.threshold), args.threshold, out) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, ROOT)
+    sys.exit(main())
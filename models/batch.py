@@ -0,0 +1,176 @@
+"""
+Vectorized batch simulation: many workloads at once as 2-D NumPy arrays.
+
+Rows are workloads and columns are processes, in the same order the
+single-workload simulator would see them. FCFS is closed-form over
+cumulative sums; SJF and RR advance every workload in lockstep, one dispatch
+per step, so the Python loop runs per scheduling decision instead of per
+process object. The preemptive algorithms and multi-core runs have no
+lockstep form and go through the event engine one workload at a time.
+"""
+import numpy as np
+
+from models import engine
+
+BATCH_ALGORITHMS = ('FCFS', 'SJF', 'RR')
+
+
+def random_workloads(n_workloads, num_processes=10, rng=None):
+    """Random workloads drawn like OSSimulator.randomize_processes()."""
+    rng = np.random.default_rng(rng)
+    shape = (n_workloads, num_processes)
+    return {
+        'bursts': rng.integers(2, 11, shape),
+        'priorities': rng.integers(1, 6, shape),
+        'memory': rng.integers(50, 301, shape),
+        'arrivals': rng.integers(0, 10, shape),
+    }
+
+
+def _fcfs(bursts, arrivals, quantum):
+    # completion_i = max(completion_{i-1}, arrival_i) + burst_i, which unrolls to
+    # cumsum_i + max(0, max_{j<=i}(arrival_j - cumsum_{j-1}))
+    csum = np.cumsum(bursts, axis=1)
+    offset = np.maximum.accumulate(np.maximum(arrivals - (csum - bursts), 0), axis=1)
+    turnaround = csum + offset - arrivals
+    return turnaround - bursts, turnaround
+
+
+def _sjf(bursts, arrivals, quantum):
+    n_workloads, n = bursts.shape
+    rows = np.arange(n_workloads)
+    # rank of every process under the engine's (burst, arrival, index) ordering
+    index = np.broadcast_to(np.arange(n), bursts.shape)
+    order = np.lexsort((index, arrivals, bursts), axis=1)
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, index, axis=1)
+
+    time = np.zeros(n_workloads)
+    done = np.zeros(bursts.shape, dtype=bool)
+    waiting = np.zeros(bursts.shape)
+    for _ in range(n):
+        pending = ~done
+        ready = pending & (arrivals <= time[:, None])
+        idle = ~ready.any(axis=1)
+        if idle.any():
+            next_arrival = np.where(pending, arrivals, np.inf).min(axis=1)
+            time = np.where(idle, next_arrival, time)
+            ready = pending & (arrivals <= time[:, None])
+        pick = np.where(ready, rank, n).argmin(axis=1)
+        waiting[rows, pick] = time - arrivals[rows, pick]
+        time = time + bursts[rows, pick]
+        done[rows, pick] = True
+    return waiting, waiting + bursts
+
+
+def _round_robin(bursts, arrivals, quantum):
+    n_workloads, n = bursts.shape
+    rows = np.arange(n_workloads)
+    remaining = bursts.copy()
+    turnaround = np.zeros(bursts.shape)
+    admitted = np.zeros(bursts.shape, dtype=bool)
+    # one circular queue per workload; a process is queued at most once
+    queue = np.zeros(bursts.shape, dtype=np.intp)
+    head = np.zeros(n_workloads, dtype=np.intp)
+    size = np.zeros(n_workloads, dtype=np.intp)
+    time = np.zeros(n_workloads)
+
+    def admit():
+        if admitted.all():
+            return
+        new = ~admitted & (arrivals <= time[:, None])
+        admitted[new] = True
+        new &= remaining > 0
+        if new.any():
+            # simultaneous arrivals join in process order
+            slot = (head + size)[:, None] + np.cumsum(new, axis=1) - 1
+            w, i = np.nonzero(new)
+            queue[w, slot[w, i] % n] = i
+            size[:] += new.sum(axis=1)
+
+    flat_remaining = remaining.reshape(-1)
+    flat_queue = queue.reshape(-1)
+    flat_turnaround = turnaround.reshape(-1)
+    flat_arrivals = arrivals.reshape(-1)
+    base = rows * n
+    while True:
+        admit()
+        busy = np.flatnonzero(size)
+        if len(busy) < n_workloads and not admitted.all():
+            idle = (size == 0) & ~admitted.all(axis=1)
+            if idle.any():
+                next_arrival = np.where(admitted, np.inf, arrivals).min(axis=1)
+                time = np.where(idle, next_arrival, time)
+                admit()
+                busy = np.flatnonzero(size)
+        if len(busy) == 0:
+            if admitted.all():
+                break
+            continue
+
+        current = base[busy] + flat_queue[base[busy] + head[busy]]
+        head[busy] = (head[busy] + 1) % n
+        size[busy] -= 1
+        run = np.minimum(quantum, flat_remaining[current])
+        flat_remaining[current] -= run
+        time[busy] += run
+        # arrivals during the slice queue ahead of the preempted process
+        admit()
+        again = flat_remaining[current] > 0
+        w = busy[again]
+        flat_queue[base[w] + (head[w] + size[w]) % n] = current[again] - base[w]
+        size[w] += 1
+        done = current[~again]
+        flat_turnaround[done] = time[busy[~again]] - flat_arrivals[done]
+    return turnaround - bursts, turnaround
+
+
+_DISPATCH = {'FCFS': _fcfs, 'SJF': _sjf, 'RR': _round_robin}
+
+
+def _per_workload(name, bursts, arrivals, priorities, quantum, cores):
+    waiting = np.zeros(bursts.shape)
+    turnaround = np.zeros(bursts.shape)
+    for w in range(len(bursts)):
+        waiting[w], turnaround[w] = engine.schedule(arrivals[w].tolist(), bursts[w].tolist(), name, cores,
+                                                    priorities=priorities[w].tolist(), quantum=quantum)
+    return waiting, turnaround
+
+
+def simulate_batch(bursts, arrivals, algorithms=BATCH_ALGORITHMS, quantum=3, priorities=None, cores=1):
+    """
+    Simulate every workload (row) under each algorithm, on `cores` cores.
+
+    Any of engine.ALGORITHMS is accepted; `priorities` (same shape as
+    bursts, default all 0) only matters for PRIORITY. Returns {algorithm:
+    {'Average Waiting Time': array, 'Average Turnaround Time': array}} with
+    one unrounded value per workload.
+    """
+    bursts = np.atleast_2d(np.asarray(bursts, dtype=np.float64))
+    arrivals = np.atleast_2d(np.asarray(arrivals, dtype=np.float64))
+    if bursts.shape != arrivals.shape or bursts.ndim != 2:
+        raise ValueError(f"bursts {bursts.shape} and arrivals {arrivals.shape} must be matching 2-D arrays")
+    if priorities is None:
+        priorities = np.zeros(bursts.shape)
+    priorities = np.atleast_2d(np.asarray(priorities, dtype=np.float64))
+    if priorities.shape != bursts.shape:
+        raise ValueError(f"priorities {priorities.shape} must match bursts {bursts.shape}")
+    results = {}
+    for name in algorithms:
+        if name not in engine.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {name!r}; expected one of {engine.ALGORITHMS}")
+        if bursts.shape[1] == 0:
+            results[name] = {
+                'Average Waiting Time': np.zeros(len(bursts)),
+                'Average Turnaround Time': np.zeros(len(bursts))
+            }
+            continue
+        if cores == 1 and name in _DISPATCH:
+            waiting, turnaround = _DISPATCH[name](bursts, arrivals, quantum)
+        else:
+            waiting, turnaround = _per_workload(name, bursts, arrivals, priorities, quantum, cores)
+        results[name] = {
+            'Average Waiting Time': waiting.mean(axis=1),
+            'Average Turnaround Time': turnaround.mean(axis=1)
+        }
+    return results
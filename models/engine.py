@@ -0,0 +1,309 @@
+"""
+Event-driven scheduling engine used by OSSimulator.
+
+Every scheduler takes parallel sequences of arrival and burst times and
+returns (waiting, turnaround) lists in input order. Processes are sorted by
+arrival once, idle gaps jump straight to the next arrival, and the ready set
+lives in a heap (SJF) or a deque (RR), so a workload costs O(n log n) instead
+of a rescan of every process on every tick.
+
+schedule() runs any of ALGORITHMS on one or more cores with the same event
+loop: time jumps between arrivals, completions and time-slice expiries, the
+ready set is a heap ordered by the policy's key and the pending core events
+are a second heap. fcfs(), sjf() and round_robin() are its single-core
+special cases and stay the fast path for one core.
+"""
+import heapq
+from collections import deque
+
+ALGORITHMS = ('FCFS', 'SJF', 'RR', 'SRTF', 'PRIORITY', 'MLFQ')
+
+# Waiting time that raises a ready process by one priority level
+AGING = 10
+# Time slice of each MLFQ level; processes that use a whole slice move down
+# a level, and the level below the last one runs to completion (FCFS)
+MLFQ_QUANTA = (2, 4, 8)
+
+
+def parse_algorithms(spec):
+    """Algorithm names from a sequence or a comma-separated list such as 'FCFS,SJF,RR,SRTF'."""
+    if isinstance(spec, str):
+        names = tuple(name.strip().upper() for name in spec.split(',') if name.strip())
+    else:
+        names = tuple(spec)
+    if not names or len(set(names)) != len(names) or any(name not in ALGORITHMS for name in names):
+        raise ValueError(f"Invalid algorithms {spec!r}; expected distinct names from {ALGORITHMS}")
+    return names
+
+
+def _arrival_order(arrivals):
+    # sorted() is stable, so equal arrivals keep their input order
+    return sorted(range(len(arrivals)), key=arrivals.__getitem__)
+
+
+def fcfs(arrivals, bursts):
+    """Non-preemptive, served in input order."""
+    n = len(arrivals)
+    waiting = [0] * n
+    turnaround = [0] * n
+    time = 0
+    for i in range(n):
+        if time < arrivals[i]:
+            time = arrivals[i]
+        waiting[i] = time - arrivals[i]
+        time += bursts[i]
+        turnaround[i] = waiting[i] + bursts[i]
+    return waiting, turnaround
+
+
+def sjf(arrivals, bursts):
+    """Non-preemptive shortest job first; ties go to the earliest arrival."""
+    n = len(arrivals)
+    waiting = [0] * n
+    turnaround = [0] * n
+    order = _arrival_order(arrivals)
+    ready = []
+    time = 0
+    nxt = 0
+    done = 0
+    while done < n:
+        while nxt < n and arrivals[order[nxt]] <= time:
+            i = order[nxt]
+            heapq.heappush(ready, (bursts[i], arrivals[i], i))
+            nxt += 1
+        if not ready:
+            # CPU idle: skip straight to the next arrival
+            time = arrivals[order[nxt]]
+            continue
+        _, _, i = heapq.heappop(ready)
+        waiting[i] = time - arrivals[i]
+        time += bursts[i]
+        turnaround[i] = waiting[i] + bursts[i]
+        done += 1
+    return waiting, turnaround
+
+
+def _admit(queue, order, arrivals, remaining, nxt, time):
+    # Everything that arrived by `time` joins the queue in input order,
+    # which is how the original per-tick scan enqueued simultaneous arrivals.
+    start = nxt
+    n = len(order)
+    while nxt < n and arrivals[order[nxt]] <= time:
+        nxt += 1
+    if nxt > start:
+        queue.extend(i for i in sorted(order[start:nxt]) if remaining[i] > 0)
+    return nxt
+
+
+def round_robin(arrivals, bursts, quantum=3):
+    """Fixed-quantum RR; new arrivals queue ahead of the preempted process."""
+    n = len(arrivals)
+    waiting = [0] * n
+    turnaround = [0] * n
+    order = _arrival_order(arrivals)
+    remaining = list(bursts)
+    queue = deque()
+    time = 0
+    nxt = 0
+    while True:
+        nxt = _admit(queue, order, arrivals, remaining, nxt, time)
+        if not queue:
+            if nxt == n:
+                break
+            time = arrivals[order[nxt]]
+            continue
+        i = queue.popleft()
+        run = min(quantum, remaining[i])
+        remaining[i] -= run
+        time += run
+        nxt = _admit(queue, order, arrivals, remaining, nxt, time)
+        if remaining[i] > 0:
+            queue.append(i)
+        else:
+            turnaround[i] = time - arrivals[i]
+            waiting[i] = turnaround[i] - bursts[i]
+    return waiting, turnaround
+
+
+def srtf(arrivals, bursts, cores=1):
+    """Shortest remaining time first: an arrival preempts a process with more time left."""
+    return schedule(arrivals, bursts, 'SRTF', cores)
+
+
+def priority(arrivals, bursts, priorities, aging=AGING, cores=1):
+    """
+    Preemptive priority, lower values first. A waiting process gains one
+    level per `aging` time units it has waited (aging=0 disables aging), so
+    low priorities cannot starve; the aged priority is kept while it runs
+    and reset when it is preempted.
+    """
+    return schedule(arrivals, bursts, 'PRIORITY', cores, priorities=priorities, aging=aging)
+
+
+def mlfq(arrivals, bursts, quanta=MLFQ_QUANTA, cores=1):
+    """
+    Multilevel feedback queue: new processes start at level 0, a process
+    that uses its whole slice moves down a level, and a process at a higher
+    level preempts one running at a lower level. Each level is served in
+    FIFO order.
+    """
+    return schedule(arrivals, bursts, 'MLFQ', cores, quanta=quanta)
+
+
+def schedule(arrivals, bursts, algorithm, cores=1, priorities=None, quantum=3, aging=AGING,
+             quanta=MLFQ_QUANTA):
+    """
+    Run `algorithm` (one of ALGORITHMS) on `cores` identical cores.
+
+    FCFS and SJF on several cores serve the ready set in (arrival, input)
+    and (burst, arrival, input) order; a single core keeps the fcfs()/sjf()
+    semantics. Preemptive policies (SRTF, PRIORITY, MLFQ) check for
+    preemption whenever processes arrive or a core frees up, always
+    preempting the worst running process first.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {ALGORITHMS}")
+    if cores < 1:
+        raise ValueError("cores must be at least 1")
+    if cores == 1:
+        if algorithm == 'FCFS':
+            return fcfs(arrivals, bursts)
+        if algorithm == 'SJF':
+            return sjf(arrivals, bursts)
+        if algorithm == 'RR':
+            return round_robin(arrivals, bursts, quantum)
+
+    n = len(arrivals)
+    waiting = [0] * n
+    turnaround = [0] * n
+    if n == 0:
+        return waiting, turnaround
+    prio = list(priorities) if priorities is not None else [0] * n
+    if len(prio) != n:
+        raise ValueError(f"Got {n} processes but {len(prio)} priorities")
+    order = _arrival_order(arrivals)
+    remaining = list(bursts)
+    level = [0] * n
+    n_levels = len(quanta)
+    rate = 1.0 / aging if aging else 0.0
+    preemptive = algorithm in ('SRTF', 'PRIORITY', 'MLFQ')
+    inf = float('inf')
+
+    ready = []                    # heap of (key, tie-breaks..., i)
+    events = []                   # heap of (time, core, version) for slice ends
+    running = [-1] * cores
+    started = [0] * cores
+    run_len = [0] * cores
+    finishes = [False] * cores
+    rank = [0.0] * cores          # MLFQ level, or the aged priority PRIORITY dispatched at
+    version = [0] * cores
+    idle = list(range(cores - 1, -1, -1))
+    seq = 0
+
+    def push(i, t):
+        nonlocal seq
+        if algorithm == 'FCFS':
+            entry = (arrivals[i], i)
+        elif algorithm == 'SJF':
+            entry = (bursts[i], arrivals[i], i)
+        elif algorithm == 'SRTF':
+            entry = (remaining[i], arrivals[i], i)
+        elif algorithm == 'PRIORITY':
+            # aging is linear in the waiting time, so prio - (now - t) * rate orders
+            # waiters the same way at every later time: the heap never needs a rekey
+            entry = (prio[i] + t * rate, arrivals[i], i)
+        elif algorithm == 'MLFQ':
+            entry = (level[i], seq, i)
+        else:
+            entry = (seq, i)
+        seq += 1
+        heapq.heappush(ready, entry)
+
+    def dispatch(c, t):
+        entry = heapq.heappop(ready)
+        i = entry[-1]
+        if algorithm == 'RR':
+            slice_ = quantum
+        elif algorithm == 'MLFQ':
+            slice_ = quanta[level[i]] if level[i] < n_levels else None
+            rank[c] = level[i]
+        else:
+            slice_ = None
+            if algorithm == 'PRIORITY':
+                rank[c] = entry[0] - t * rate
+        left = remaining[i]
+        finish = slice_ is None or slice_ >= left
+        run = left if finish else slice_
+        running[c] = i
+        started[c] = t
+        run_len[c] = run
+        finishes[c] = finish
+        version[c] += 1
+        heapq.heappush(events, (t + run, c, version[c]))
+
+    def worst_running(t):
+        # (key to beat, core) of the running process a waiter would preempt first
+        worst, core = None, -1
+        for c in range(cores):
+            i = running[c]
+            if i < 0:
+                continue
+            if algorithm == 'SRTF':
+                key = remaining[i] - (t - started[c])
+            elif algorithm == 'PRIORITY':
+                key = rank[c] + t * rate
+            else:
+                key = rank[c]
+            if worst is None or key > worst:
+                worst, core = key, c
+        return worst, core
+
+    t = 0
+    nxt = 0
+    done = 0
+    while done < n:
+        while events and events[0][2] != version[events[0][1]]:
+            heapq.heappop(events)
+        t_arrival = arrivals[order[nxt]] if nxt < n else inf
+        t = min(t_arrival, events[0][0] if events else inf)
+
+        expired = []
+        while events and events[0][0] <= t:
+            _, c, v = heapq.heappop(events)
+            if v != version[c]:
+                continue
+            i = running[c]
+            running[c] = -1
+            version[c] += 1
+            idle.append(c)
+            if finishes[c]:
+                remaining[i] = 0
+                turnaround[i] = t - arrivals[i]
+                waiting[i] = turnaround[i] - bursts[i]
+                done += 1
+            else:
+                remaining[i] -= run_len[c]
+                expired.append(i)
+        # arrivals queue ahead of the processes whose slice just ended, as in round_robin()
+        while nxt < n and arrivals[order[nxt]] <= t:
+            push(order[nxt], t)
+            nxt += 1
+        for i in expired:
+            if algorithm == 'MLFQ' and level[i] < n_levels:
+                level[i] += 1
+            push(i, t)
+
+        while idle and ready:
+            dispatch(idle.pop(), t)
+        if preemptive:
+            while ready:
+                worst, c = worst_running(t)
+                if c < 0 or not ready[0][0] < worst:
+                    break
+                i = running[c]
+                remaining[i] -= t - started[c]
+                running[c] = -1
+                version[c] += 1
+                push(i, t)
+                dispatch(c, t)
+    return waiting, turnaround
@@ -1,7 +1,22 @@
-import pandas as pd
 import random
+import time
+import psutil
+from models import engine
+from models.batch import simulate_batch
+from utils.metrics import registry
+
+RUN_SECONDS = registry.histogram('optios_simulator_run_seconds',
+                                 'Time to schedule one workload and compute its metrics', ['algorithm'])
+_ALGORITHM_SECONDS = {name: RUN_SECONDS.labels(name) for name in engine.ALGORITHMS}
+
+# Names reported in the 'Algorithm' field of the results
+DISPLAY_NAMES = {'FCFS': 'FCFS', 'SJF': 'SJF', 'RR': 'Round Robin', 'SRTF': 'SRTF',
+                 'PRIORITY': 'Priority', 'MLFQ': 'MLFQ'}
 
 class Process:
+    __slots__ = ('pid', 'burst_time', 'priority', 'memory', 'arrival_time',
+                 'waiting_time', 'turnaround_time')
+
     def __init__(self, pid, burst_time, priority, memory, arrival_time):
         self.pid = pid
         self.burst_time = burst_time
@@ -11,89 +26,113 @@ class Process:
         self.waiting_time = 0
         self.turnaround_time = 0
 
+def _round2(x):
+    # Same scale-and-rint rounding as numpy/pandas (21.225 -> 21.22), which
+    # differs from round(x, 2) on ties and is what the metrics always reported
+    return round(x * 100) / 100
+
+def _column(values):
+    # ndarray.tolist() yields plain Python numbers, which the engine handles fastest
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
 class OSSimulator:
-    def __init__(self):
+    """
+    Workloads are held as a structure of arrays: parallel columns of burst,
+    arrival, priority and memory, plus the waiting/turnaround columns written
+    by the last scheduling run. `processes` builds a tuple of Process copies
+    on demand; changing them does not change the workload, so assign a new
+    list to `processes` (or call load_workload()) instead.
+
+    Workloads are scheduled on `cores` identical cores, by default every
+    logical CPU of this host; cores=1 gives the classic single-CPU results.
+    """
+    def __init__(self, cores=None):
+        self.cores = cores or psutil.cpu_count(logical=True) or 1
         self.randomize_processes()
 
     def randomize_processes(self, num_processes=10):
-        self.processes = []
-        for i in range(1, num_processes+1):
-            burst = random.randint(2, 10)
-            priority = random.randint(1, 5)
-            memory = random.randint(50, 300)
-            arrival = random.randint(0, 9)
-            self.processes.append(Process(i, burst, priority, memory, arrival))
+        bursts, priorities, memory, arrivals = [], [], [], []
+        for _ in range(num_processes):
+            bursts.append(random.randint(2, 10))
+            priorities.append(random.randint(1, 5))
+            memory.append(random.randint(50, 300))
+            arrivals.append(random.randint(0, 9))
+        self.load_workload(bursts, arrivals, priorities, memory)
+
+    def load_workload(self, bursts, arrivals, priorities=None, memory=None, pids=None):
+        n = len(bursts)
+        self.bursts = _column(bursts)
+        self.arrivals = _column(arrivals)
+        if len(self.arrivals) != n:
+            raise ValueError(f"Got {n} burst times but {len(self.arrivals)} arrival times")
+        self.priorities = _column(priorities) if priorities is not None else [0] * n
+        self.memory = _column(memory) if memory is not None else [0] * n
+        self.pids = _column(pids) if pids is not None else list(range(1, n + 1))
+        self.waiting = [0] * n
+        self.turnaround = [0] * n
+
+    @property
+    def processes(self):
+        # a tuple, so appending to it fails instead of being silently lost
+        procs = []
+        for i in range(len(self.bursts)):
+            p = Process(self.pids[i], self.bursts[i], self.priorities[i], self.memory[i], self.arrivals[i])
+            p.waiting_time = self.waiting[i]
+            p.turnaround_time = self.turnaround[i]
+            procs.append(p)
+        return tuple(procs)
+
+    @processes.setter
+    def processes(self, processes):
+        self.load_workload([p.burst_time for p in processes],
+                           [p.arrival_time for p in processes],
+                           [p.priority for p in processes],
+                           [p.memory for p in processes],
+                           [p.pid for p in processes])
+
+    def workload(self):
+        """Current workload as rows of (burst, arrival, priority, memory)."""
+        return list(zip(self.bursts, self.arrivals, self.priorities, self.memory))
+
+    def run(self, algorithm, **options):
+        """
+        Schedule the workload with one of engine.ALGORITHMS ('RR' also
+        accepts 'Round Robin'); options (quantum, aging, quanta) go to
+        engine.schedule().
+        """
+        algorithm = 'RR' if algorithm == 'Round Robin' else algorithm
+        started = time.perf_counter()
+        self.waiting, self.turnaround = engine.schedule(self.arrivals, self.bursts, algorithm, self.cores,
+                                                        priorities=self.priorities, **options)
+        result = self._metrics(DISPLAY_NAMES[algorithm])
+        _ALGORITHM_SECONDS[algorithm].observe(time.perf_counter() - started)
+        return result
 
     def fcfs(self):
-        time = 0
-        for p in self.processes:
-            if time < p.arrival_time:
-                time = p.arrival_time
-            p.waiting_time = time - p.arrival_time
-            time += p.burst_time
-            p.turnaround_time = p.waiting_time + p.burst_time
-        return self._metrics("FCFS")
+        return self.run('FCFS')
 
     def sjf(self):
-        time = 0
-        completed = []
-        processes = sorted(self.processes, key=lambda x: x.arrival_time)
-        ready = []
-        while len(completed) < len(processes):
-            for p in processes:
-                if p.arrival_time <= time and p not in ready and p not in completed:
-                    ready.append(p)
-            if ready:
-                ready.sort(key=lambda x: x.burst_time)
-                current = ready.pop(0)
-                current.waiting_time = time - current.arrival_time
-                time += current.burst_time
-                current.turnaround_time = current.waiting_time + current.burst_time
-                completed.append(current)
-            else:
-                time += 1
-        return self._metrics("SJF")
+        return self.run('SJF')
 
     def round_robin(self, quantum=3):
-        queue = []
-        time = 0
-        remaining = {p.pid: p.burst_time for p in self.processes}
-        while True:
-            for p in self.processes:
-                if p.arrival_time <= time and p not in queue and remaining[p.pid] > 0:
-                    queue.append(p)
-            if not queue:
-                if all(v == 0 for v in remaining.values()):
-                    break
-                time += 1
-                continue
-            current = queue.pop(0)
-            exec_time = min(quantum, remaining[current.pid])
-            remaining[current.pid] -= exec_time
-            time += exec_time
-            for p in self.processes:
-                if p != current and p.arrival_time <= time and remaining[p.pid] > 0:
-                    if p not in queue:
-                        queue.append(p)
-            if remaining[current.pid] == 0:
-                current.turnaround_time = time - current.arrival_time
-                current.waiting_time = current.turnaround_time - current.burst_time
-        return self._metrics("Round Robin")
+        return self.run('RR', quantum=quantum)
+
+    def srtf(self):
+        return self.run('SRTF')
+
+    def priority(self, aging=engine.AGING):
+        return self.run('PRIORITY', aging=aging)
+
+    def mlfq(self, quanta=engine.MLFQ_QUANTA):
+        return self.run('MLFQ', quanta=quanta)
+
+    # Vectorized path for many workloads at once, see models/batch.py
+    simulate_batch = staticmethod(simulate_batch)
 
     def _metrics(self, name):
-        df = pd.DataFrame([{
-            'PID': p.pid,
-            'Burst': p.burst_time,
-            'Waiting': p.waiting_time,
-            'Turnaround': p.turnaround_time,
-            'Priority': p.priority,
-            'Memory': p.memory
-        } for p in self.processes])
+        n = len(self.waiting) or 1
         return {
             'Algorithm': name,
-            'Average Waiting Time': round(df['Waiting'].mean(), 2),
-            'Average Turnaround Time': round(df['Turnaround'].mean(), 2)
+            'Average Waiting Time': _round2(sum(self.waiting) / n),
+            'Average Turnaround Time': _round2(sum(self.turnaround) / n)
         }
-
-# shared simulator instance
-shared_simulator = OSSimulator()
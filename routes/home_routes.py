@@ -1,8 +1,10 @@
-from flask import Blueprint, render_template, jsonify
-import psutil
-import random
+from flask import Blueprint, render_template, jsonify, request, Response, stream_with_context, current_app
+import json
+import time
+from utils.broadcaster import shared_broadcaster
+from utils.metrics import CONTENT_TYPE, instrument_blueprint, registry
 
-home_bp = Blueprint('home', __name__)
+home_bp = instrument_blueprint(Blueprint('home', __name__))
 
 @home_bp.route('/')
 def home():
@@ -10,15 +12,80 @@ def home():
 
 @home_bp.route('/live')
 def live():
-    cpu = psutil.cpu_percent(interval=0.2)
-    memory = psutil.virtual_memory().percent
-    procs = len(psutil.pids())
-    avg_burst = random.uniform(5,50) * (cpu / 100)
-    avg_priority = random.uniform(1,10)
-    return jsonify({
-        'cpu': round(cpu,2),
-        'memory': round(memory,2),
-        'processes': int(procs),
-        'avg_burst_time': round(avg_burst,2),
-        'avg_priority': round(avg_priority,2)
-    })
+    # Latest shared snapshot; LIVE_MAX_AGE (seconds) bounds how stale it may be
+    from utils.sampler import shared_sampler
+    return jsonify(shared_sampler.snapshot(current_app.config.get('LIVE_MAX_AGE')))
+
+@home_bp.route('/stream')
+def stream():
+    """
+    Server-Sent Events feed of pushed updates. ?topics= narrows it to a comma
+    separated subset of: live (1 s system snapshot), monitor (LiveMonitor
+    records) and predict (RL decision + simulated comparison).
+
+    The response ends after STREAM_MAX_SECONDS (default 300) and the browser
+    reconnects, so no connection holds a server thread forever.
+    """
+    topics = request.args.get('topics')
+    deadline = time.monotonic() + current_app.config.get('STREAM_MAX_SECONDS', 300)
+    sub = shared_broadcaster.subscribe(topics.split(',') if topics else None)
+
+    def generate():
+        try:
+            yield 'retry: 2000\n\n'
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                frames = sub.get(timeout=min(15, remaining))
+                if frames is None:
+                    break  # dropped as a slow consumer; the browser reconnects
+                # comment frame keeps proxies from closing an idle stream
+                yield ''.join(frames) if frames else ': keepalive\n\n'
+        finally:
+            shared_broadcaster.unsubscribe(sub)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@home_bp.route('/metrics')
+def metrics():
+    # Prometheus text exposition of every metric in the shared registry
+    return Response(registry.render(), content_type=CONTENT_TYPE)
+
+def _time_arg(name):
+    from utils.data_manager import parse_time
+
+    return parse_time(request.args.get(name))
+
+@home_bp.route('/history')
+def history():
+    """
+    Stored samples in [start, end) as newline-delimited JSON, one object of
+    column arrays per chunk. Query args: start, end (epoch seconds or ISO),
+    fields (comma separated), downsample (bucket seconds), aggregates
+    (comma separated mean/min/max/count, used with downsample) and host
+    (one host's samples; all hosts by default).
+    """
+    from utils.data_manager import shared_data_manager
+
+    fields = request.args.get('fields')
+    downsample = request.args.get('downsample')
+    aggregates = request.args.get('aggregates')
+    try:
+        chunks = shared_data_manager.query(
+            start=_time_arg('start'),
+            end=_time_arg('end'),
+            fields=fields.split(',') if fields else None,
+            downsample=float(downsample) if downsample else None,
+            aggregates=aggregates.split(',') if aggregates else ('mean',),
+            host=request.args.get('host') or None,
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        for chunk in chunks:
+            yield json.dumps({k: v.tolist() for k, v in chunk.items()}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
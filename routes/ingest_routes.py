@@ -0,0 +1,58 @@
+import hmac
+import os
+from flask import Blueprint, jsonify, request
+from utils.ingest import MAX_BODY_BYTES, IngestError, decode_batch
+from utils.metrics import instrument_blueprint, registry
+
+ingest_bp = instrument_blueprint(Blueprint('ingest', __name__))
+
+BATCHES = registry.counter('optios_ingest_batches_total', 'Batches received on /ingest', ['outcome'])
+RECORDS = registry.counter('optios_ingest_records_total', 'Records accepted on /ingest')
+
+def _authorized():
+    # OPTIOS_INGEST_TOKEN, when set, must be sent as "Authorization: Bearer <token>"
+    token = os.environ.get('OPTIOS_INGEST_TOKEN')
+    if not token:
+        return True
+    sent = request.headers.get('Authorization', '')
+    return hmac.compare_digest(sent.encode(), f'Bearer {token}'.encode())
+
+@ingest_bp.route('/ingest', methods=['POST'])
+def ingest():
+    """
+    Bulk ingestion of samples from remote agents (see utils/ingest.py for
+    the format). Answers 202 with the number of records queued; 503 when
+    the storage queue is full so the agent keeps the batch and retries.
+    """
+    from utils.data_manager import shared_data_manager
+
+    if not _authorized():
+        BATCHES.labels('unauthorized').inc()
+        return jsonify({'error': 'invalid or missing ingest token'}), 401
+    if (request.content_length or 0) > MAX_BODY_BYTES:
+        BATCHES.labels('rejected').inc()
+        return jsonify({'error': f'Batch exceeds {MAX_BODY_BYTES} bytes'}), 413
+    try:
+        host, records = decode_batch(request.get_data(cache=False),
+                                     request.headers.get('Content-Encoding'))
+    except IngestError as e:
+        BATCHES.labels('rejected').inc()
+        return jsonify({'error': str(e)}), e.status
+
+    accepted = shared_data_manager.add_records(records, host=host)
+    if records and not accepted:
+        BATCHES.labels('dropped').inc()
+        return jsonify({'error': 'storage queue full', 'accepted': 0}), 503, {'Retry-After': '1'}
+    BATCHES.labels('accepted').inc()
+    RECORDS.inc(accepted)
+    return jsonify({'host': host, 'accepted': accepted}), 202
+
+@ingest_bp.route('/hosts')
+def hosts():
+    """Hosts that have sent samples, with their record counts, last arrival and latest sample."""
+    from utils.data_manager import shared_data_manager
+
+    result = shared_data_manager.hosts()
+    for host, info in result.items():
+        info['latest'] = shared_data_manager.get_latest(host)
+    return jsonify(result)
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def data_manager(tmp_path, monkeypatch):
+    """A fresh DataManager on a scratch database, installed as shared_data_manager."""
+    import utils.data_manager as module
+
+    # DataManager is a per-process singleton; start every test from a new one
+    monkeypatch.setattr(module.DataManager, '_instance', None)
+    dm = module.DataManager(str(tmp_path / 'optios.db'))
+    monkeypatch.setattr(module, 'shared_data_manager', dm, raising=False)
+    yield dm
+    dm.close()
+
+
+@pytest.fixture
+def client(data_manager, tmp_path, monkeypatch):
+    """Test client of an app without background services, run from a scratch directory."""
+    from app import create_app
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('OPTIOS_INGEST_TOKEN', raising=False)
+    return create_app(services='off').test_client()
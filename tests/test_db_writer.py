@@ -0,0 +1,38 @@
+"""BatchedWriter failure handling."""
+import sqlite3
+import threading
+
+from utils.db_writer import BatchedWriter
+
+
+def _writer(tmp_path, **kwargs):
+    path = str(tmp_path / 'writer.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.close()
+    return path, BatchedWriter(path, 'INSERT INTO t VALUES (?)', name='TestWriter', **kwargs)
+
+
+def test_bad_row_only_loses_itself(tmp_path):
+    path, writer = _writer(tmp_path)
+    writer.start()
+    writer.put_many([(1,), (2 ** 70,), (3,)])
+    writer.put((4,))
+    assert writer.flush()
+    assert writer.close()
+    assert writer.stats['written'] == 3
+    assert writer.stats['errors'] == 1
+    assert sqlite3.connect(path).execute('SELECT x FROM t ORDER BY x').fetchall() == [(1,), (3,), (4,)]
+
+
+def test_flush_and_close_give_up_on_a_full_queue(tmp_path):
+    _, writer = _writer(tmp_path, max_queue=1, put_timeout=0.01)
+    # a writer thread that never drains the queue
+    release = threading.Event()
+    writer.thread = threading.Thread(target=release.wait, daemon=True)
+    writer.thread.start()
+    assert writer.put((1,))
+    assert not writer.put((2,))
+    assert writer.flush(timeout=0.1) is False
+    assert writer.close(timeout=0.1) is False
+    release.set()
@@ -0,0 +1,73 @@
+"""The event engine and the batch simulator against the original quadratic simulator."""
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.legacy import OSSimulator as LegacySimulator, Process
+from models import engine
+from models.batch import random_workloads, simulate_batch
+from models.simulator import OSSimulator
+
+METHODS = ('fcfs', 'sjf', 'round_robin')
+NAMES = {'fcfs': 'FCFS', 'sjf': 'SJF', 'round_robin': 'RR'}
+
+
+def _random_processes(rng, n, arrival_span):
+    return [Process(i, rng.randint(2, 10), rng.randint(1, 5), rng.randint(50, 300),
+                    rng.randint(0, arrival_span - 1)) for i in range(1, n + 1)]
+
+
+def _copies(procs):
+    return [Process(p.pid, p.burst_time, p.priority, p.memory, p.arrival_time) for p in procs]
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_engine_matches_legacy(method):
+    rng = random.Random(method)
+    legacy = LegacySimulator()
+    current = OSSimulator(cores=1)
+    for _ in range(150):
+        n = rng.randint(1, 40)
+        # wide arrival spans exercise idle gaps, narrow ones exercise ties
+        procs = _random_processes(rng, n, rng.choice([1, 10, 5 * n + 1]))
+        legacy.processes = _copies(procs)
+        current.processes = _copies(procs)
+        assert getattr(current, method)() == getattr(legacy, method)()
+        assert [(p.waiting_time, p.turnaround_time) for p in current.processes] == \
+               [(p.waiting_time, p.turnaround_time) for p in legacy.processes]
+
+
+def test_simulate_batch_matches_legacy():
+    wl = random_workloads(200, 12, rng=0)
+    bursts, arrivals = wl['bursts'], wl['arrivals']
+    results = simulate_batch(bursts, arrivals)
+    legacy = LegacySimulator()
+    for w in range(len(bursts)):
+        procs = [Process(i + 1, int(b), 1, 100, int(a)) for i, (b, a) in enumerate(zip(bursts[w], arrivals[w]))]
+        for method in METHODS:
+            legacy.processes = _copies(procs)
+            expected = getattr(legacy, method)()
+            got = results[NAMES[method]]
+            assert round(got['Average Waiting Time'][w], 2) == pytest.approx(expected['Average Waiting Time'])
+            assert round(got['Average Turnaround Time'][w], 2) == pytest.approx(expected['Average Turnaround Time'])
+
+
+@pytest.mark.parametrize('cores', [1, 3])
+def test_simulate_batch_matches_engine(cores):
+    wl = random_workloads(50, 9, rng=cores)
+    bursts, arrivals, priorities = wl['bursts'], wl['arrivals'], wl['priorities']
+    results = simulate_batch(bursts, arrivals, algorithms=engine.ALGORITHMS, priorities=priorities, cores=cores)
+    for name in engine.ALGORITHMS:
+        for w in range(len(bursts)):
+            waiting, turnaround = engine.schedule(arrivals[w].tolist(), bursts[w].tolist(), name, cores,
+                                                  priorities=priorities[w].tolist())
+            assert results[name]['Average Waiting Time'][w] == pytest.approx(np.mean(waiting))
+            assert results[name]['Average Turnaround Time'][w] == pytest.approx(np.mean(turnaround))
+
+
+def test_processes_is_a_read_only_copy():
+    sim = OSSimulator(cores=1)
+    assert isinstance(sim.processes, tuple)
+    sim.processes = list(sim.processes) + [Process(99, 4, 1, 10, 0)]
+    assert len(sim.processes) == 11
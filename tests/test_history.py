@@ -0,0 +1,68 @@
+"""GET /history argument validation and DataManager.query() over the raw table and the rollup tiers."""
+import json
+
+import numpy as np
+import pytest
+
+BASE_MS = 1700000000000
+
+
+@pytest.fixture
+def samples(data_manager):
+    # 10 minutes of half-second samples, starting 20 s into a minute
+    for i in range(1200):
+        data_manager.add_record({'cpu_percent': float(i % 97), 'memory_usage': 50.0, 'ts': BASE_MS + i * 500})
+    assert data_manager.flush()
+    return data_manager
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.mark.parametrize('query', [
+    'start=inf', 'start=nan', 'end=-inf', 'start=1e300', 'start=yesterday', 'end=2025-13-01',
+    'downsample=0', 'downsample=-5', 'downsample=inf', 'downsample=nan', 'downsample=soon',
+    'fields=cpu_percent,bogus', 'downsample=60&aggregates=median',
+])
+def test_rejects_bad_arguments(client, query):
+    response = client.get(f'/history?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_raw_range(client, samples):
+    start, end = (BASE_MS + 10000) / 1000, (BASE_MS + 20000) / 1000
+    chunks = _lines(client.get(f'/history?start={start}&end={end}&fields=cpu_percent'))
+    ts = [t for c in chunks for t in c['ts']]
+    assert ts == list(range(BASE_MS + 10000, BASE_MS + 20000, 500))
+
+
+def test_iso_and_epoch_bounds_agree(client, samples):
+    by_epoch = client.get(f'/history?start={BASE_MS / 1000 + 60}&end={BASE_MS / 1000 + 120}').get_data()
+    by_iso = client.get('/history?start=2023-11-14T22:14:20&end=2023-11-14T22:15:20').get_data()
+    assert by_epoch == by_iso
+
+
+@pytest.mark.parametrize('downsample', [1, 60, 120])
+def test_tiers_match_raw(samples, monkeypatch, downsample):
+    # unaligned bounds: both paths must return the same whole buckets
+    kwargs = dict(start=(BASE_MS + 12300) / 1000, end=(BASE_MS + 400700) / 1000, downsample=downsample,
+                  fields=['cpu_percent'], aggregates=('mean', 'min', 'max', 'count'))
+    assert samples.rollups.tier_for(downsample * 1000) is not None
+    tiered = list(samples.query(**kwargs))
+    monkeypatch.setattr(samples.rollups, 'tier_for', lambda resolution_ms: None)
+    raw = list(samples.query(**kwargs))
+    assert len(tiered) == len(raw) == 1
+    for key in raw[0]:
+        np.testing.assert_allclose(tiered[0][key], raw[0][key])
+    assert tiered[0]['ts'][0] % (downsample * 1000) == 0
+
+
+def test_none_metrics_are_stored(samples):
+    samples.add_record({'cpu_percent': None, 'ready_queue_size': None, 'ts': BASE_MS + 600000})
+    assert samples.flush()
+    assert samples.writer.stats['errors'] == 0
+    chunk, = samples.query(start=(BASE_MS + 600000) / 1000, fields=['cpu_percent'], downsample=1,
+                           aggregates=('mean', 'count'))
+    assert chunk['count'].tolist() == [1]
@@ -0,0 +1,83 @@
+"""Validation and storage ordering of POST /ingest."""
+import gzip
+import json
+
+import pytest
+
+from utils.ingest import IngestError, decode_batch, encode_batch
+
+
+def _post(client, body, **headers):
+    return client.post('/ingest', data=body, content_type='application/json', headers=headers)
+
+
+def test_accepts_a_batch(client, data_manager):
+    body, headers = encode_batch('web-1', [{'cpu_percent': 12.5, 'ts': 1700000000000},
+                                           {'cpu_percent': 13.0, 'timestamp': '2025-01-01T00:00:00'}])
+    response = client.post('/ingest', data=body, headers=headers)
+    assert response.status_code == 202
+    assert response.get_json() == {'host': 'web-1', 'accepted': 2}
+    assert data_manager.hosts()['web-1']['records'] == 2
+    assert data_manager.flush()
+
+
+@pytest.mark.parametrize('record', [
+    '{"cpu_percent": 1.0, "ts": 1e300}',
+    '{"cpu_percent": 1.0, "ts": NaN}',
+    '{"cpu_percent": 1.0, "ts": Infinity}',
+    '{"cpu_percent": 1.0, "ts": -1}',
+    '{"cpu_percent": 1.0, "ts": true}',
+    '{"cpu_percent": 1.0, "ts": "1700000000000"}',
+    '{"cpu_percent": Infinity}',
+    '{"cpu_percent": NaN}',
+    '{"cpu_percent": "12"}',
+    '{"cpu_percent": 1.0, "timestamp": "yesterday"}',
+    '{"cpu_percent": 1.0, "timestamp": 1700000000}',
+    '[1, 2]',
+])
+def test_rejects_bad_records(client, data_manager, record):
+    # one bad record rejects the whole batch before anything is stored
+    body = '{"host": "web-1", "records": [{"cpu_percent": 5.0}, %s]}' % record
+    response = _post(client, body)
+    assert response.status_code == 400
+    assert 'Record 1' in response.get_json()['error']
+    assert data_manager.hosts() == {}
+    assert data_manager.writer.stats['enqueued'] == 0
+
+
+@pytest.mark.parametrize('body, status', [
+    ('not json', 400),
+    ('[]', 400),
+    ('{"records": []}', 400),
+    ('{"host": "local", "records": []}', 400),
+    ('{"host": "web-1", "records": {}}', 400),
+])
+def test_rejects_bad_batches(client, body, status):
+    assert _post(client, body).status_code == status
+
+
+def test_rejects_unsupported_encoding(client):
+    assert _post(client, '{"host": "a", "records": []}', **{'Content-Encoding': 'br'}).status_code == 415
+
+
+def test_bounded_decompression():
+    bomb = gzip.compress(json.dumps({'host': 'a', 'records': [{}] * 1000}).encode())
+    with pytest.raises(IngestError) as error:
+        decode_batch(bomb, 'gzip', max_bytes=1000)
+    assert error.value.status == 413
+
+
+def test_full_queue_stores_nothing(client, data_manager, monkeypatch):
+    monkeypatch.setattr(data_manager.writer, 'put_many', lambda rows: False)
+    body, headers = encode_batch('web-1', [{'cpu_percent': 1.0}])
+    response = client.post('/ingest', data=body, headers=headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert data_manager.hosts() == {}
+
+
+def test_add_record_is_not_buffered_when_dropped(data_manager, monkeypatch):
+    monkeypatch.setattr(data_manager.writer, 'put', lambda row: False)
+    assert data_manager.add_record({'cpu_percent': 1.0}) is False
+    assert data_manager.seq == 0
+    assert data_manager.get_latest() is None
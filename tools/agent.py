@@ -0,0 +1,52 @@
+"""
+Run LiveMonitor in agent mode and ship samples to a central OptiOS server.
+
+Samples are taken exactly as the server's own monitor takes them, buffered
+locally and POSTed to the server's /ingest endpoint in gzip-compressed
+batches. Nothing is stored on the agent host.
+
+    python -m tools.agent --url http://optios.internal:5001/ingest
+    python -m tools.agent --url http://localhost:5001/ingest --host web-1 --interval 1 --batch-size 60
+"""
+import argparse
+import os
+import socket
+import time
+
+from utils.live_monitor import LiveMonitor
+from utils.remote_sink import RemoteSink
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', required=True, help="the server's /ingest URL")
+    parser.add_argument('--host', default=socket.gethostname(), help='name this host reports as')
+    parser.add_argument('--interval', type=float, default=5, help='seconds between samples')
+    parser.add_argument('--batch-size', type=int, default=12, help='samples per POST')
+    parser.add_argument('--flush-interval', type=float, default=60,
+                        help='POST at least this often, even with a partial batch')
+    parser.add_argument('--max-buffer', type=int, default=50000,
+                        help='samples kept while the server is unreachable; the oldest are dropped beyond this')
+    parser.add_argument('--token', default=os.environ.get('OPTIOS_INGEST_TOKEN'),
+                        help='bearer token expected by the server (default: $OPTIOS_INGEST_TOKEN)')
+    args = parser.parse_args()
+
+    sink = RemoteSink(args.url, host=args.host, batch_size=args.batch_size,
+                      flush_interval=args.flush_interval, max_buffer=args.max_buffer, token=args.token)
+    monitor = LiveMonitor(interval=args.interval, sink=sink)
+    monitor.start()
+    print(f"Shipping samples from {args.host} to {args.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop()
+        sink.close()
+        print(f"Sent {sink.stats['sent']} samples in {sink.stats['batches']} batches "
+              f"({sink.stats['dropped']} dropped, {sink.stats['errors']} failed POSTs)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Pre-train the RL agent from stored monitoring data.
+
+Learns quantile state bins from the system_stats table of optios.db, replays
+it in bulk (the same transitions and reward the live trainer uses) and
+writes a checkpoint, bins included, that the app loads at startup, so a
+fresh deployment serves a trained policy right away.
+
+    python -m tools.pretrain_rl --db optios.db --output rl_checkpoint.npz
+    python -m tools.pretrain_rl --reward simulation --workers 8
+    python -m tools.pretrain_rl --reward simulation --actions FCFS,SJF,RR,SRTF,PRIORITY,MLFQ
+"""
+import argparse
+import os
+import time
+
+from models.engine import parse_algorithms
+from utils.data_manager import DataManager, parse_time
+from utils.rollups import LOCAL_HOST
+from utils.rl_agent import (ACTION_MAP, DEFAULT_CHECKPOINT, QUANTILE_BINS, REWARD_MODES, RLSchedulerAgent,
+                            make_reward_fn, pretrain_from_db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default='optios.db')
+    parser.add_argument('--output', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--start', type=parse_time, default=None,
+                        help='only replay samples at or after this time (ISO or epoch seconds)')
+    parser.add_argument('--end', type=parse_time, default=None, help='only replay samples before this time')
+    parser.add_argument('--host', default=LOCAL_HOST,
+                        help="replay the samples of this host (default: the server's own monitor)")
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--bins', type=int, default=QUANTILE_BINS,
+                        help='quantile bins per state feature, learned from the replayed rows')
+    parser.add_argument('--reward', choices=REWARD_MODES, default='delta',
+                        help="'simulation' rewards each choice with its simulated waiting time")
+    parser.add_argument('--actions', type=parse_algorithms, default=tuple(ACTION_MAP.values()),
+                        help='comma-separated algorithms the agent chooses between (default: $OPTIOS_ACTIONS '
+                             'or FCFS,SJF,RR); the server must use the same ones')
+    parser.add_argument('--workers', type=int, default=None, help='simulation worker processes (default: all cores)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the existing checkpoint at --output, keeping its bins')
+    args = parser.parse_args()
+
+    agent = RLSchedulerAgent(actions=args.actions)
+    bins = args.bins
+    if args.resume and os.path.exists(args.output):
+        agent.load_checkpoint(args.output)
+        bins = None
+    # DataManager is a singleton bound to optios.db; open a private instance for --db
+    DataManager._instance = None
+    data_manager = DataManager(args.db, async_writes=False)
+    reward_fn = make_reward_fn(args.reward, args.workers, agent.actions)
+    start = time.perf_counter()
+    try:
+        n = pretrain_from_db(agent, data_manager, args.start, args.end, args.chunk_size, bins, reward_fn,
+                             args.host)
+    finally:
+        if hasattr(reward_fn, 'close'):
+            reward_fn.close()
+    elapsed = time.perf_counter() - start
+    agent.save_checkpoint(args.output)
+    rate = n / elapsed if elapsed else 0
+    print(f"Replayed {n} transitions in {elapsed:.2f}s ({rate:,.0f}/s); "
+          f"epsilon {agent.epsilon:.3f}, {len(agent.q_table)} of {agent.encoder.n_states} states visited")
+    print(f"Checkpoint written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
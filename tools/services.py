@@ -0,0 +1,44 @@
+"""
+Run sampling and RL training as a sidecar process, without serving HTTP.
+
+Takes the leader lock (waiting for it if a web worker holds it), then runs
+LiveMonitor and the trainer and shares their output like an elected web
+worker would. Pair it with web workers started with OPTIOS_SERVICES=follower.
+
+    python -m tools.services
+    OPTIOS_SERVICES=follower gunicorn -w 8 -k gthread --threads 32 wsgi:app
+"""
+import argparse
+import os
+import time
+
+from utils.rl_agent import REWARD_MODES
+from utils.services import DEFAULT_LOCK, BackgroundServices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lock', default=DEFAULT_LOCK, help='leader lock file shared with the web workers')
+    parser.add_argument('--interval', type=float, default=5, help='seconds between samples and training ticks')
+    parser.add_argument('--checkpoint-interval', type=float,
+                        default=float(os.environ.get('OPTIOS_CHECKPOINT_INTERVAL', 15)),
+                        help='seconds between checkpoints, which is how often followers see a new policy')
+    parser.add_argument('--reward', choices=REWARD_MODES, default=os.environ.get('OPTIOS_REWARD', 'delta'))
+    parser.add_argument('--pretrain', action='store_true', help='replay optios.db before starting')
+    args = parser.parse_args()
+
+    print("Waiting for the leader lock...")
+    services = BackgroundServices('leader', lock_path=args.lock, checkpoint_interval=args.checkpoint_interval,
+                                  interval=args.interval, reward_mode=args.reward, pretrain=args.pretrain)
+    services.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        services.stop()
+
+
+if __name__ == '__main__':
+    main()
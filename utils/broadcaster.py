@@ -0,0 +1,110 @@
+import json
+import threading
+
+class Subscription:
+    """
+    One streaming client. Holds at most one unread frame per topic: a newer
+    update for a topic the client has not read yet replaces the old one
+    (coalescing), and a client that keeps falling behind is dropped.
+    """
+    def __init__(self, topics, max_pending, max_coalesced):
+        self.topics = set(topics) if topics else None
+        self.max_pending = max_pending
+        self.max_coalesced = max_coalesced
+        self.closed = False
+        self.coalesced = 0
+        self._behind = 0
+        self._pending = {}
+        self._cond = threading.Condition()
+
+    def wants(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def offer(self, topic, frame):
+        with self._cond:
+            if self.closed:
+                return False
+            if topic in self._pending:
+                self.coalesced += 1
+                self._behind += 1
+                if self._behind > self.max_coalesced:
+                    self.close_locked()
+                    return False
+            elif len(self._pending) >= self.max_pending:
+                self.close_locked()
+                return False
+            self._pending[topic] = frame
+            self._cond.notify()
+        return True
+
+    def close_locked(self):
+        self.closed = True
+        self._pending.clear()
+        self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.close_locked()
+
+    def get(self, timeout=None):
+        """Pending frames in publish order, [] on timeout, None once closed."""
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            if self.closed:
+                return None
+            frames = list(self._pending.values())
+            self._pending.clear()
+            self._behind = 0
+            return frames
+
+class Broadcaster:
+    """
+    Fan-out of dashboard updates to streaming clients.
+
+    publish() serializes each update once into a Server-Sent Events frame and
+    hands the same frame to every subscriber, so N viewers cost one sample
+    and one json.dumps. The last frame per topic is replayed to new
+    subscribers so a freshly opened dashboard renders immediately.
+    """
+    def __init__(self, max_pending=8, max_coalesced=30):
+        self.max_pending = max_pending
+        self.max_coalesced = max_coalesced
+        self._lock = threading.Lock()
+        # replaced, never mutated, so publish() can iterate without the lock
+        self._subscribers = ()
+        self._last = {}
+        self.stats = {'published': 0, 'dropped_subscribers': 0}
+
+    def subscribe(self, topics=None):
+        sub = Subscription(topics, self.max_pending, self.max_coalesced)
+        with self._lock:
+            self._subscribers = self._subscribers + (sub,)
+            last = dict(self._last)
+        for topic, frame in last.items():
+            if sub.wants(topic):
+                sub.offer(topic, frame)
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.close()
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+
+    def has_subscribers(self, topic=None):
+        return any(topic is None or s.wants(topic) for s in self._subscribers)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def publish(self, topic, data):
+        frame = f"event: {topic}\ndata: {json.dumps(data)}\n\n"
+        self._last[topic] = frame
+        self.stats['published'] += 1
+        for sub in self._subscribers:
+            if sub.wants(topic) and not sub.offer(topic, frame):
+                self.stats['dropped_subscribers'] += 1
+                self.unsubscribe(sub)
+
+# Shared instance
+shared_broadcaster = Broadcaster()
@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+
+class _Call:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a TTL and single-flight computation.
+
+    get_or_compute(key, fn) returns a fresh cached value if there is one.
+    Otherwise exactly one caller runs fn() while concurrent callers for the
+    same key wait for its result instead of computing it again.
+    """
+    def __init__(self, maxsize=128, ttl=5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()   # key -> (expires_at, value)
+        self._inflight = {}          # key -> _Call
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+
+    def get_or_compute(self, key, fn):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[1]
+                del self._data[key]
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            with self._lock:
+                self._data[key] = (time.monotonic() + self.ttl, call.value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.stats['evictions'] += 1
+            return call.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        with self._lock:
+            info = dict(self.stats)
+            info['size'] = len(self._data)
+        lookups = info['hits'] + info['misses'] + info['coalesced']
+        info['hit_rate'] = round((info['hits'] + info['coalesced']) / lookups, 4) if lookups else 0.0
+        return info
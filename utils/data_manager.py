@@ -1,10 +1,90 @@
 import threading
 import collections
 import sqlite3
+import atexit
+import math
+import os
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+import numpy as np
+from utils.db_writer import BatchedWriter, WRITE_SECONDS
+from utils.metrics import registry
+from utils.rollups import Rollups, METRICS, AGGREGATES, LOCAL_HOST
+from utils.replay import ExperienceBuffer
+from utils.state_encoder import STATE_FIELDS
+
+INSERT_SQL = '''
+    INSERT INTO system_stats (host, timestamp, ts, cpu_percent, memory_usage, ready_queue_size, avg_burst_time, avg_priority)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+RECORDS = registry.counter('optios_datamanager_records_total', 'Samples added to the DataManager')
+HOSTS = registry.gauge('optios_datamanager_hosts', 'Hosts with records in the DataManager')
+SYNC_WRITE_SECONDS = WRITE_SECONDS.labels('sync')
+
+# Per-host buffers are guarded by one of this many locks, picked by hashing the host
+LOCK_SHARDS = 16
+
+# Numeric columns that query() can return
+QUERY_FIELDS = METRICS
+
+# Epoch seconds at the start of year 10000, past the last ISO time
+MAX_EPOCH_SECONDS = 253402300800
+
+def to_epoch_ms(value):
+    """
+    Epoch milliseconds for an epoch-seconds number, a datetime or an ISO
+    string. Naive datetimes are UTC, like the timestamps LiveMonitor writes.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(round(value * 1000))
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(round(value.timestamp() * 1000))
+
+def parse_time(value):
+    """
+    A time given as text (query args, command-line options): a number is
+    epoch seconds, anything else must be an ISO string. Empty means None.
+    Numbers must be finite and fit the years an ISO string can express.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        datetime.fromisoformat(value)  # raises ValueError for anything else
+        return value
+    if not math.isfinite(seconds) or abs(seconds) >= MAX_EPOCH_SECONDS:
+        raise ValueError(f"time {value!r} is out of range")
+    return seconds
+
+class HostBuffer:
+    """Recent records of one host, guarded by the lock shard the host hashes to."""
+    __slots__ = ('host', 'records', 'seq', 'last_seen')
+
+    def __init__(self, host, history_len):
+        self.host = host
+        self.records = collections.deque(maxlen=history_len)
+        # Number of records ever added for this host; identifies its latest sample
+        self.seq = 0
+        self.last_seen = None
 
 class DataManager:
+    """
+    Stores system samples of the local host and of any remote host that
+    ships them to /ingest.
+
+    Every host has its own bounded live buffer; the buffers are spread over
+    `lock_shards` locks so hosts ingesting concurrently rarely contend. Rows
+    of all hosts go to the same tables, keyed by a host column. Only local
+    samples feed the RL experience buffer, since the agent schedules this
+    machine.
+    """
     _instance = None
     _lock = threading.Lock()
 
@@ -15,30 +95,72 @@ class DataManager:
                     cls._instance = super(DataManager, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, db_path='optios.db', history_len=200):
+    def __init__(self, db_path='optios.db', history_len=200, async_writes=True,
+                 flush_size=256, flush_interval=1.0, max_queue=10000,
+                 retention=None, retention_interval=60.0, experience_size=65536,
+                 lock_shards=LOCK_SHARDS):
         # Prevent re-initialization
         if hasattr(self, 'initialized') and self.initialized:
             return
         
         self.db_path = db_path
         self.history_len = history_len
-        # In-memory storage for fast access by RL agent
-        self.live_data = collections.deque(maxlen=history_len)
-        self.data_lock = threading.Lock()
+        # In-memory storage for fast access by RL agent, one buffer per host
+        self._shards = [threading.Lock() for _ in range(max(1, lock_shards))]
+        self._hosts = {}
+        self.local = self._buffer(LOCAL_HOST)
+        # The local host's buffer and lock, as used before hosts were tracked
+        self.live_data = self.local.records
+        self.data_lock = self._lock_for(LOCAL_HOST)
+        # With several server processes, remote hosts' buffers are filled by
+        # sync_from_db() only, so each process sees every process's ingests once
+        self.mirror_remote = False
+        self._sync_cursor = None
+        HOSTS.set_function(lambda: len(self._hosts))
+        # RL state of every sample, for the trainer to consume by sequence number
+        self.experience = ExperienceBuffer(experience_size, len(STATE_FIELDS))
+        # Downsampling tiers (1s/1m/1h) and per-tier retention, seconds per tier name
+        self.rollups = Rollups(retention)
         
         # Initialize DB
         self._init_db()
+
+        # Write-behind persistence: samples are batched by a background writer
+        # instead of opening a connection and committing per record
+        self.writer = None
+        if async_writes:
+            self._writer_args = dict(flush_size=flush_size, flush_interval=flush_interval, max_queue=max_queue,
+                                     maintenance_interval=retention_interval)
+            self.writer = self._new_writer()
+            atexit.register(self.close)
+            if hasattr(os, 'register_at_fork'):
+                os.register_at_fork(after_in_child=self._after_fork)
         self.initialized = True
         print("🟢 DataManager initialized")
 
+    def _new_writer(self):
+        writer = BatchedWriter(self.db_path, INSERT_SQL, name='DataManagerWriter', on_batch=self.rollups.apply,
+                               maintenance=self.rollups.prune, **self._writer_args)
+        writer.start()
+        return writer
+
+    def _after_fork(self):
+        # The writer thread does not survive fork(); rows still queued belong to the parent
+        if self.writer is not None:
+            self.writer = self._new_writer()
+
     def _init_db(self):
         try:
             conn = sqlite3.connect(self.db_path)
+            # WAL lets readers run alongside the background writer; the mode is persistent
+            conn.execute('PRAGMA journal_mode=WAL')
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE TABLE IF NOT EXISTS system_stats (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    host TEXT NOT NULL DEFAULT '{LOCAL_HOST}',
                     timestamp TEXT,
+                    ts INTEGER,
                     cpu_percent REAL,
                     memory_usage REAL,
                     ready_queue_size INTEGER,
@@ -46,52 +168,314 @@ class DataManager:
                     avg_priority REAL
                 )
             ''')
+            # Databases created before the epoch column: add and backfill it from the ISO text
+            columns = [row[1] for row in cursor.execute('PRAGMA table_info(system_stats)')]
+            if 'ts' not in columns:
+                cursor.execute('ALTER TABLE system_stats ADD COLUMN ts INTEGER')
+                cursor.execute('''
+                    UPDATE system_stats
+                    SET ts = CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER)
+                    WHERE ts IS NULL
+                ''')
+            # Databases from before multi-host ingestion: every row came from the local monitor
+            if 'host' not in columns:
+                cursor.execute(f"ALTER TABLE system_stats ADD COLUMN host TEXT NOT NULL DEFAULT '{LOCAL_HOST}'")
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_stats_ts ON system_stats (ts)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_stats_host_ts ON system_stats (host, ts)')
+            self.rollups.init_db(cursor)
             conn.commit()
             conn.close()
         except Exception as e:
             print(f"🔴 DataManager DB Init Error: {e}")
 
-    def add_record(self, record):
+    @property
+    def seq(self):
+        """Number of local records ever added; identifies the latest local sample."""
+        return self.local.seq
+
+    def _lock_for(self, host):
+        return self._shards[hash(host) % len(self._shards)]
+
+    def _buffer(self, host):
+        buf = self._hosts.get(host)
+        if buf is None:
+            with self._lock_for(host):
+                buf = self._hosts.setdefault(host, HostBuffer(host, self.history_len))
+        return buf
+
+    def add_record(self, record, host=LOCAL_HOST):
         """
         record: dict containing keys matching the schema
+
+        Like add_records(), the row is queued for storage first: a record the
+        writer drops is not shown live either, and False is returned.
         """
-        with self.data_lock:
-            self.live_data.append(record)
-        
-        # Persist to DB asynchronously or synchronously? 
-        # For simplicity and safety in this scale, synchronous is fine for SQLite (WAL mode is better but keep it simple)
         if record:
-             self._persist_record(record)
+            row = self._row(record, host)
+            if self.writer:
+                if not self.writer.put(row):
+                    return False
+            else:
+                self._persist_rows([row])
+        if host == LOCAL_HOST or not self.mirror_remote:
+            buf = self._buffer(host)
+            with self._lock_for(host):
+                buf.records.append(record)
+                buf.seq += 1
+                buf.last_seen = time.time()
+        RECORDS.inc()
+
+        if record and host == LOCAL_HOST:
+            self.experience.append([record.get(f) or 0 for f in STATE_FIELDS])
+        return True
+
+    def add_records(self, records, host=LOCAL_HOST):
+        """
+        Add a batch of records from one host with a single lock acquisition
+        and a single writer queue operation. Returns the number of records
+        queued for storage (0 if the writer dropped the batch).
 
-    def _persist_record(self, record):
+        The batch is queued for storage before it reaches the live buffer,
+        so a dropped batch leaves no trace and the agent's retry does not
+        show up twice.
+        """
+        records = [r for r in records if r]
+        if not records:
+            return 0
+        rows = [self._row(r, host) for r in records]
+        if self.writer:
+            if not self.writer.put_many(rows):
+                return 0
+        else:
+            self._persist_rows(rows)
+
+        if host == LOCAL_HOST or not self.mirror_remote:
+            self._extend(host, records)
+        RECORDS.inc(len(records))
+        if host == LOCAL_HOST:
+            self.experience.extend([[r.get(f) or 0 for f in STATE_FIELDS] for r in records])
+        return len(rows)
+
+    def _extend(self, host, records):
+        buf = self._buffer(host)
+        with self._lock_for(host):
+            buf.records.extend(records)
+            buf.seq += len(records)
+            buf.last_seen = time.time()
+
+    def sync_from_db(self, include_local=True, max_rows=50000):
+        """
+        Load rows stored by other processes since the previous call into the
+        in-memory buffers, for deployments with several server processes.
+
+        Remote hosts' rows are always loaded; local rows only with
+        include_local (the process running LiveMonitor already has them).
+        The first call starts from the newest row, after loading the last
+        `history_len` local rows. Rows are visible once their writer flushed
+        them. Returns the new local records in order.
+        """
+        columns = ('timestamp',) + QUERY_FIELDS
+        conn = sqlite3.connect(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO system_stats (timestamp, cpu_percent, memory_usage, ready_queue_size, avg_burst_time, avg_priority)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                record.get('timestamp', datetime.utcnow().isoformat()),
-                record.get('cpu_percent', 0.0),
-                record.get('memory_usage', 0.0),
-                record.get('ready_queue_size', 0),
-                record.get('avg_burst_time', 0.0),
-                record.get('avg_priority', 0.0)
-            ))
-            conn.commit()
+            if self._sync_cursor is None:
+                self._sync_cursor = conn.execute('SELECT COALESCE(MAX(id), 0) FROM system_stats').fetchone()[0]
+                rows = []
+                if include_local:
+                    rows = conn.execute(
+                        f"SELECT id, host, {', '.join(columns)} FROM system_stats "
+                        "WHERE host = ? AND id <= ? ORDER BY id DESC LIMIT ?",
+                        (LOCAL_HOST, self._sync_cursor, self.history_len)).fetchall()[::-1]
+            else:
+                rows = conn.execute(
+                    f"SELECT id, host, {', '.join(columns)} FROM system_stats WHERE id > ? ORDER BY id LIMIT ?",
+                    (self._sync_cursor, max_rows)).fetchall()
+                if rows:
+                    self._sync_cursor = rows[-1][0]
+        finally:
             conn.close()
+
+        by_host = collections.defaultdict(list)
+        for row in rows:
+            if row[1] == LOCAL_HOST and not include_local:
+                continue
+            by_host[row[1]].append(dict(zip(columns, row[2:])))
+        for host, records in by_host.items():
+            self._extend(host, records)
+        return by_host.get(LOCAL_HOST, [])
+
+    def _row(self, record, host=LOCAL_HOST):
+        timestamp = record.get('timestamp') or datetime.utcnow().isoformat()
+        ts = record.get('ts')
+        if ts is None:
+            ts = to_epoch_ms(timestamp)
+        return (
+            host,
+            timestamp,
+            ts,
+            # a metric given as None is stored like a missing one
+            record.get('cpu_percent') or 0.0,
+            record.get('memory_usage') or 0.0,
+            record.get('ready_queue_size') or 0,
+            record.get('avg_burst_time') or 0.0,
+            record.get('avg_priority') or 0.0
+        )
+
+    def _persist_rows(self, rows):
+        try:
+            with SYNC_WRITE_SECONDS.time():
+                conn = sqlite3.connect(self.db_path)
+                conn.executemany(INSERT_SQL, rows)
+                self.rollups.apply(conn, rows)
+                conn.commit()
+                conn.close()
         except Exception as e:
             print(f"🔴 DB Write Error: {e}")
 
-    def get_latest(self):
-        with self.data_lock:
-            if self.live_data:
-                return self.live_data[-1]
-            return None
+    def flush(self, timeout=5.0):
+        """Wait until every record added so far has been written."""
+        if self.writer:
+            return self.writer.flush(timeout)
+        return True
+
+    def close(self, timeout=5.0):
+        """Stop the writer after it wrote what it has; False if it did not within `timeout` seconds."""
+        if self.writer:
+            return self.writer.close(timeout)
+        return True
+
+    def writer_stats(self):
+        if not self.writer:
+            return {}
+        stats = dict(self.writer.stats)
+        stats['queued'] = self.writer.qsize()
+        return stats
+
+    def hosts(self):
+        """{host: {'records', 'last_seen'}} for every host that added records, last_seen in epoch seconds."""
+        return {host: {'records': buf.seq, 'last_seen': buf.last_seen}
+                for host, buf in list(self._hosts.items()) if buf.seq}
+
+    def get_latest(self, host=LOCAL_HOST):
+        return self.get_latest_with_seq(host)[1]
+
+    def get_latest_with_seq(self, host=LOCAL_HOST):
+        """(seq, latest record); seq changes exactly when a new record arrives."""
+        buf = self._hosts.get(host)
+        if buf is None:
+            return 0, None
+        with self._lock_for(host):
+            return buf.seq, (buf.records[-1] if buf.records else None)
+
+    def get_history(self, host=LOCAL_HOST):
+        buf = self._hosts.get(host)
+        if buf is None:
+            return []
+        with self._lock_for(host):
+            return list(buf.records)
+
+    def query(self, start=None, end=None, fields=None, downsample=None, chunk_size=5000,
+              aggregates=('mean',), host=None):
+        """
+        Stream stored samples with start <= time < end as chunks of NumPy arrays.
+
+        start/end accept epoch seconds, datetimes or ISO strings; None leaves
+        that side open. Each chunk is a dict with 'ts' (int64 epoch ms) plus
+        one float64 array per requested field. Records still queued in the
+        background writer are not visible yet.
+
+        With `downsample` (seconds) rows are grouped into buckets and 'ts' is
+        the bucket start. Only whole buckets are returned: start rounds down
+        and end rounds up to the bucket width. The coarsest rollup tier whose
+        width divides the bucket is read instead of the raw table, with the
+        same result. `aggregates` picks any of
+        mean/min/max/count: means keep the field name, min/max come back as
+        '<field>_min'/'<field>_max' and the sample count as 'count'.
+
+        `host` restricts the rows to one host; by default all hosts are
+        read, and downsampled buckets aggregate across them.
+        """
+        fields = list(fields) if fields else list(QUERY_FIELDS)
+        unknown = [f for f in fields if f not in QUERY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}; expected a subset of {QUERY_FIELDS}")
+        aggregates = [a for a in AGGREGATES if a in aggregates]
+        if not aggregates:
+            raise ValueError(f"aggregates must include at least one of {AGGREGATES}")
+        if downsample is not None and not (downsample > 0 and math.isfinite(downsample)):
+            raise ValueError("downsample must be a positive number of seconds")
+        start_ms = to_epoch_ms(start)
+        end_ms = to_epoch_ms(end)
+        bucket = max(1, int(round(downsample * 1000))) if downsample else None
+        if bucket:
+            # a tier row covers its whole bucket, so the raw path must too
+            if start_ms is not None:
+                start_ms -= start_ms % bucket
+            if end_ms is not None:
+                end_ms += -end_ms % bucket
+        if start_ms is None:
+            start_ms = -2 ** 63
+        if end_ms is None:
+            end_ms = 2 ** 63 - 1
+        params = (start_ms, end_ms)
+        where = 'ts >= ? AND ts < ?'
+        if host is not None:
+            params += (host,)
+            where += ' AND host = ?'
+
+        if not downsample:
+            sql = f"SELECT ts, {', '.join(fields)} FROM system_stats WHERE {where} ORDER BY ts"
+            return self._stream(sql, params, fields, chunk_size)
+
+        names = []
+        for f in fields:
+            names += [f if a == 'mean' else f'{f}_{a}' for a in aggregates if a != 'count']
+        if 'count' in aggregates:
+            names.append('count')
+        tier = self.rollups.tier_for(bucket)
+        if tier:
+            sql = self.rollups.select_sql(tier[0], bucket, fields, aggregates, host is not None)
+        else:
+            sql_aggs = {'mean': 'AVG', 'min': 'MIN', 'max': 'MAX'}
+            columns = [f'{sql_aggs[a]}({f})' for f in fields for a in aggregates if a != 'count']
+            if 'count' in aggregates:
+                columns.append('COUNT(*)')
+            sql = (f"SELECT (ts / {bucket}) * {bucket} AS bucket, {', '.join(columns)} "
+                   f"FROM system_stats WHERE {where} GROUP BY ts / {bucket} ORDER BY bucket")
+        return self._stream(sql, params, names, chunk_size)
+
+    def prune(self, now=None):
+        """Apply retention immediately (the writer also does this periodically)."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return self.rollups.prune(conn, now)
+        finally:
+            conn.close()
+
+    def _stream(self, sql, params, fields, chunk_size):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                data = np.array(rows, dtype=np.float64)
+                chunk = {'ts': data[:, 0].astype(np.int64)}
+                for i, field in enumerate(fields, start=1):
+                    chunk[field] = data[:, i]
+                yield chunk
+        finally:
+            conn.close()
 
-    def get_history(self):
-        with self.data_lock:
-            return list(self.live_data)
+_shared_lock = threading.Lock()
 
-# Shared instance
-shared_data_manager = DataManager()
+def __getattr__(name):
+    # The shared instance opens optios.db and starts the writer thread, so it is
+    # created on first use: importing DataManager alone (tools, benchmarks) stays cheap
+    global shared_data_manager
+    if name == 'shared_data_manager':
+        with _shared_lock:
+            if 'shared_data_manager' not in globals():
+                shared_data_manager = DataManager()
+        return shared_data_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
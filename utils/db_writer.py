@@ -0,0 +1,217 @@
+import queue
+import sqlite3
+import threading
+import time
+from utils.metrics import registry
+
+_STOP = object()
+
+WRITE_SECONDS = registry.histogram('optios_sqlite_write_seconds',
+                                   'Time to commit one batch of rows to SQLite', ['writer'])
+BATCH_ROWS = registry.histogram('optios_sqlite_batch_rows', 'Rows per committed SQLite batch', ['writer'],
+                                buckets=(1, 4, 16, 64, 256, 1024, 4096))
+ROWS = registry.counter('optios_sqlite_rows_total', 'Rows handled by the write-behind writer',
+                        ['writer', 'outcome'])
+QUEUE_DEPTH = registry.gauge('optios_sqlite_queue_depth', 'Rows waiting for the writer thread', ['writer'])
+
+class BatchedWriter:
+    """
+    Write-behind pipeline for SQLite.
+
+    Producers enqueue parameter tuples into a bounded queue; a dedicated
+    thread drains it over one persistent WAL-mode connection and commits
+    with executemany every `flush_size` rows or `flush_interval` seconds,
+    whichever comes first. When the queue is full, put() blocks for up to
+    `put_timeout` seconds (backpressure) and then drops the row. put_many()
+    enqueues a list of rows as a single queue item.
+
+    A batch that fails to commit is retried one row at a time, so only the
+    rows that fail again are lost; stats['errors'] counts those rows.
+
+    on_batch(conn, rows) runs inside each batch's transaction, and
+    maintenance(conn) runs on the writer thread every `maintenance_interval`
+    seconds, so derived tables and pruning share the single connection.
+    """
+    def __init__(self, db_path, sql, flush_size=256, flush_interval=1.0,
+                 max_queue=10000, put_timeout=0.05, name='BatchedWriter',
+                 on_batch=None, maintenance=None, maintenance_interval=60.0):
+        self.db_path = db_path
+        self.sql = sql
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.name = name
+        self.on_batch = on_batch
+        self.maintenance = maintenance
+        self.maintenance_interval = maintenance_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self.stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+        self.thread = None
+        self._write_seconds = WRITE_SECONDS.labels(name)
+        self._batch_rows = BATCH_ROWS.labels(name)
+        self._rows = {k: ROWS.labels(name, k) for k in ('written', 'dropped', 'failed')}
+        QUEUE_DEPTH.labels(name).set_function(self._queue.qsize)
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def put(self, row):
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            self._count('dropped')
+            self._rows['dropped'].inc()
+            return False
+        self._count('enqueued')
+        return True
+
+    def put_many(self, rows):
+        """Enqueue a batch of rows in one queue operation; all of them are kept or dropped together."""
+        rows = list(rows)
+        if not rows:
+            return True
+        try:
+            self._queue.put(rows, timeout=self.put_timeout)
+        except queue.Full:
+            self._count('dropped', len(rows))
+            self._rows['dropped'].inc(len(rows))
+            return False
+        self._count('enqueued', len(rows))
+        return True
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def flush(self, timeout=5.0):
+        """
+        Block until every row enqueued before this call is committed. False if
+        that did not happen within `timeout` seconds, including when the
+        queue stayed full for that long.
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return False
+        deadline = time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            print(f"🔴 {self.name} flush timed out: queue full")
+            return False
+        return done.wait(max(0.0, deadline - time.monotonic()))
+
+    def close(self, timeout=5.0):
+        """Flush remaining rows and stop the writer thread; False if it is still running after `timeout` seconds."""
+        if self.thread is None or not self.thread.is_alive():
+            return True
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print(f"🔴 {self.name} close timed out: queue full")
+            return False
+        self.thread.join(max(0.0, deadline - time.monotonic()))
+        return not self.thread.is_alive()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL + NORMAL only syncs at checkpoints, not on every commit
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _commit(self, conn, rows):
+        with conn:
+            conn.executemany(self.sql, rows)
+            if self.on_batch:
+                self.on_batch(conn, rows)
+
+    def _write(self, conn, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            self._commit(conn, batch)
+            written = len(batch)
+            self._write_seconds.observe(time.perf_counter() - started)
+        except Exception as e:
+            # A batch mixes every producer's rows: retry them one by one so a
+            # single bad row only loses itself
+            print(f"🔴 {self.name} batch write error: {e}; retrying {len(batch)} rows one by one")
+            written = 0
+            for row in batch:
+                try:
+                    self._commit(conn, [row])
+                    written += 1
+                except Exception as row_error:
+                    self._count('errors')
+                    self._rows['failed'].inc()
+                    print(f"🔴 {self.name} write error: {row_error}")
+        if written:
+            self._batch_rows.observe(written)
+            self._rows['written'].inc(written)
+            with self._stats_lock:
+                self.stats['written'] += written
+                self.stats['batches'] += 1
+        batch.clear()
+
+    def _maintain(self, conn):
+        try:
+            self.maintenance(conn)
+        except Exception as e:
+            self._count('errors')
+            print(f"🔴 {self.name} maintenance error: {e}")
+
+    def _run(self):
+        conn = self._connect()
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        next_maintenance = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    # drain whatever producers managed to enqueue before shutdown
+                    while True:
+                        try:
+                            rest = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if isinstance(rest, threading.Event):
+                            self._write(conn, batch)
+                            rest.set()
+                        elif isinstance(rest, list):
+                            batch.extend(rest)
+                        elif rest is not _STOP:
+                            batch.append(rest)
+                    self._write(conn, batch)
+                    break
+                if isinstance(item, threading.Event):
+                    self._write(conn, batch)
+                    item.set()
+                elif item is not None:
+                    if isinstance(item, list):
+                        batch.extend(item)
+                    else:
+                        batch.append(item)
+                    if len(batch) >= self.flush_size:
+                        self._write(conn, batch)
+
+                if time.monotonic() >= deadline:
+                    self._write(conn, batch)
+                    deadline = time.monotonic() + self.flush_interval
+                    if self.maintenance and time.monotonic() >= next_maintenance:
+                        self._maintain(conn)
+                        next_maintenance = time.monotonic() + self.maintenance_interval
+        finally:
+            conn.close()
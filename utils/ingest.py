@@ -0,0 +1,108 @@
+"""
+Wire format shared by the /ingest endpoint and RemoteSink.
+
+A batch is one JSON object, optionally gzip-compressed (Content-Encoding:
+gzip):
+
+    {"host": "web-1", "records": [{"timestamp": "...", "cpu_percent": 12.5, ...}, ...]}
+
+Records carry the LiveMonitor fields; anything else is ignored. A record
+without a timestamp or ts (epoch ms) is stamped when it is stored.
+"""
+import gzip
+import json
+import math
+import zlib
+from datetime import datetime
+
+from utils.rollups import LOCAL_HOST, METRICS
+
+# Limits per request, after decompression
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_RECORDS = 10000
+MAX_HOST_LENGTH = 255
+# Accepted ts range in epoch milliseconds: 1970 up to the last ISO year (9999)
+MAX_TS_MS = 253402300800000
+
+class IngestError(ValueError):
+    """A batch that cannot be accepted; status is the HTTP status to answer with."""
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def encode_batch(host, records, compress=True):
+    """Request body and headers for a batch of records from `host`."""
+    body = json.dumps({'host': host, 'records': records}, separators=(',', ':')).encode()
+    headers = {'Content-Type': 'application/json'}
+    if compress:
+        body = gzip.compress(body, compresslevel=5)
+        headers['Content-Encoding'] = 'gzip'
+    return body, headers
+
+def _inflate(body, limit):
+    # Bounded decompression, so a small compressed body cannot expand without limit
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = inflater.decompress(body, limit + 1)
+    except zlib.error as e:
+        raise IngestError(f"Invalid gzip body: {e}")
+    if len(data) > limit or inflater.unconsumed_tail:
+        raise IngestError(f"Batch exceeds {limit} bytes uncompressed", 413)
+    return data
+
+def decode_batch(body, content_encoding=None, max_bytes=MAX_BODY_BYTES, max_records=MAX_RECORDS):
+    """(host, records) from a request body; raises IngestError on anything malformed."""
+    encoding = (content_encoding or '').strip().lower()
+    if encoding == 'gzip':
+        body = _inflate(body, max_bytes)
+    elif encoding not in ('', 'identity'):
+        raise IngestError(f"Unsupported Content-Encoding {content_encoding!r}", 415)
+    elif len(body) > max_bytes:
+        raise IngestError(f"Batch exceeds {max_bytes} bytes", 413)
+
+    try:
+        batch = json.loads(body)
+    except ValueError as e:
+        raise IngestError(f"Invalid JSON: {e}")
+    if not isinstance(batch, dict):
+        raise IngestError("Expected a JSON object with 'host' and 'records'")
+    host = batch.get('host')
+    if not isinstance(host, str) or not host.strip() or len(host) > MAX_HOST_LENGTH:
+        raise IngestError(f"'host' must be a non-empty string of at most {MAX_HOST_LENGTH} characters")
+    if host.strip() == LOCAL_HOST:
+        raise IngestError(f"'{LOCAL_HOST}' is reserved for this server's own monitor")
+    records = batch.get('records')
+    if not isinstance(records, list):
+        raise IngestError("'records' must be a list")
+    if len(records) > max_records:
+        raise IngestError(f"At most {max_records} records per batch", 413)
+    return host.strip(), [_clean(r, i) for i, r in enumerate(records)]
+
+def _clean(record, i):
+    if not isinstance(record, dict):
+        raise IngestError(f"Record {i} is not an object")
+    clean = {}
+    for field in METRICS:
+        value = record.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise IngestError(f"Record {i}: {field} must be a finite number")
+        clean[field] = value
+    timestamp = record.get('timestamp')
+    if timestamp is not None:
+        if not isinstance(timestamp, str):
+            raise IngestError(f"Record {i}: timestamp must be an ISO string")
+        try:
+            datetime.fromisoformat(timestamp)
+        except ValueError:
+            raise IngestError(f"Record {i}: timestamp {timestamp[:64]!r} is not an ISO 8601 time")
+        clean['timestamp'] = timestamp
+    ts = record.get('ts')
+    if ts is not None:
+        # SQLite stores ts as a 64-bit integer; a value it cannot hold would fail the whole writer batch
+        if (isinstance(ts, bool) or not isinstance(ts, (int, float)) or not math.isfinite(ts)
+                or not 0 <= ts < MAX_TS_MS):
+            raise IngestError(f"Record {i}: ts must be epoch milliseconds between 0 and {MAX_TS_MS}")
+        clean['ts'] = int(ts)
+    return clean
@@ -1,43 +1,84 @@
 import threading
-import psutil
-import random
 import time
 from datetime import datetime
-from utils.data_manager import shared_data_manager
+from utils.broadcaster import shared_broadcaster
+from utils.metrics import registry
+
+TICK_JITTER = registry.histogram('optios_monitor_tick_jitter_seconds',
+                                 'How late each LiveMonitor record was collected relative to its schedule')
+COLLECT_SECONDS = registry.histogram('optios_monitor_collect_seconds', 'Time to collect and store one record')
+ERRORS = registry.counter('optios_monitor_errors_total', 'Exceptions raised in the LiveMonitor loop')
 
 class LiveMonitor:
-    def __init__(self, interval=5):
+    """
+    Collects a DataManager record every `interval` seconds and, in between,
+    pushes the shared /live snapshot to streaming dashboards every
+    `publish_interval` seconds (only while someone is subscribed).
+
+    `sink` is where records go, the shared DataManager by default. Agent
+    mode passes a RemoteSink to ship them to a central server instead.
+    `sampler` is the shared SystemSampler by default.
+    """
+    def __init__(self, interval=5, publish_interval=1.0, broadcaster=shared_broadcaster, sink=None, sampler=None):
+        if sink is None:
+            from utils.data_manager import shared_data_manager
+            sink = shared_data_manager
+        if sampler is None:
+            from utils.sampler import shared_sampler
+            sampler = shared_sampler
+        self.sink = sink
+        self.sampler = sampler
         self.interval = interval
+        self.publish_interval = publish_interval
+        self.broadcaster = broadcaster
         self.running = False
         self.thread = None
 
+    def _collect_record(self):
+        # Walking the processes happens here, off the request path; CPU usage is
+        # the delta since the sampler's previous refresh
+        self.sampler.capture()
+        snapshot = self.sampler.snapshot(max_age=0)
+        cpu_percent = snapshot['cpu']
+        num_procs = snapshot['processes']
+        memory = snapshot['memory']
+
+        record = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'ready_queue_size': int(num_procs),
+            'avg_burst_time': float(snapshot['avg_burst_time']),
+            'avg_priority': float(snapshot['avg_priority']),
+            'memory_usage': float(memory),
+            'cpu_percent': float(cpu_percent)
+        }
+
+        # Push to DataManager (or the remote sink in agent mode)
+        if not self.sink.add_record(record):
+            print("[LiveMonitor] record dropped: storage queue full")
+            return
+        self.broadcaster.publish('monitor', record)
+
+        print(f"[LiveMonitor] Data collected: CPU={cpu_percent}% Mem={memory}%")
+
     def _collect_data(self):
+        # prime the per-PID CPU times so the first record has deltas
+        self.sampler.capture()
+        next_record = time.monotonic()
         while self.running:
             try:
-                cpu_percent = psutil.cpu_percent(interval=1) # This blocks for 1s
-                num_procs = len(psutil.pids())
-                memory = psutil.virtual_memory().percent
-
-                record = {
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'ready_queue_size': int(num_procs),
-                    'avg_burst_time': float(random.uniform(5, 50) * (cpu_percent / 100)),
-                    'avg_priority': float(random.uniform(1, 10)),
-                    'memory_usage': float(memory),
-                    'cpu_percent': float(cpu_percent)
-                }
-
-                # Push to DataManager
-                shared_data_manager.add_record(record)
-                
-                print(f"[LiveMonitor] Data collected: CPU={cpu_percent}% Mem={memory}%")
-
+                now = time.monotonic()
+                if now >= next_record:
+                    TICK_JITTER.observe(now - next_record)
+                    with COLLECT_SECONDS.time():
+                        self._collect_record()
+                    next_record += self.interval
+                if self.broadcaster.has_subscribers('live'):
+                    self.broadcaster.publish('live', self.sampler.snapshot(max_age=self.publish_interval / 2))
             except Exception as e:
+                ERRORS.inc()
                 print("[LiveMonitor] error:", e)
-            
-            # Since cpu_percent(interval=1) already waits 1s, we adjust sleep
-            sleep_time = max(0, self.interval - 1)
-            time.sleep(sleep_time)
+
+            time.sleep(max(0, min(self.publish_interval, next_record - time.monotonic())))
 
     def start(self):
         if not self.running:
@@ -1,20 +1,300 @@
+import atexit
 import csv
-from datetime import datetime
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+from models.engine import ALGORITHMS
 
-def log_rl_prediction(state, rl_choice, log_file='rl_predictions.csv'):
+CSV_COLUMNS = ['timestamp','ready_queue_size','avg_burst_time','avg_priority','memory_usage','rl_choice','workload']
+
+# Column order of a logged workload row, matching OSSimulator.workload()
+WORKLOAD_FIELDS = ('burst_time', 'arrival_time', 'priority', 'memory')
+
+DEFAULT_LOG_FILE = os.environ.get('OPTIOS_PREDICTION_LOG', 'rl_predictions.csv')
+
+# Set by follower server processes (utils/services.py): each writes its own
+# '<name>-<suffix><ext>' log, so only the leader appends to and rotates the
+# shared file
+process_suffix = None
+
+# A comparison logs at most one workload per algorithm it can be configured with
+MAX_WORKLOADS = len(ALGORITHMS)
+
+def record_dtype(max_workloads=MAX_WORKLOADS, max_processes=10):
+    """Fixed-width record of the binary (.npy) prediction log."""
+    return np.dtype([
+        ('timestamp', '<f8'),                 # epoch seconds
+        ('state', '<f8', (4,)),               # rq, avg burst, avg priority, memory
+        ('rl_choice', 'S8'),
+        ('n_processes', '<i4', (max_workloads,)),
+        ('workload', '<f8', (max_workloads, max_processes, len(WORKLOAD_FIELDS))),
+    ])
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+def _npy_header(dtype, count):
+    # The header is padded for a 20-digit record count, so the running count
+    # can be rewritten in place without moving the data that follows it
+    def text(n):
+        return "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+            np.lib.format.dtype_to_descr(dtype), n)
+    size = len(_NPY_MAGIC) + 2 + len(text(10 ** 19)) + 1
+    size += -size % 64
+    header = text(count).ljust(size - len(_NPY_MAGIC) - 2 - 1) + '\n'
+    return _NPY_MAGIC + struct.pack('<H', len(header)) + header.encode('latin1')
+
+_STOP = object()
+
+class PredictionLogger:
+    """
+    Buffered, rotating log of RL decisions and the workloads they were scored on.
+
+    log() only enqueues; a background thread writes batches every
+    `flush_interval` seconds, so request latency does not depend on disk I/O.
+    The active file is rotated to '<name>-<UTC time><ext>' once it reaches
+    `max_bytes` or is older than `rotate_interval` seconds.
+
+    The format follows the file extension. '.csv' keeps the original columns
+    plus a JSON 'workload' column. '.npy' appends fixed-width records of
+    record_dtype() to a standard .npy file whose header tracks the record
+    count, so np.load(path, mmap_mode='r') maps every file, including the
+    active one. A record has room for one workload per algorithm in
+    engine.ALGORITHMS, so a comparison of every configured action replays
+    exactly; an existing file with another record layout is rotated away.
+    """
+    def __init__(self, path=DEFAULT_LOG_FILE, max_bytes=64 * 1024 * 1024, rotate_interval=None,
+                 flush_interval=1.0, max_queue=10000, max_workloads=MAX_WORKLOADS, max_processes=10):
+        self.path = path
+        self.format = 'npy' if path.endswith('.npy') else 'csv'
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.flush_interval = flush_interval
+        self.max_workloads = max_workloads
+        self.max_processes = max_processes
+        self.dtype = record_dtype(max_workloads, max_processes)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._opened_at = 0.0
+        self._count = 0
+        self._stats_lock = threading.Lock()
+        self.stats = {'logged': 0, 'written': 0, 'dropped': 0, 'truncated': 0, 'rotations': 0, 'errors': 0}
+        self.thread = threading.Thread(target=self._run, name='PredictionLogger', daemon=True)
+        self.thread.start()
+
+    def log(self, state, rl_choice, workloads=None, timestamp=None):
+        item = (timestamp if timestamp is not None else time.time(), list(state), rl_choice,
+                [np.asarray(w, dtype=np.float64) for w in workloads or ()])
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._stats_lock:
+                self.stats['dropped'] += 1
+            return False
+        with self._stats_lock:
+            self.stats['logged'] += 1
+        return True
+
+    def flush(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            print("🔴 PredictionLogger flush timed out: queue full")
+            return False
+        return done.wait(max(0.0, deadline - time.monotonic()))
+
+    def close(self, timeout=5.0):
+        if not self.thread.is_alive():
+            return True
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("🔴 PredictionLogger close timed out: queue full")
+            return False
+        self.thread.join(max(0.0, deadline - time.monotonic()))
+        return not self.thread.is_alive()
+
+    # --- writer thread ---
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _STOP or isinstance(item, threading.Event):
+                self._write(batch)
+                if item is _STOP:
+                    break
+                item.set()
+            elif item is not None:
+                batch.append(item)
+            if time.monotonic() >= deadline:
+                self._write(batch)
+                deadline = time.monotonic() + self.flush_interval
+        if self._file:
+            self._file.close()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            if self._file is None:
+                self._open()
+            elif self._should_rotate():
+                self._rotate()
+            if self.format == 'npy':
+                self._write_npy(batch)
+            else:
+                self._write_csv(batch)
+            self._file.flush()
+            self.stats['written'] += len(batch)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"🔴 PredictionLogger write error: {e}")
+        batch.clear()
+
+    def _should_rotate(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return bool(self.rotate_interval) and time.time() - self._opened_at >= self.rotate_interval
+
+    def _rotate(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            stem, ext = os.path.splitext(self.path)
+            stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+            target = f"{stem}-{stamp}{ext}"
+            n = 1
+            while os.path.exists(target):
+                target = f"{stem}-{stamp}.{n}{ext}"
+                n += 1
+            os.replace(self.path, target)
+            self.stats['rotations'] += 1
+        self._open()
+
+    def _open(self):
+        self._opened_at = time.time()
+        if self.format == 'npy':
+            self._open_npy()
+        else:
+            self._open_csv()
+
+    def _open_csv(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, newline='') as f:
+                header = next(csv.reader(f), None)
+            if header != CSV_COLUMNS:
+                # e.g. a log from before workloads were recorded: start a fresh file
+                return self._rotate()
+        self._file = open(self.path, 'a', newline='')
+        self._csv = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._csv.writerow(CSV_COLUMNS)
+
+    def _open_npy(self):
+        header = _npy_header(self.dtype, 0)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            f = open(self.path, 'r+b')
+            try:
+                usable = np.lib.format.read_magic(f) == (1, 0)
+                if usable:
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+                    usable = dtype == self.dtype and f.tell() == len(header)
+            except Exception:
+                usable = False
+            if not usable:
+                f.close()
+                return self._rotate()
+            # drop a partially written tail left by a crash
+            self._count = shape[0]
+            f.truncate(len(header) + self._count * self.dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            self._file = f
+        else:
+            self._file = open(self.path, 'w+b')
+            self._file.write(header)
+            self._count = 0
+
+    def _workload_rows(self, workloads):
+        if len(workloads) > self.max_workloads:
+            self.stats['truncated'] += 1
+        for w in workloads[:self.max_workloads]:
+            if len(w) > self.max_processes:
+                self.stats['truncated'] += 1
+            yield w[:self.max_processes]
+
+    def _write_csv(self, batch):
+        for ts, state, choice, workloads in batch:
+            self._csv.writerow([
+                datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat(),
+                state[0],
+                state[1],
+                state[2],
+                state[3],
+                choice,
+                json.dumps([w.tolist() for w in workloads])
+            ])
+
+    def _write_npy(self, batch):
+        records = np.zeros(len(batch), dtype=self.dtype)
+        for i, (ts, state, choice, workloads) in enumerate(batch):
+            rec = records[i]
+            rec['timestamp'] = ts
+            rec['state'] = state[:4]
+            rec['rl_choice'] = str(choice).encode()[:8]
+            for j, w in enumerate(self._workload_rows(workloads)):
+                rec['n_processes'][j] = len(w)
+                rec['workload'][j, :len(w)] = w
+        self._file.write(records.tobytes())
+        self._count += len(records)
+        end = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self._count))
+        self._file.seek(end)
+
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+def _reset_after_fork():
+    # the parent's logger threads are gone in the child, and its lock may be held
+    global _loggers_lock
+    _loggers.clear()
+    _loggers_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def process_log_path(log_file=DEFAULT_LOG_FILE):
+    """The file this process logs to: log_file, or its per-process variant in a follower."""
+    if process_suffix is None:
+        return log_file
+    stem, ext = os.path.splitext(log_file)
+    return f"{stem}-{process_suffix}{ext}"
+
+def get_prediction_logger(log_file=DEFAULT_LOG_FILE):
+    log_file = process_log_path(log_file)
+    with _loggers_lock:
+        logger = _loggers.get(log_file)
+        if logger is None:
+            logger = _loggers[log_file] = PredictionLogger(log_file)
+            atexit.register(logger.close)
+        return logger
+
+def log_rl_prediction(state, rl_choice, log_file=DEFAULT_LOG_FILE, workloads=None):
     """
-    Logs the current system state and RL agent's chosen action.
+    Logs the current system state, RL agent's chosen action and the
+    simulated workloads (rows of WORKLOAD_FIELDS) without blocking on disk.
     """
-    with open(log_file, 'a', newline='') as f:
-        writer = csv.writer(f)
-        # Write header if file is empty
-        if f.tell() == 0:
-            writer.writerow(['timestamp','ready_queue_size','avg_burst_time','avg_priority','memory_usage','rl_choice'])
-        writer.writerow([
-            datetime.utcnow().isoformat(),
-            state[0],
-            state[1],
-            state[2],
-            state[3],
-            rl_choice
-        ])
+    get_prediction_logger(log_file).log(state, rl_choice, workloads)
@@ -0,0 +1,269 @@
+import bisect
+import math
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond hot paths to slow requests
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+class _CounterChild:
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+class _GaugeChild:
+    __slots__ = ('_lock', 'value', 'function')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value):
+        # under the lock too, so a set() never lands inside an inc()'s read-modify-write
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def set_function(self, fn):
+        """Evaluate fn() at scrape time instead of storing a value."""
+        self.function = fn
+
+    def get(self):
+        return self.function() if self.function else self.value
+
+class _HistogramChild:
+    __slots__ = ('_lock', '_upper', 'counts', 'sum', 'count')
+
+    def __init__(self, upper):
+        self._lock = threading.Lock()
+        self._upper = upper
+        self.counts = [0] * (len(upper) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect.bisect_left(self._upper, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+class _Timer:
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+class _Metric:
+    """
+    A named metric with optional labels.
+
+    Without labels the metric's own inc/set/observe methods update its single
+    child. With labels, labels(...) returns the child for one combination of
+    values; hot paths should look a child up once and keep it.
+    """
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, labels, value in self._samples():
+            lines.append(f'{self.name}{suffix}{labels} {_format_value(value)}')
+        return '\n'.join(lines)
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def _samples(self):
+        for key, child in sorted(self._children.items()):
+            yield '', _label_text(self.labelnames, key), child.value
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def set_function(self, fn):
+        self._default.set_function(fn)
+
+    def _samples(self):
+        for key, child in sorted(self._children.items()):
+            try:
+                value = child.get()
+            except Exception:
+                value = math.nan
+            yield '', _label_text(self.labelnames, key), value
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def _samples(self):
+        for key, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            running = 0
+            for upper, n in zip(self.upper_bounds + (math.inf,), counts):
+                running += n
+                yield '_bucket', _label_text(self.labelnames, key, [('le', _format_value(upper))]), running
+            yield '_sum', _label_text(self.labelnames, key), total
+            yield '_count', _label_text(self.labelnames, key), count
+
+class Registry:
+    """
+    Process-wide collection of metrics, rendered in the Prometheus text
+    exposition format. counter()/gauge()/histogram() return the existing
+    metric when the name is already registered, so modules can declare the
+    metrics they use at import time without coordinating.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Shared registry behind /metrics
+registry = Registry()
+
+HTTP_SECONDS = registry.histogram('optios_http_request_duration_seconds',
+                                  'Time spent in a view until its response is returned', ['endpoint'])
+HTTP_REQUESTS = registry.counter('optios_http_requests_total', 'HTTP requests handled', ['endpoint', 'status'])
+
+def instrument_blueprint(bp):
+    """
+    Time every request routed to a blueprint's views. Streaming responses
+    (/stream, /history) are timed until the generator is handed to the
+    server, not until the client has read it.
+    """
+    from flask import g, request
+
+    @bp.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @bp.after_request
+    def _record(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'unknown'
+            HTTP_SECONDS.labels(endpoint).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(endpoint, response.status_code).inc()
+        return response
+
+    return bp
@@ -0,0 +1,80 @@
+from models.simulator import OSSimulator
+from utils.logger import log_rl_prediction
+from utils.cache import ResultCache
+
+# The comparison runs on one core: the 10-process workloads leave several cores
+# idle (every algorithm waits 0), and tools/evaluate_rl.py replays the logged
+# workloads on one core as well
+COMPARISON_CORES = 1
+# Largest captured processes replayed in the comparison, the size of a random workload
+COMPARISON_PROCESSES = 10
+
+# Decisions only change when a new sample arrives or the Q-table moves, so
+# repeated polls in between are served from here
+prediction_cache = ResultCache(maxsize=64, ttl=5.0)
+
+def _state_from_sample(sample):
+    if sample:
+        return [
+            int(sample.get('ready_queue_size',0)),
+            float(sample.get('avg_burst_time',0)),
+            float(sample.get('avg_priority',0)),
+            float(sample.get('memory_usage',0))
+        ]
+    return [0,0,0,0]
+
+def predict_latest():
+    """
+    RL decision for the latest DataManager sample plus a simulated comparison
+    of the algorithms the agent chooses between. Shared by /predict_live and the pushed 'predict' stream.
+    Cached per (sample seq, Q-table version); the result must not be mutated.
+    """
+    from utils.data_manager import shared_data_manager
+    from utils.rl_agent import shared_rl_agent
+
+    seq, sample = shared_data_manager.get_latest_with_seq()
+    key = (seq, shared_rl_agent.version)
+    return prediction_cache.get_or_compute(key, lambda: _predict(sample))
+
+def _predict(sample):
+    from utils.rl_agent import shared_rl_agent
+    from utils.sampler import shared_sampler
+
+    state = _state_from_sample(sample)
+
+    rl_choice = shared_rl_agent.best_algorithm_for_state(state)
+
+    # Simulate algorithms for comparison; a private simulator keeps concurrent
+    # computations for different keys from overwriting each other's workload
+    simulator = OSSimulator(cores=COMPARISON_CORES)
+    workloads = []
+    results = []
+    captured = shared_sampler.workload
+    if captured is not None and len(captured):
+        # every algorithm runs on the processes captured with the latest sample
+        captured.top(COMPARISON_PROCESSES).load_into(simulator)
+        workloads.append(simulator.workload())
+        results = [simulator.run(algorithm) for algorithm in shared_rl_agent.actions]
+    else:
+        # nothing captured in this worker (a follower, or an idle first tick)
+        for algorithm in shared_rl_agent.actions:
+            simulator.randomize_processes()
+            workloads.append(simulator.workload())
+            results.append(simulator.run(algorithm))
+
+    # Log RL prediction with the exact workloads so the comparison can be replayed
+    log_rl_prediction(state, rl_choice, workloads=workloads)
+
+    return {
+        "rl_choice": rl_choice,
+        "state": {
+            "ready_queue_size": int(state[0]),
+            "avg_burst_time": float(state[1]),
+            "avg_priority": float(state[2]),
+            "memory_usage": float(state[3])
+        },
+        "comparisons": [
+            {"Algorithm": r['Algorithm'], "Average Waiting Time": r['Average Waiting Time'], "Average Turnaround Time": r['Average Turnaround Time']}
+            for r in results
+        ]
+    }
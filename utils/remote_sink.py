@@ -0,0 +1,130 @@
+import collections
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+from utils.ingest import encode_batch
+from utils.metrics import registry
+
+SENT = registry.counter('optios_remote_sink_records_total', 'Records handled by the agent sink', ['outcome'])
+POST_SECONDS = registry.histogram('optios_remote_sink_post_seconds', 'Time to POST one batch to /ingest')
+
+class RemoteSink:
+    """
+    Agent-side replacement for the DataManager: LiveMonitor(sink=RemoteSink(url))
+    ships records to a central OptiOS /ingest endpoint instead of storing them.
+
+    add_record() only appends to a bounded buffer (the oldest records are
+    dropped once `max_buffer` are waiting). A background thread POSTs
+    gzip-compressed batches of up to `batch_size` records every
+    `flush_interval` seconds, or as soon as a full batch is waiting. A
+    failed batch stays buffered and is retried with exponential backoff up
+    to `max_backoff` seconds.
+    """
+    def __init__(self, url, host=None, batch_size=500, flush_interval=10.0, max_buffer=50000,
+                 timeout=10.0, max_backoff=60.0, token=None, compress=True):
+        self.url = url
+        self.host = host or socket.gethostname()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.token = token
+        self.compress = compress
+        self._buffer = collections.deque(maxlen=max_buffer)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self.stats = {'sent': 0, 'dropped': 0, 'rejected': 0, 'batches': 0, 'errors': 0, 'last_error': None}
+        self.thread = threading.Thread(target=self._run, name='RemoteSink', daemon=True)
+        self.thread.start()
+
+    def add_record(self, record, host=None):
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.stats['dropped'] += 1
+                SENT.labels('dropped').inc()
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+        # the newest record is always kept; the oldest makes room
+        return True
+
+    def pending(self):
+        with self._cond:
+            return len(self._buffer)
+
+    def _post(self, records):
+        body, headers = encode_batch(self.host, records, self.compress)
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        req = urllib.request.Request(self.url, data=body, headers=headers, method='POST')
+        with POST_SECONDS.time():
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                resp.read()
+
+    def _send(self):
+        """POST everything buffered, a batch at a time; False if a batch failed."""
+        while True:
+            with self._cond:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            if not batch:
+                return True
+            try:
+                self._post(batch)
+            except urllib.error.HTTPError as e:
+                if 400 <= e.code < 500 and e.code not in (408, 429):
+                    # the server will never take this batch; drop it instead of retrying forever
+                    self.stats['rejected'] += len(batch)
+                    SENT.labels('rejected').inc(len(batch))
+                else:
+                    self._requeue(batch)
+                self._failed(e)
+                return False
+            except (urllib.error.URLError, OSError) as e:
+                self._requeue(batch)
+                self._failed(e)
+                return False
+            self.stats['sent'] += len(batch)
+            self.stats['batches'] += 1
+            SENT.labels('sent').inc(len(batch))
+
+    def _requeue(self, batch):
+        # put a failed batch back in front; if new records filled the buffer meanwhile,
+        # the oldest records of the batch are the ones dropped
+        with self._cond:
+            room = self._buffer.maxlen - len(self._buffer)
+            if room < len(batch):
+                dropped = len(batch) - room
+                self.stats['dropped'] += dropped
+                SENT.labels('dropped').inc(dropped)
+                batch = batch[dropped:]
+            self._buffer.extendleft(reversed(batch))
+
+    def _failed(self, error):
+        self.stats['errors'] += 1
+        self.stats['last_error'] = str(error)
+        print(f"🔴 RemoteSink: POST {self.url} failed: {error}")
+
+    def _run(self):
+        backoff = 0.0
+        while True:
+            with self._cond:
+                if backoff:
+                    # after a failure, wait out the backoff even if a full batch is waiting
+                    self._cond.wait_for(lambda: self._stopping, timeout=backoff)
+                else:
+                    self._cond.wait_for(lambda: self._stopping or len(self._buffer) >= self.batch_size,
+                                        timeout=self.flush_interval)
+                stopping = self._stopping
+            ok = self._send()
+            if stopping:
+                return
+            backoff = 0.0 if ok else min(self.max_backoff, max(1.0, backoff * 2))
+
+    def close(self, timeout=10.0):
+        """Send what is still buffered (one attempt) and stop the sender thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.thread.join(timeout)
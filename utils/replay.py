@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+
+class ExperienceBuffer:
+    """
+    Fixed-size ring buffer of state vectors with a global sequence number.
+
+    Every appended state gets the next sequence number; consecutive states
+    form the transitions the trainer learns from. Consumers keep their own
+    cursor and read_since() returns only states they have not seen yet, so
+    nothing is copied or learned twice. When a consumer falls more than
+    `capacity` states behind, the overwritten states are reported as dropped.
+    """
+    def __init__(self, capacity=65536, n_features=4):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, n_features))
+        # Sequence number of the next state to be written
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.seq, self.capacity)
+
+    def append(self, state):
+        with self._lock:
+            self.states[self.seq % self.capacity] = state
+            self.seq += 1
+
+    def extend(self, states):
+        states = np.asarray(states, dtype=np.float64).reshape(-1, self.states.shape[1])
+        states = states[-self.capacity:]
+        with self._lock:
+            idx = (self.seq + np.arange(len(states))) % self.capacity
+            self.states[idx] = states
+            self.seq += len(states)
+
+    def read_since(self, cursor, max_items=None):
+        """
+        States with sequence numbers >= cursor, oldest first.
+
+        Returns (next_cursor, states, dropped) where dropped counts states
+        that were overwritten before this consumer read them.
+        """
+        with self._lock:
+            end = self.seq
+            start = max(cursor, end - self.capacity)
+            if max_items is not None:
+                end = min(end, start + max_items)
+            idx = np.arange(start, end) % self.capacity
+            states = self.states[idx]
+        return end, states, max(0, start - cursor)
+
+    def sample(self, n, rng=None):
+        """n random (state, next_state) transitions from the states still held."""
+        rng = rng or np.random.default_rng()
+        with self._lock:
+            held = len(self)
+            if held < 2:
+                return np.zeros((0, self.states.shape[1])), np.zeros((0, self.states.shape[1]))
+            first = self.seq - held
+            picks = first + rng.integers(0, held - 1, n)
+            return self.states[picks % self.capacity], self.states[(picks + 1) % self.capacity]
@@ -1,118 +1,517 @@
-import numpy as np
+import atexit
+import os
 import random
+import tempfile
 import threading
 import time
-import pandas as pd
 
-# Actions -> scheduling algorithms
-ACTION_MAP = {0: 'FCFS', 1: 'SJF', 2: 'RR'}
+import numpy as np
+from models.engine import parse_algorithms
+from utils.broadcaster import shared_broadcaster
+from utils.metrics import registry
+from utils.rollups import LOCAL_HOST
+from utils.state_encoder import STATE_FIELDS, BinnedStateEncoder
+
+DEFAULT_ACTIONS = ('FCFS', 'SJF', 'RR')
+
+# Actions -> scheduling algorithms; OPTIOS_ACTIONS chooses the algorithms the agent picks from
+ACTION_MAP = dict(enumerate(parse_algorithms(os.environ.get('OPTIOS_ACTIONS') or DEFAULT_ACTIONS)))
+
+# Where the trainer checkpoints the Q-table and where startup warm-starts from
+DEFAULT_CHECKPOINT = os.environ.get('OPTIOS_CHECKPOINT', 'rl_checkpoint.npz')
+EPSILON_MIN = 0.02
+EPSILON_DECAY = 0.999
+# Transitions per vectorized Q-learning step
+MINI_BATCH = 256
+# Bins per feature when pre-training learns a quantile encoder from stored data
+QUANTILE_BINS = 8
+
+class SparseQTable:
+    """
+    Q-values for visited states only.
+
+    `index` maps a state id to a row of `values`, which grows by doubling,
+    so memory follows the number of distinct states seen rather than the
+    size of the encoder's state space. Unvisited states read as all zeros.
+    """
+    def __init__(self, n_actions, capacity=64):
+        self.index = {}
+        self.values = np.zeros((capacity, n_actions))
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def row(self, state_id):
+        """Row number for state_id, allocating a zero row on first visit."""
+        row = self.index.get(state_id)
+        if row is None:
+            row = len(self.index)
+            if row == len(self.values):
+                grown = np.zeros((2 * len(self.values), self.values.shape[1]))
+                grown[:row] = self.values
+                self.values = grown
+            self.index[state_id] = row
+        return row
+
+    def rows(self, state_ids, create=False):
+        """Row numbers for an array of state ids; -1 for unvisited ones unless create."""
+        unique, inverse = np.unique(np.asarray(state_ids, dtype=np.int64), return_inverse=True)
+        if create:
+            found = [self.row(s) for s in unique.tolist()]
+        else:
+            found = [self.index.get(s, -1) for s in unique.tolist()]
+        return np.array(found, dtype=np.int64)[inverse]
+
+    def arrays(self):
+        """(sorted state ids, matching Q-value rows), both freshly allocated."""
+        n = len(self.index)
+        ids = np.fromiter(self.index.keys(), dtype=np.int64, count=n)
+        rows = np.fromiter(self.index.values(), dtype=np.int64, count=n)
+        order = np.argsort(ids)
+        return ids[order], self.values[rows[order]]
+
+    @classmethod
+    def from_arrays(cls, ids, values):
+        table = cls(values.shape[1], capacity=max(64, len(ids)))
+        table.values[:len(ids)] = values
+        table.index = {int(s): i for i, s in enumerate(ids)}
+        return table
+
+class QSnapshot:
+    """
+    Immutable, versioned copy of the Q-table that readers use without locking.
+
+    Holds the visited state ids in sorted order with their Q-value rows;
+    lookups are a binary search, vectorized for batches.
+    """
+    __slots__ = ('version', 'ids', 'table')
+
+    def __init__(self, version, ids, table):
+        ids.flags.writeable = False
+        table.flags.writeable = False
+        self.version = version
+        self.ids = ids
+        self.table = table
+
+    def q_values(self, state_ids):
+        """(n, n_actions) Q-values for an array of state ids; unvisited states are zeros."""
+        state_ids = np.asarray(state_ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.zeros((len(state_ids), self.table.shape[1]))
+        pos = np.minimum(np.searchsorted(self.ids, state_ids), len(self.ids) - 1)
+        found = self.ids[pos] == state_ids
+        return np.where(found[:, None], self.table[pos], 0.0)
+
+    def best_action(self, state_id):
+        pos = int(np.searchsorted(self.ids, state_id))
+        if pos < len(self.ids) and self.ids[pos] == state_id:
+            return int(np.argmax(self.table[pos]))
+        return 0
 
 class RLSchedulerAgent:
-    def __init__(self, n_states=200, alpha=0.2, gamma=0.9, epsilon=0.25):
-        self.n_states = n_states
+    """
+    Q-learning agent with copy-on-write Q-table snapshots.
+
+    States are mapped to ids by a pluggable encoder (BinnedStateEncoder by
+    default) and Q-values live in a SparseQTable. The trainer mutates the
+    working `q_table` under `lock` and calls publish() after each batch,
+    which swaps in a new read-only QSnapshot. Inference (choose_action,
+    best_algorithm_for_state and the batch variant) only reads the current
+    snapshot reference, which is atomic, and never takes the lock.
+
+    `actions` are the algorithm names the agent chooses between, one Q-value
+    column each (default: ACTION_MAP).
+    """
+    def __init__(self, encoder=None, alpha=0.2, gamma=0.9, epsilon=0.25, actions=None):
+        self.encoder = encoder or BinnedStateEncoder()
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
-        # Q-table: n_states x n_actions
-        self.q_table = np.zeros((n_states, len(ACTION_MAP)))
+        self.actions = parse_algorithms(actions) if actions is not None else tuple(ACTION_MAP.values())
+        self.n_actions = len(self.actions)
+        # Q-table: visited states x n_actions (working copy, trainer only)
+        self.q_table = SparseQTable(self.n_actions)
+        # Number of updates applied to the working table
+        self.updates = 0
         self.lock = threading.Lock()
+        self._action_names = np.array(self.actions)
+        self._snapshot = QSnapshot(0, *self.q_table.arrays())
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        """Version of the published snapshot; changes whenever readers see new values."""
+        return self._snapshot.version
+
+    def publish(self):
+        with self.lock:
+            return self._publish_locked()
+
+    def _publish_locked(self):
+        if self._snapshot.version != self.updates:
+            self._snapshot = QSnapshot(self.updates, *self.q_table.arrays())
+        return self._snapshot
+
+    def set_encoder(self, encoder):
+        """Switch to a new state encoding; learned values do not carry over."""
+        with self.lock:
+            self.encoder = encoder
+            self.q_table = SparseQTable(self.n_actions)
+            self.updates += 1
+            self._publish_locked()
 
     def _state_index(self, state):
         # state: [ready_queue_size, avg_burst_time, avg_priority, memory_usage]
-        # Normalize components and combine to single index.
-        rq = min(int(state[0]), 100)   # clamp
-        burst = min(int(state[1]), 100)
-        mem = min(int(state[3]), 100)
-        # simple hashing into range
-        idx = (rq * 3 + burst * 5 + mem * 7) % self.n_states
-        return idx
+        return self.encoder.encode_one(state)
+
+    def _state_indices(self, states):
+        # vectorized _state_index over rows of states
+        return self.encoder.encode(states)
 
     def choose_action(self, state):
-        idx = self._state_index(state)
-        with self.lock:
-            if random.random() < self.epsilon:
-                return random.randint(0, len(ACTION_MAP)-1)
-            return int(np.argmax(self.q_table[idx]))
+        if random.random() < self.epsilon:
+            return random.randint(0, self.n_actions - 1)
+        return self._snapshot.best_action(self._state_index(state))
 
     def action_name(self, action_idx):
-        return ACTION_MAP.get(action_idx, 'SJF')
+        return self.actions[action_idx] if 0 <= action_idx < self.n_actions else 'SJF'
 
-    def update(self, state, action, reward, next_state):
+    def _update_locked(self, s, action, reward, ns):
+        table = self.q_table
+        row = table.row(s)
+        next_row = table.index.get(ns)
+        best_next = table.values[next_row].max() if next_row is not None else 0.0
+        old = table.values[row, action]
+        table.values[row, action] = old + self.alpha * (reward + self.gamma * best_next - old)
+
+    def update(self, state, action, reward, next_state, publish=True):
+        """Apply one Q-learning step; batch trainers pass publish=False and call publish() once."""
         s = self._state_index(state)
         ns = self._state_index(next_state)
         with self.lock:
-            old = self.q_table[s, action]
-            best_next = np.max(self.q_table[ns])
-            new = old + self.alpha * (reward + self.gamma * best_next - old)
-            self.q_table[s, action] = new
+            self._update_locked(s, action, reward, ns)
+            self.updates += 1
+            if publish:
+                self._publish_locked()
 
-    def best_algorithm_for_state(self, state):
-        idx = self._state_index(state)
+    def learn_batch(self, states, rewards, next_states, batch_size=MINI_BATCH):
+        """
+        Learn from consecutive transitions in vectorized mini-batches, then publish once.
+
+        `rewards` holds one reward per transition, or an (n, n_actions)
+        array with the reward each action would have earned. Within a mini-batch every target uses the Q-values from before the
+        batch, actions are epsilon-greedy against those values (like
+        choose_action() on the published snapshot), and the TD errors of
+        repeated (state, action) pairs are averaged before the step, so a
+        burst of identical transitions moves a value no further than one.
+        """
+        s = self._state_indices(states)
+        ns = self._state_indices(next_states)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        n = len(s)
+        explore = np.random.random(n) < self.epsilon
+        random_actions = np.random.randint(0, self.n_actions, n)
         with self.lock:
-            action_idx = int(np.argmax(self.q_table[idx]))
+            table = self.q_table
+            for lo in range(0, n, batch_size):
+                hi = min(n, lo + batch_size)
+                rows = table.rows(s[lo:hi], create=True)
+                next_rows = table.rows(ns[lo:hi])
+                q = table.values
+                best_next = np.where(next_rows >= 0, q[next_rows].max(axis=1), 0.0)
+                actions = np.where(explore[lo:hi], random_actions[lo:hi], np.argmax(q[rows], axis=1))
+                reward = rewards[lo:hi]
+                if reward.ndim == 2:
+                    reward = reward[np.arange(hi - lo), actions]
+                td = reward + self.gamma * best_next - q[rows, actions]
+                cells, slot = np.unique(rows * self.n_actions + actions, return_inverse=True)
+                total = np.zeros(len(cells))
+                np.add.at(total, slot, td)
+                q.flat[cells] += self.alpha * total / np.bincount(slot)
+            self.updates += n
+            self._publish_locked()
+        return n
+
+    def decay_epsilon(self, steps=1):
+        with self.lock:
+            self.epsilon = max(EPSILON_MIN, self.epsilon * EPSILON_DECAY ** steps)
+
+    def save_checkpoint(self, path=DEFAULT_CHECKPOINT):
+        """
+        Atomically write the Q-table, encoder, actions, epsilon and step counter to an .npz file.
+
+        The arrays are stored uncompressed and written to a temporary file in
+        the same directory that replaces `path` with os.replace(), so readers
+        and a crash mid-write never see a partial checkpoint.
+        """
+        with self.lock:
+            state_ids, q_values = self.q_table.arrays()
+            encoder = self.encoder
+            epsilon = self.epsilon
+            updates = self.updates
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix='.rl_checkpoint-', suffix='.npz', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, state_ids=state_ids, q_values=q_values, actions=np.array(self.actions),
+                         epsilon=epsilon, updates=updates, alpha=self.alpha, gamma=self.gamma, saved_at=time.time(),
+                         **encoder.to_arrays())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return updates
+
+    def load_checkpoint(self, path=DEFAULT_CHECKPOINT):
+        """
+        Restore a checkpoint written by save_checkpoint(), including its encoder, and publish it.
+
+        The checkpoint must have been trained on the same actions; ones saved
+        before actions were recorded used DEFAULT_ACTIONS.
+        """
+        with np.load(path) as data:
+            if 'state_ids' not in data:
+                raise ValueError(f"Checkpoint {path} uses the old hashed state index; "
+                                 "rebuild it with tools.pretrain_rl")
+            actions = tuple(str(a) for a in data['actions']) if 'actions' in data else DEFAULT_ACTIONS
+            if actions != self.actions:
+                raise ValueError(f"Checkpoint {path} was trained on actions {actions}, "
+                                 f"not {self.actions}")
+            q_values = np.array(data['q_values'], dtype=np.float64).reshape(-1, self.n_actions)
+            table = SparseQTable.from_arrays(data['state_ids'], q_values)
+            encoder = BinnedStateEncoder.from_arrays(data)
+            with self.lock:
+                self.encoder = encoder
+                self.q_table = table
+                self.epsilon = float(data['epsilon'])
+                self.updates = int(data['updates'])
+                self._publish_locked()
+        return self.updates
+
+    def best_algorithm_for_state(self, state):
+        action_idx = self._snapshot.best_action(self._state_index(state))
         return self.action_name(action_idx)
 
-# single shared agent used by routes and trainer
-shared_rl_agent = RLSchedulerAgent()
+    def best_algorithms_for_states(self, states):
+        """Vectorized best_algorithm_for_state for an (n, 4) array of states."""
+        q = self._snapshot.q_values(self._state_indices(states))
+        return self._action_names[np.argmax(q, axis=1)]
+
+_shared_lock = threading.Lock()
+
+def _shared_agent():
+    # single shared agent used by routes and trainer, created on first use
+    global shared_rl_agent
+    if 'shared_rl_agent' not in globals():
+        with _shared_lock:
+            if 'shared_rl_agent' not in globals():
+                shared_rl_agent = RLSchedulerAgent()
+    return shared_rl_agent
+
+def __getattr__(name):
+    if name == 'shared_rl_agent':
+        return _shared_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _publish_prediction():
+    # Push the current decision to streaming dashboards, computed once for all viewers
+    if shared_broadcaster.has_subscribers('predict'):
+        from utils.predictions import predict_latest
+        shared_broadcaster.publish('predict', predict_latest())
+
+def transition_rewards(states, next_states):
+    """Reward for moving from each row of `states` to the same row of `next_states`."""
+    s = np.asarray(states, dtype=np.float64).reshape(-1, 4)
+    n = np.asarray(next_states, dtype=np.float64).reshape(-1, 4)
+    return ((s[:, 0] - n[:, 0]) * 0.5 + (s[:, 1] - n[:, 1]) * 0.2
+            + (s[:, 3] - n[:, 3]) * 0.1 - n[:, 0] * 0.01)
+
+REWARD_MODES = ('delta', 'simulation')
+
+def make_reward_fn(mode='delta', workers=None, actions=None):
+    """
+    Reward function for (states, next_states) batches.
 
-# Continuous trainer: runs in background, reads csv and updates Q-table incrementally
-# Continuous trainer: runs in background, reads data from DataManager and updates Q-table incrementally
-def _continuous_rl_loop(agent, interval, stop_event):
+    'delta' scores the change between consecutive samples and ignores the
+    action. 'simulation' runs each state's synthetic workload through every
+    algorithm in `actions` (default: ACTION_MAP) on a worker pool and
+    rewards an action with the negative average waiting time of its
+    algorithm.
+    """
+    if mode == 'delta':
+        return transition_rewards
+    if mode == 'simulation':
+        from utils.sim_reward import SimulationRewards
+        return SimulationRewards(actions or tuple(ACTION_MAP.values()), workers=workers)
+    raise ValueError(f"Unknown reward mode {mode!r}; expected one of {REWARD_MODES}")
+
+def pretrain_from_db(agent, data_manager=None, start=None, end=None, chunk_size=50000, bins=None,
+                     reward_fn=transition_rewards, host=LOCAL_HOST):
+    """
+    Build the Q-table by replaying stored system_stats rows in time order.
+
+    Rows are streamed from DataManager.query() in chunks; consecutive samples
+    form the transitions the live trainer would have seen, and epsilon decays
+    once per transition, as it does in the live trainer. With `bins`, the agent
+    first switches to a quantile encoder learned from the same rows (this
+    discards its current Q-values). `reward_fn` comes from make_reward_fn().
+    Only the rows of `host` are replayed, so transitions never mix machines.
+    Returns the number of transitions learned.
+    """
+    if data_manager is None:
+        from utils.data_manager import shared_data_manager as data_manager
+    data_manager.flush()
+    if bins:
+        agent.set_encoder(BinnedStateEncoder.from_db(data_manager, bins, start, end, host=host))
+    total = 0
+    previous = None
+    for chunk in data_manager.query(start, end, fields=STATE_FIELDS, chunk_size=chunk_size, host=host):
+        states = np.nan_to_num(np.column_stack([chunk[f] for f in STATE_FIELDS]))
+        if previous is not None:
+            states = np.vstack([previous, states])
+        if len(states) > 1:
+            agent.learn_batch(states[:-1], reward_fn(states[:-1], states[1:]), states[1:])
+            agent.decay_epsilon(len(states) - 1)
+            total += len(states) - 1
+        previous = states[-1:]
+    return total
+
+def warm_start(agent, path=DEFAULT_CHECKPOINT, pretrain=False, reward_mode='delta'):
+    """
+    Load the checkpoint at `path` if there is one, then optionally replay the database.
+
+    Without a usable checkpoint, pre-training also learns quantile bins first.
+    """
+    loaded = False
+    if os.path.exists(path):
+        try:
+            steps = agent.load_checkpoint(path)
+            loaded = True
+            print(f"🧠 Loaded RL checkpoint {path} ({steps} updates, epsilon {agent.epsilon:.3f})")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[RL Trainer] ignoring checkpoint {path}: {e}")
+    if pretrain:
+        start = time.perf_counter()
+        reward_fn = make_reward_fn(reward_mode, actions=agent.actions)
+        try:
+            n = pretrain_from_db(agent, bins=None if loaded else QUANTILE_BINS, reward_fn=reward_fn)
+        except ValueError as e:
+            print(f"[RL Trainer] pre-training skipped: {e}")
+            return
+        finally:
+            if hasattr(reward_fn, 'close'):
+                reward_fn.close()
+        print(f"🧠 Pre-trained on {n} stored transitions in {time.perf_counter() - start:.1f}s")
+        agent.save_checkpoint(path)
+
+# Throughput of the background trainer, reported by /predict_live/trainer
+trainer_stats = {'transitions': 0, 'batches': 0, 'dropped': 0, 'seconds': 0.0, 'cursor': 0}
+
+TRAIN_SECONDS = registry.histogram('optios_rl_train_batch_seconds', 'Time to learn one trainer mini-batch')
+TRANSITIONS = registry.counter('optios_rl_transitions_total', 'Transitions learned by the background trainer')
+DROPPED = registry.counter('optios_rl_dropped_samples_total',
+                           'Samples overwritten in the experience buffer before the trainer read them')
+LAG = registry.gauge('optios_rl_trainer_lag_samples', 'Samples in the experience buffer not yet read by the trainer')
+EPSILON = registry.gauge('optios_rl_epsilon', 'Exploration rate of the shared agent')
+STATES = registry.gauge('optios_rl_visited_states', 'States with a row in the shared Q-table')
+EPSILON.set_function(lambda: _shared_agent().epsilon)
+STATES.set_function(lambda: len(_shared_agent().q_table))
+
+def trainer_throughput():
+    stats = dict(trainer_stats)
+    stats['transitions_per_second'] = round(stats['transitions'] / stats['seconds']) if stats['seconds'] else None
+    return stats
+
+# Continuous trainer: runs in background, consumes new samples from the DataManager's
+# experience buffer and updates the Q-table in mini-batches
+def _continuous_rl_loop(agent, interval, stop_event, checkpoint_path=None, checkpoint_interval=15,
+                        replay_size=0, reward_fn=transition_rewards):
     from utils.data_manager import shared_data_manager
     
-    last_processed_count = 0
+    buffer = shared_data_manager.experience
+    cursor = 0
+    previous = None
+    checkpoint = {'at': time.monotonic(), 'updates': agent.updates}
+    LAG.set_function(lambda: buffer.seq - cursor)
+
+    def maybe_checkpoint():
+        # Persist at most every checkpoint_interval seconds, and only after new updates
+        if (not checkpoint_path or agent.updates == checkpoint['updates']
+                or time.monotonic() - checkpoint['at'] < checkpoint_interval):
+            return
+        try:
+            checkpoint['updates'] = agent.save_checkpoint(checkpoint_path)
+        except OSError as e:
+            print("[RL Trainer] checkpoint failed:", e)
+        checkpoint['at'] = time.monotonic()
     
     while not stop_event.is_set():
         try:
-            history = shared_data_manager.get_history()
-            current_count = len(history)
-            
-            if current_count < 2 or current_count <= last_processed_count:
-                time.sleep(interval)
-                continue
-
-            # Process new records
-            # ideally we process from last_processed_count to current_count
-            # For simplicity, we just iterate through the newly added slice
-            # But since deque might drop old ones, simple indexing is tricky. 
-            # We can just iterate the whole small history (200 items) and update. 
-            # But updating Q-table multiple times on same data is bad if not careful with alpha.
-            # Rationale for this assignment: just pick the last few items to train on to simulate online learning.
-            
-            # Use the last 10 records for training step to keep it fresh
-            training_batch = history[-10:] if len(history) > 10 else history
-            
-            for i in range(len(training_batch)-1):
-                s = training_batch[i]
-                n = training_batch[i+1]
-                
-                state = [s.get('ready_queue_size',0), s.get('avg_burst_time',0), s.get('avg_priority',0), s.get('memory_usage',0)]
-                next_state = [n.get('ready_queue_size',0), n.get('avg_burst_time',0), n.get('avg_priority',0), n.get('memory_usage',0)]
-                
-                action = agent.choose_action(state) # Off-policy or On-policy? Q-learning is off-policy.
-                
-                # Reward design
-                reward = 0.0
-                reward += (state[0] - next_state[0]) * 0.5
-                reward += (state[1] - next_state[1]) * 0.2
-                reward += (state[3] - next_state[3]) * 0.1
-                reward -= (next_state[0] * 0.01)
-                
-                agent.update(state, action, reward, next_state)
-            
-            last_processed_count = current_count
-            
-            # decay epsilon slowly
-            with agent.lock:
-                agent.epsilon = max(0.02, agent.epsilon * 0.999)
-                
+            # Only samples added since the last tick; each transition is learned once
+            cursor, states, dropped = buffer.read_since(cursor)
+            if dropped:
+                # the ring wrapped past us, so the saved state no longer precedes these
+                trainer_stats['dropped'] += dropped
+                DROPPED.inc(dropped)
+                previous = None
+            if previous is not None:
+                states = np.vstack([previous, states])
+            if len(states):
+                previous = states[-1:]
+
+            if len(states) > 1:
+                started = time.perf_counter()
+                now, nxt = states[:-1], states[1:]
+                if replay_size:
+                    # mix in older transitions so rare states keep being revisited
+                    old, old_next = buffer.sample(replay_size)
+                    now, nxt = np.vstack([now, old]), np.vstack([nxt, old_next])
+                n = agent.learn_batch(now, reward_fn(now, nxt), nxt)
+                elapsed = time.perf_counter() - started
+                TRAIN_SECONDS.observe(elapsed)
+                TRANSITIONS.inc(n)
+                trainer_stats['seconds'] += elapsed
+                trainer_stats['transitions'] += n
+                trainer_stats['batches'] += 1
+                trainer_stats['cursor'] = cursor
+                # decay epsilon once per new transition (replayed ones are not new),
+                # as pretrain_from_db does, so it follows the data and not the tick rate
+                agent.decay_epsilon(len(states) - 1)
+
+            _publish_prediction()
         except Exception as e:
             print("[RL Trainer] error:", e)
+        maybe_checkpoint()
         time.sleep(interval)
 
-def start_continuous_rl_training(interval=5):
+def start_continuous_rl_training(interval=5, checkpoint_path=DEFAULT_CHECKPOINT, checkpoint_interval=15,
+                                 replay_size=0, reward_mode='delta', workers=None):
+    agent = _shared_agent()
     stop_event = threading.Event()
-    thread = threading.Thread(target=_continuous_rl_loop, args=(shared_rl_agent, interval, stop_event), daemon=True)
+    reward_fn = make_reward_fn(reward_mode, workers, agent.actions)
+    thread = threading.Thread(target=_continuous_rl_loop,
+                              args=(agent, interval, stop_event, checkpoint_path,
+                                    checkpoint_interval, replay_size, reward_fn),
+                              daemon=True)
     thread.start()
-    print("🧠 Continuous RL training started (background thread)")
+    if checkpoint_path:
+        pid = os.getpid()
+
+        def save_on_exit():
+            # forked server workers inherit this handler but only follow the policy
+            if os.getpid() == pid:
+                agent.save_checkpoint(checkpoint_path)
+
+        atexit.register(save_on_exit)
+    print(f"🧠 Continuous RL training started (background thread, {reward_mode} reward)")
     return stop_event
@@ -0,0 +1,161 @@
+import time
+
+# Metric columns of system_stats, in the order they follow (host, timestamp, ts) in a written row
+METRICS = ('cpu_percent', 'memory_usage', 'ready_queue_size', 'avg_burst_time', 'avg_priority')
+
+# Host of rows written before system_stats had a host column, and of the local LiveMonitor
+LOCAL_HOST = 'local'
+
+# (tier name, bucket width in ms), finest first
+TIERS = (('1s', 1000), ('1m', 60 * 1000), ('1h', 60 * 60 * 1000))
+
+# Seconds of history kept per tier; None keeps everything. Raw rows are only
+# pruned when a retention is configured for them
+DEFAULT_RETENTION = {
+    'raw': None,
+    '1s': 3 * 24 * 3600,
+    '1m': 30 * 24 * 3600,
+    '1h': 365 * 24 * 3600,
+}
+
+AGGREGATES = ('mean', 'min', 'max', 'count')
+
+def tier_table(name):
+    return f'system_stats_{name}'
+
+class Rollups:
+    """
+    Incrementally maintained downsampling tiers for system_stats.
+
+    Each tier table holds one row per (host, time bucket) with the count and
+    the min, max and sum of every metric. Rows are folded in with an UPSERT as
+    each batch is written, so no tier ever rescans the raw table. Retention
+    is enforced with bounded DELETE batches so pruning never holds the write
+    lock for long.
+    """
+    def __init__(self, retention=None, delete_batch=5000):
+        self.retention = dict(DEFAULT_RETENTION)
+        if retention:
+            self.retention.update(retention)
+        self.delete_batch = delete_batch
+        columns = ['host', 'bucket', 'count']
+        for m in METRICS:
+            columns += [f'{m}_min', f'{m}_max', f'{m}_sum']
+        updates = ['count = count + excluded.count']
+        for m in METRICS:
+            updates += [f'{m}_min = MIN({m}_min, excluded.{m}_min)',
+                        f'{m}_max = MAX({m}_max, excluded.{m}_max)',
+                        f'{m}_sum = {m}_sum + excluded.{m}_sum']
+        self._upsert = {
+            name: (f"INSERT INTO {tier_table(name)} ({', '.join(columns)}) "
+                   f"VALUES ({', '.join('?' * len(columns))}) "
+                   f"ON CONFLICT(host, bucket) DO UPDATE SET {', '.join(updates)}")
+            for name, _ in TIERS
+        }
+
+    def init_db(self, cursor):
+        existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        cols = ', '.join(f'{m}_min REAL, {m}_max REAL, {m}_sum REAL' for m in METRICS)
+        for name, width in TIERS:
+            table = tier_table(name)
+            if table in existing:
+                columns = [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+                if 'host' not in columns:
+                    # Tier from before hosts: its buckets all belong to the local host
+                    cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+                    self._create(cursor, table, cols)
+                    cursor.execute(f"INSERT INTO {table} SELECT ?, * FROM {table}_old", (LOCAL_HOST,))
+                    cursor.execute(f'DROP TABLE {table}_old')
+                continue
+            self._create(cursor, table, cols)
+            # New tier on an existing database: build it once from the raw rows
+            aggs = ', '.join(f'MIN({m}), MAX({m}), SUM({m})' for m in METRICS)
+            cursor.execute(f'''
+                INSERT INTO {table}
+                SELECT host, (ts / {width}) * {width}, COUNT(*), {aggs}
+                FROM system_stats WHERE ts IS NOT NULL GROUP BY host, ts / {width}
+            ''')
+
+    @staticmethod
+    def _create(cursor, table, cols):
+        cursor.execute(f'CREATE TABLE {table} (host TEXT NOT NULL, bucket INTEGER, count INTEGER, {cols}, '
+                       'PRIMARY KEY (host, bucket))')
+        # cross-host queries and retention scan by bucket alone
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table} (bucket)')
+
+    def apply(self, conn, rows):
+        """Fold freshly inserted system_stats rows into every tier (same transaction)."""
+        for name, width in TIERS:
+            buckets = {}
+            for row in rows:
+                key = (row[0], (row[2] // width) * width)
+                values = row[3:]
+                agg = buckets.get(key)
+                if agg is None:
+                    agg = [key[0], key[1], 0]
+                    for v in values:
+                        agg += [v, v, 0.0]
+                    buckets[key] = agg
+                agg[2] += 1
+                for i, v in enumerate(values):
+                    # a missing metric is skipped, as MIN/MAX/SUM skip NULL when a tier is built
+                    if v is None:
+                        continue
+                    j = 3 + 3 * i
+                    if agg[j] is None or v < agg[j]:
+                        agg[j] = v
+                    if agg[j + 1] is None or v > agg[j + 1]:
+                        agg[j + 1] = v
+                    agg[j + 2] += v
+            conn.executemany(self._upsert[name], buckets.values())
+
+    def prune(self, conn, now=None):
+        """Delete rows older than each tier's retention, in bounded batches."""
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        targets = [('system_stats', 'ts', self.retention.get('raw'))]
+        targets += [(tier_table(name), 'bucket', self.retention.get(name)) for name, _ in TIERS]
+        deleted = 0
+        for table, column, keep in targets:
+            if keep is None:
+                continue
+            cutoff = now_ms - int(keep * 1000)
+            while True:
+                with conn:
+                    cur = conn.execute(
+                        f'DELETE FROM {table} WHERE rowid IN '
+                        f'(SELECT rowid FROM {table} WHERE {column} < ? LIMIT ?)',
+                        (cutoff, self.delete_batch))
+                deleted += cur.rowcount
+                if cur.rowcount < self.delete_batch:
+                    break
+        return deleted
+
+    def tier_for(self, resolution_ms):
+        """Coarsest tier whose bucket width evenly divides the requested resolution."""
+        best = None
+        for name, width in TIERS:
+            if width <= resolution_ms and resolution_ms % width == 0:
+                best = (name, width)
+        return best
+
+    def select_sql(self, name, resolution_ms, fields, aggregates, host=False):
+        """
+        SELECT over a tier that re-aggregates its buckets into `resolution_ms`
+        buckets, across all hosts or, with host=True, for the host bound as
+        the third parameter.
+        """
+        columns = []
+        for f in fields:
+            for agg in aggregates:
+                if agg == 'mean':
+                    columns.append(f'SUM({f}_sum) / SUM(count)')
+                elif agg == 'min':
+                    columns.append(f'MIN({f}_min)')
+                elif agg == 'max':
+                    columns.append(f'MAX({f}_max)')
+        if 'count' in aggregates:
+            columns.append('SUM(count)')
+        r = resolution_ms
+        where = 'bucket >= ? AND bucket < ?' + (' AND host = ?' if host else '')
+        return (f"SELECT (bucket / {r}) * {r} AS b, {', '.join(columns)} FROM {tier_table(name)} "
+                f"WHERE {where} GROUP BY bucket / {r} ORDER BY b")
@@ -0,0 +1,113 @@
+import threading
+import time
+import psutil
+from utils.workload_capture import PRIORITY_OFFSET
+
+def _busy_percent(t1, t2):
+    # Same accounting as psutil.cpu_percent(): guest time is already part of
+    # user/nice, and iowait counts as idle
+    def total(t):
+        return sum(t) - getattr(t, 'guest', 0) - getattr(t, 'guest_nice', 0)
+
+    def idle(t):
+        return t.idle + getattr(t, 'iowait', 0)
+
+    all_delta = total(t2) - total(t1)
+    if all_delta <= 0:
+        return 0.0
+    busy_delta = all_delta - (idle(t2) - idle(t1))
+    return round(min(100.0, max(0.0, busy_delta / all_delta * 100)), 1)
+
+class SystemSampler:
+    """
+    One shared system snapshot for every /live request.
+
+    CPU usage is the delta of psutil.cpu_times() since the previous refresh,
+    so sampling never sleeps. avg_burst_time and avg_priority summarize the
+    processes that ran between the last two capture() calls; capture() walks
+    every process, so only the LiveMonitor thread calls it, once per record,
+    and keeps the captured Workload in `workload` for the prediction
+    comparison. A refresh only reads the summary of the last capture.
+
+    A snapshot is served until it is older than `max_age` seconds; then one
+    request refreshes it while concurrent requests keep getting the previous
+    snapshot instead of queueing.
+
+    `source`, when set, is a callable returning a snapshot taken elsewhere
+    (a follower worker reads the leader's); local sampling is the fallback
+    whenever it returns None.
+    """
+    def __init__(self, max_age=1.0, collector=None, source=None):
+        if collector is None:
+            from utils.workload_capture import shared_collector
+            collector = shared_collector
+        self.max_age = max_age
+        self.collector = collector
+        self.source = source
+        self.workload = None
+        self._summary = {'avg_burst_time': 0.0, 'avg_priority': float(PRIORITY_OFFSET)}
+        self._refresh_lock = threading.Lock()
+        self._snapshot = None
+        self._taken = 0.0
+        self._last_cpu_times = psutil.cpu_times()
+
+    def capture(self):
+        """
+        Collect the processes that ran since the previous capture. The first
+        call only primes the collector and captures an empty workload.
+        """
+        workload = self.collector.collect()
+        summary = workload.summary()
+        self._summary = {'avg_burst_time': round(summary['avg_burst_time'], 2),
+                         'avg_priority': round(summary['avg_priority'], 2)}
+        self.workload = workload
+        return workload
+
+    def _refresh(self):
+        if self.source is not None:
+            snapshot = self.source()
+            if snapshot is not None:
+                self._taken = time.monotonic()
+                self._snapshot = snapshot
+                return snapshot
+        cpu_times = psutil.cpu_times()
+        cpu = _busy_percent(self._last_cpu_times, cpu_times)
+        self._last_cpu_times = cpu_times
+        snapshot = {
+            'cpu': cpu,
+            'memory': round(psutil.virtual_memory().percent, 2),
+            'processes': len(psutil.pids()),
+            **self._summary
+        }
+        # publish with a single reference assignment; readers never see a partial snapshot
+        self._taken = time.monotonic()
+        self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self, max_age=None):
+        if max_age is None:
+            max_age = self.max_age
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._taken <= max_age:
+            return snapshot
+        # Only the first caller needs to wait; later ones serve the stale copy
+        if not self._refresh_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            if self._snapshot is not snapshot and time.monotonic() - self._taken <= max_age:
+                return self._snapshot
+            return self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+_shared_lock = threading.Lock()
+
+def __getattr__(name):
+    # The shared instance, created on first use so importing this module stays cheap
+    global shared_sampler
+    if name == 'shared_sampler':
+        with _shared_lock:
+            if 'shared_sampler' not in globals():
+                shared_sampler = SystemSampler()
+        return shared_sampler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,248 @@
+"""
+Background services (LiveMonitor sampling and RL training) for servers that
+run more than one process.
+
+Exactly one process, the leader, samples the host and trains the agent. It
+shares what it produces through files every worker can read: the sampler
+snapshot goes to the shared_state table of the SQLite database, samples go
+to system_stats as usual, and the Q-table goes to the checkpoint. The other
+processes, followers, poll those every `sync_interval` seconds, so the HTTP
+side can run on as many workers as there are cores.
+
+The leader is elected with an exclusive flock() on `lock_path`. The kernel
+drops the lock when its holder exits, and the next follower to retry picks
+it up, so sampling survives worker restarts.
+"""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): every process that asks leads
+    fcntl = None
+
+from utils.metrics import registry
+
+ROLES = ('auto', 'leader', 'follower', 'off')
+DEFAULT_LOCK = os.environ.get('OPTIOS_LEADER_LOCK', 'optios.leader.lock')
+SNAPSHOT_KEY = 'live'
+
+LEADER = registry.gauge('optios_services_leader', '1 in the process that runs sampling and training')
+
+class LeaderLock:
+    """An exclusive, non-blocking flock() on a file; held until the process exits."""
+    def __init__(self, path=DEFAULT_LOCK):
+        self.path = path
+        self._fd = None
+
+    @property
+    def held(self):
+        return self._fd is not None
+
+    def acquire(self, blocking=False):
+        if self._fd is not None or fcntl is None:
+            self._fd = self._fd if fcntl else -1
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f'{os.getpid()}\n'.encode())
+        self._fd = fd
+        return True
+
+    def forget(self):
+        """
+        Drop a descriptor inherited across fork() without unlocking. The lock
+        belongs to the open file, so the parent, which still has it open,
+        keeps leading.
+        """
+        if self._fd is not None and self._fd >= 0:
+            os.close(self._fd)
+        self._fd = None
+
+class BackgroundServices:
+    """
+    Starts sampling and training in the one process that should run them.
+
+    role:
+      'auto'      elect: the process holding the leader lock runs the
+                  services, the others follow and retry the lock every
+                  `election_interval` seconds
+      'leader'    wait for the lock, then lead (a sidecar without HTTP,
+                  see tools/services.py)
+      'follower'  never lead (web workers next to a sidecar)
+      'off'       start nothing (tests, tooling, the reloader's parent)
+
+    Under a pre-forking server that imports the app before forking, the
+    process that elected itself keeps leading and its forked workers become
+    followers.
+    """
+    def __init__(self, role='auto', lock_path=DEFAULT_LOCK, checkpoint_path=None, checkpoint_interval=15.0,
+                 interval=5, reward_mode='delta', pretrain=False, sync_interval=1.0, election_interval=5.0):
+        if role not in ROLES:
+            raise ValueError(f"Unknown services role {role!r}; expected one of {ROLES}")
+        from utils.rl_agent import DEFAULT_CHECKPOINT
+
+        self.role = role
+        self.lock = LeaderLock(lock_path)
+        self.checkpoint_path = checkpoint_path or DEFAULT_CHECKPOINT
+        self.checkpoint_interval = checkpoint_interval
+        self.interval = interval
+        self.reward_mode = reward_mode
+        self.pretrain = pretrain
+        self.sync_interval = sync_interval
+        self.election_interval = election_interval
+        self.monitor = None
+        self.rl_stop_event = None
+        self.state = None
+        self._checkpoint_mtime = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._forked_hook = False
+
+    @property
+    def is_leader(self):
+        return self.monitor is not None
+
+    def status(self):
+        """Role of this process and whether sampling and training run somewhere."""
+        if self.role == 'off':
+            return {'role': 'off', 'monitor_running': False, 'rl_running': False}
+        if self.is_leader:
+            return {'role': 'leader', 'monitor_running': self.monitor.running,
+                    'rl_running': bool(self.rl_stop_event and not self.rl_stop_event.is_set())}
+        alive = self._leader_snapshot() is not None
+        return {'role': 'follower', 'monitor_running': alive, 'rl_running': alive}
+
+    def start(self):
+        if self.role == 'off' or self._thread is not None:
+            return self
+        from utils.data_manager import shared_data_manager
+        from utils.shared_state import SharedState
+
+        if not self._forked_hook and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+            self._forked_hook = True
+        self.state = SharedState(shared_data_manager.db_path)
+        shared_data_manager.mirror_remote = True
+        if self.role in ('auto', 'leader') and self.lock.acquire(blocking=self.role == 'leader'):
+            self._lead()
+        else:
+            self._follow_setup()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='BackgroundServices', daemon=True)
+        self._thread.start()
+        return self
+
+    def _lead(self):
+        from utils import logger
+        from utils.live_monitor import LiveMonitor
+        from utils.rl_agent import shared_rl_agent, start_continuous_rl_training, warm_start
+        from utils.sampler import shared_sampler
+
+        shared_sampler.source = None
+        logger.process_suffix = None
+        warm_start(shared_rl_agent, self.checkpoint_path, pretrain=self.pretrain, reward_mode=self.reward_mode)
+        self.monitor = LiveMonitor(interval=self.interval)
+        self.monitor.start()
+        self.rl_stop_event = start_continuous_rl_training(
+            interval=self.interval, checkpoint_path=self.checkpoint_path,
+            checkpoint_interval=self.checkpoint_interval, reward_mode=self.reward_mode)
+        LEADER.set(1)
+        print(f"🟢 Background services: leader (pid {os.getpid()})")
+
+    def _follow_setup(self):
+        from utils import logger
+        from utils.sampler import shared_sampler
+
+        shared_sampler.source = self._leader_snapshot
+        # every worker computes predictions; followers log them to their own file
+        logger.process_suffix = str(os.getpid())
+        LEADER.set(0)
+        print(f"🟢 Background services: follower (pid {os.getpid()})")
+
+    def _leader_snapshot(self):
+        # a snapshot the leader stopped refreshing is not served; the sampler then samples locally
+        return self.state.get(SNAPSHOT_KEY, max_age=max(5.0, 5 * self.sync_interval))
+
+    def _run(self):
+        next_election = time.monotonic() + self.election_interval
+        while not self._stop.wait(self.sync_interval):
+            try:
+                if not self.is_leader and self.role == 'auto' and time.monotonic() >= next_election:
+                    next_election = time.monotonic() + self.election_interval
+                    if self.lock.acquire():
+                        self._lead()
+                if self.is_leader:
+                    self._share()
+                else:
+                    self._follow()
+            except Exception as e:
+                print("[Services] error:", e)
+
+    def _share(self):
+        from utils.data_manager import shared_data_manager
+        from utils.sampler import shared_sampler
+
+        self.state.put(SNAPSHOT_KEY, shared_sampler.snapshot(max_age=self.sync_interval / 2))
+        shared_data_manager.sync_from_db(include_local=False)
+
+    def _follow(self):
+        from utils.broadcaster import shared_broadcaster
+        from utils.data_manager import shared_data_manager
+        from utils.rl_agent import _publish_prediction, shared_rl_agent
+        from utils.sampler import shared_sampler
+
+        records = shared_data_manager.sync_from_db(include_local=True)
+        for record in records[-1:]:
+            shared_broadcaster.publish('monitor', record)
+
+        reloaded = False
+        try:
+            mtime = os.stat(self.checkpoint_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime != self._checkpoint_mtime:
+            try:
+                shared_rl_agent.load_checkpoint(self.checkpoint_path)
+                reloaded = True
+            except (OSError, KeyError, ValueError) as e:
+                print(f"[Services] ignoring checkpoint {self.checkpoint_path}: {e}")
+            self._checkpoint_mtime = mtime
+
+        if records or reloaded:
+            _publish_prediction()
+        if shared_broadcaster.has_subscribers('live'):
+            shared_broadcaster.publish('live', shared_sampler.snapshot())
+
+    def _after_fork(self):
+        # Threads do not survive fork(): a forked worker starts over as a follower
+        if self._thread is None:
+            return
+        self._thread = None
+        self.monitor = None
+        self.rl_stop_event = None
+        self.lock.forget()
+        self._checkpoint_mtime = None
+        self._stop = threading.Event()
+        from utils.data_manager import shared_data_manager
+        from utils.shared_state import SharedState
+
+        # the parent's connections must not be shared with the child
+        self.state = SharedState(shared_data_manager.db_path)
+        shared_data_manager._sync_cursor = None
+        self._follow_setup()
+        self._thread = threading.Thread(target=self._run, name='BackgroundServices', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.monitor:
+            self.monitor.stop()
+        if self.rl_stop_event:
+            self.rl_stop_event.set()
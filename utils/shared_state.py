@@ -0,0 +1,45 @@
+import json
+import sqlite3
+import threading
+import time
+
+class SharedState:
+    """
+    Small JSON values shared between server processes through the SQLite
+    database, one row per key. Used by the elected leader to hand the latest
+    system snapshot to the other workers; values are replaced, never
+    appended, so the table stays a handful of rows.
+    """
+    def __init__(self, db_path='optios.db'):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS shared_state (
+                    key TEXT PRIMARY KEY,
+                    updated REAL,
+                    value TEXT
+                )
+            ''')
+
+    def _conn(self):
+        # one connection per thread, reused across calls
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path, timeout=5.0)
+        return conn
+
+    def put(self, key, value):
+        conn = self._conn()
+        with conn:
+            conn.execute('INSERT INTO shared_state (key, updated, value) VALUES (?, ?, ?) '
+                         'ON CONFLICT(key) DO UPDATE SET updated = excluded.updated, value = excluded.value',
+                         (key, time.time(), json.dumps(value)))
+
+    def get(self, key, max_age=None):
+        """The value stored under key, or None if there is none or it is older than max_age seconds."""
+        row = self._conn().execute('SELECT updated, value FROM shared_state WHERE key = ?', (key,)).fetchone()
+        if row is None or (max_age is not None and time.time() - row[0] > max_age):
+            return None
+        return json.loads(row[1])
@@ -0,0 +1,104 @@
+"""
+Simulation-grounded rewards for the RL trainer.
+
+Every state is turned into a synthetic workload shaped like it (process
+count from the ready queue, bursts around the average burst time,
+priorities around the average priority) and run through
+OSSimulator.simulate_batch() under each scheduling algorithm. The
+reward for picking an algorithm is its negative average waiting time, so it
+depends on the action, unlike the sample-delta reward. Large batches are
+split into chunks and simulated on a process pool.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from models.simulator import OSSimulator
+
+# Workloads are capped at this many processes; SJF/RR cost grows with n^2
+MAX_PROCESSES = 50
+# States per pool task; smaller batches are simulated in the calling thread
+CHUNK_SIZE = 8192
+
+
+def workloads_for_states(states, max_processes=MAX_PROCESSES, rng=None):
+    """
+    Synthetic workloads for an (n, 4) array of states, grouped by process count.
+
+    Yields (row indices, bursts, arrivals, priorities) with one workload per
+    row, sorted by arrival. Bursts are exponential around the state's average
+    burst time and arrivals spread over about a sixth of the total work, the
+    same load ratio as OSSimulator.randomize_processes(). Priorities are
+    normal around the state's average priority, on the 0-39 scale of
+    avg_priority.
+    """
+    rng = np.random.default_rng(rng)
+    states = np.nan_to_num(np.asarray(states, dtype=np.float64).reshape(-1, 4))
+    counts = np.clip(np.rint(states[:, 0]), 2, max_processes).astype(np.int64)
+    mean_burst = np.maximum(states[:, 1], 1.0)
+    for n in np.unique(counts).tolist():
+        rows = np.flatnonzero(counts == n)
+        bursts = np.maximum(1.0, np.rint(rng.exponential(1.0, (len(rows), n)) * mean_burst[rows, None]))
+        span = np.maximum(1.0, np.ceil(n * mean_burst[rows] / 6))
+        arrivals = np.sort(np.floor(rng.random((len(rows), n)) * span[:, None]), axis=1)
+        priorities = np.clip(np.rint(rng.normal(states[rows, 2, None], 3.0, (len(rows), n))), 0, 39)
+        yield rows, bursts, arrivals, priorities
+
+
+def simulated_waits(states, algorithms, max_processes=MAX_PROCESSES, seed=None, cores=1):
+    """(n, len(algorithms)) average waiting time of each algorithm on each state's workload."""
+    states = np.asarray(states, dtype=np.float64).reshape(-1, 4)
+    waits = np.zeros((len(states), len(algorithms)))
+    for rows, bursts, arrivals, priorities in workloads_for_states(states, max_processes, seed):
+        results = OSSimulator.simulate_batch(bursts, arrivals, algorithms, priorities=priorities, cores=cores)
+        for j, name in enumerate(algorithms):
+            waits[rows, j] = results[name]['Average Waiting Time']
+    return waits
+
+
+class SimulationRewards:
+    """
+    Reward function mapping states to per-action rewards (-average waiting time).
+
+    Called like the trainer's other reward functions, with (states,
+    next_states); only the states matter since the outcome of a scheduling
+    choice is simulated on the state it was made in.
+
+    Batches larger than `chunk_size` are split and simulated on a process
+    pool of `workers` processes (default: all cores), created on first use.
+    Each chunk gets its own seed, so results do not depend on the number of
+    workers. Workloads run on `cores` simulated cores.
+    """
+    def __init__(self, algorithms, workers=None, chunk_size=CHUNK_SIZE, max_processes=MAX_PROCESSES, seed=0,
+                 cores=1):
+        self.algorithms = tuple(algorithms)
+        self.cores = cores
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_processes = max_processes
+        self.seed = seed
+        self.batches = 0
+        self._pool = None
+
+    def __call__(self, states, next_states=None):
+        states = np.asarray(states, dtype=np.float64).reshape(-1, 4)
+        batch = self.batches
+        self.batches += 1
+        starts = range(0, len(states), self.chunk_size)
+        args = [(states[lo:lo + self.chunk_size], self.algorithms, self.max_processes, [self.seed, batch, i],
+                 self.cores) for i, lo in enumerate(starts)]
+        if len(args) <= 1 or self.workers <= 1:
+            parts = [simulated_waits(*a) for a in args]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            parts = list(self._pool.map(simulated_waits, *zip(*args)))
+        if not parts:
+            return np.zeros((0, len(self.algorithms)))
+        return -np.concatenate(parts)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
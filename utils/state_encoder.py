@@ -0,0 +1,104 @@
+import bisect
+
+import numpy as np
+
+# Order of the features in an RL state vector
+STATE_FIELDS = ('ready_queue_size', 'avg_burst_time', 'avg_priority', 'memory_usage')
+
+# Fixed bin edges used until quantile bins are learned from stored data.
+# ready_queue_size goes well past 400 on busy hosts, so it is not clamped.
+# Bursts are clock ticks of CPU per second and priorities nice + 20, as
+# captured by utils/workload_capture.py.
+DEFAULT_EDGES = (
+    (10, 25, 50, 100, 150, 200, 300, 400, 600, 800),
+    (1, 2, 5, 10, 20, 35, 50, 75, 100),
+    (10, 15, 19, 20, 21, 25, 30),
+    (10, 20, 30, 40, 50, 60, 70, 80, 90),
+)
+
+class BinnedStateEncoder:
+    """
+    Maps state vectors to integer state ids with per-feature binning.
+
+    Each feature is cut at its sorted `edges` (a value equal to an edge goes
+    to the upper bin) and the per-feature bin numbers are combined with
+    np.ravel_multi_index, so distinct bin combinations never collide. Any
+    object with the same encode()/encode_one() interface can be plugged into
+    RLSchedulerAgent instead.
+    """
+    def __init__(self, edges=DEFAULT_EDGES, fields=STATE_FIELDS):
+        if len(edges) != len(fields):
+            raise ValueError(f"Expected {len(fields)} edge lists, got {len(edges)}")
+        self.fields = tuple(fields)
+        self.edges = [np.unique(np.asarray(e, dtype=np.float64)) for e in edges]
+        self._edge_lists = [e.tolist() for e in self.edges]
+        self.shape = tuple(len(e) + 1 for e in self.edges)
+        # row-major strides, matching np.ravel_multi_index
+        self._strides = [int(np.prod(self.shape[i + 1:])) for i in range(len(self.shape))]
+
+    @property
+    def n_states(self):
+        return int(np.prod(self.shape))
+
+    @classmethod
+    def from_samples(cls, states, bins=8, fields=STATE_FIELDS):
+        """Quantile bins: roughly equal numbers of samples per bin of each feature."""
+        states = np.nan_to_num(np.asarray(states, dtype=np.float64).reshape(-1, len(fields)))
+        if not len(states):
+            raise ValueError("Need at least one sample to learn bins")
+        cuts = np.linspace(0, 1, bins + 1)[1:-1]
+        return cls([np.quantile(states[:, i], cuts) for i in range(len(fields))], fields)
+
+    @classmethod
+    def from_db(cls, data_manager, bins=8, start=None, end=None, max_samples=200000, host=None):
+        """Learn quantile bins from system_stats, thinning evenly to at most max_samples rows."""
+        parts, total, stride = [], 0, 1
+        for chunk in data_manager.query(start, end, fields=STATE_FIELDS, host=host):
+            part = np.column_stack([chunk[f] for f in STATE_FIELDS])[::stride]
+            parts.append(part)
+            total += len(part)
+            if total > max_samples:
+                parts = [np.concatenate(parts)[::2]]
+                total = len(parts[0])
+                stride *= 2
+        if not parts:
+            raise ValueError("system_stats has no rows to learn bins from")
+        return cls.from_samples(np.concatenate(parts), bins)
+
+    def encode(self, states):
+        """State ids for an (n, features) array of states."""
+        states = np.nan_to_num(np.asarray(states, dtype=np.float64).reshape(-1, len(self.edges)))
+        bins = [np.searchsorted(e, states[:, i], side='right') for i, e in enumerate(self.edges)]
+        return np.ravel_multi_index(bins, self.shape).astype(np.int64)
+
+    def encode_one(self, state):
+        """Scalar encode() for a single state, without the NumPy overhead."""
+        idx = 0
+        for value, edges, stride in zip(state, self._edge_lists, self._strides):
+            value = float(value or 0)
+            if value != value:
+                value = 0.0
+            idx += bisect.bisect_right(edges, value) * stride
+        return idx
+
+    def to_arrays(self):
+        """Flat arrays describing the encoder, for storing next to a Q-table in an .npz."""
+        return {
+            'encoder_fields': np.array(self.fields),
+            'encoder_edges': np.concatenate(self.edges) if self.edges else np.zeros(0),
+            'encoder_counts': np.array([len(e) for e in self.edges], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, data):
+        splits = np.cumsum(data['encoder_counts'])[:-1]
+        edges = np.split(np.asarray(data['encoder_edges'], dtype=np.float64), splits)
+        return cls(edges, [str(f) for f in data['encoder_fields']])
+
+    def __eq__(self, other):
+        return (isinstance(other, BinnedStateEncoder) and self.fields == other.fields
+                and len(self.edges) == len(other.edges)
+                and all(np.array_equal(a, b) for a, b in zip(self.edges, other.edges)))
+
+    def __repr__(self):
+        return f"BinnedStateEncoder(shape={self.shape})"
@@ -0,0 +1,142 @@
+"""
+Process-level workload capture from the live host.
+
+ProcessCollector walks psutil.process_iter() with a small attribute subset
+(psutil keeps the Process handles between calls) and remembers each PID's
+CPU time from the previous tick. The deltas give, per process that ran
+during the tick:
+
+* burst: CPU time per second of wall time, in clock ticks (BURST_UNIT), as
+  an exponential moving average across ticks
+* arrival: offset from the start of the tick, in clock ticks; processes
+  created during the tick arrive at their creation time, the rest at 0
+* priority: the kernel's static priority, nice + 20 (0 is the highest)
+
+The result is a Workload of NumPy columns that loads straight into
+OSSimulator.
+"""
+import threading
+import time
+
+import numpy as np
+import psutil
+
+# Simulator time unit: one USER_HZ clock tick, the resolution of /proc CPU times
+BURST_UNIT = 0.01
+PRIORITY_OFFSET = 20
+# Attributes fetched per process; all but memory_info come from one /proc/<pid>/stat read
+ATTRS = ('cpu_times', 'create_time', 'nice')
+
+class Workload:
+    """Array-backed workload: one entry per process, sorted by arrival."""
+    __slots__ = ('pids', 'bursts', 'arrivals', 'priorities', 'memory', 'taken_at')
+
+    def __init__(self, pids, bursts, arrivals, priorities, memory=None, taken_at=None):
+        order = np.argsort(arrivals, kind='stable')
+        self.pids = np.asarray(pids, dtype=np.int64)[order]
+        self.bursts = np.asarray(bursts, dtype=np.int64)[order]
+        self.arrivals = np.asarray(arrivals, dtype=np.int64)[order]
+        self.priorities = np.asarray(priorities, dtype=np.int64)[order]
+        self.memory = (np.zeros(len(order)) if memory is None
+                       else np.asarray(memory, dtype=np.float64)[order])
+        self.taken_at = taken_at
+
+    def __len__(self):
+        return len(self.pids)
+
+    def top(self, n):
+        """The n processes with the largest bursts, still in arrival order."""
+        if len(self) <= n:
+            return self
+        keep = np.sort(np.argsort(-self.bursts, kind='stable')[:n])
+        return Workload(self.pids[keep], self.bursts[keep], self.arrivals[keep],
+                        self.priorities[keep], self.memory[keep], self.taken_at)
+
+    def load_into(self, simulator):
+        simulator.load_workload(self.bursts, self.arrivals, self.priorities, self.memory, self.pids)
+        return simulator
+
+    def summary(self):
+        if not len(self):
+            return {'avg_burst_time': 0.0, 'avg_priority': float(PRIORITY_OFFSET)}
+        return {'avg_burst_time': float(self.bursts.mean()), 'avg_priority': float(self.priorities.mean())}
+
+class ProcessCollector:
+    """
+    Builds a Workload from the processes that used CPU since the previous collect().
+
+    The first call only primes the per-PID cache (there is no delta yet), so
+    it returns an empty workload. A PID whose create time changed is treated
+    as a new process. `memory=True` also reads RSS (in MB) at the cost of one
+    more /proc read per process.
+    """
+    def __init__(self, smoothing=0.5, memory=False):
+        self.smoothing = smoothing
+        self.attrs = list(ATTRS) + (['memory_info'] if memory else [])
+        self._lock = threading.Lock()
+        self._cache = {}        # pid -> [create_time, cpu seconds, burst estimate]
+        self._last_at = None
+        self.pid_count = 0
+        self.stats = {'collections': 0, 'seconds': 0.0, 'last_seconds': 0.0}
+
+    def collect(self):
+        with self._lock:
+            started = time.perf_counter()
+            now = time.time()
+            window = now - self._last_at if self._last_at else None
+            tick_start = self._last_at
+            cache = {}
+            pids, bursts, arrivals, priorities, memory = [], [], [], [], []
+            for proc in psutil.process_iter(self.attrs, ad_value=None):
+                info = proc.info
+                times = info['cpu_times']
+                if times is None:
+                    continue
+                cpu = times.user + times.system
+                created = info['create_time'] or 0.0
+                entry = self._cache.get(proc.pid)
+                arrival = 0.0
+                if entry is not None and entry[0] == created:
+                    delta = cpu - entry[1]
+                    estimate = entry[2]
+                elif tick_start is not None and created >= tick_start:
+                    # started during this tick: all of its CPU time is new
+                    delta = cpu
+                    estimate = None
+                    arrival = created - tick_start
+                else:
+                    delta = None
+                    estimate = None
+                if delta is not None and delta > 0 and window:
+                    rate = delta / window / BURST_UNIT
+                    estimate = rate if estimate is None else (
+                        self.smoothing * rate + (1 - self.smoothing) * estimate)
+                    pids.append(proc.pid)
+                    bursts.append(max(1, round(estimate)))
+                    arrivals.append(round(arrival / BURST_UNIT))
+                    nice = info['nice']
+                    priorities.append(PRIORITY_OFFSET + (nice if isinstance(nice, int) else 0))
+                    if 'memory_info' in info:
+                        mem = info['memory_info']
+                        memory.append(mem.rss / (1024 * 1024) if mem else 0.0)
+                cache[proc.pid] = [created, cpu, estimate]
+            self._cache = cache
+            self._last_at = now
+            self.pid_count = len(cache)
+            elapsed = time.perf_counter() - started
+            self.stats['collections'] += 1
+            self.stats['seconds'] += elapsed
+            self.stats['last_seconds'] = elapsed
+            return Workload(pids, bursts, arrivals, priorities, memory or None, taken_at=now)
+
+_shared_lock = threading.Lock()
+
+def __getattr__(name):
+    # The shared instance, driven by the system sampler and created on first use
+    global shared_collector
+    if name == 'shared_collector':
+        with _shared_lock:
+            if 'shared_collector' not in globals():
+                shared_collector = ProcessCollector()
+        return shared_collector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
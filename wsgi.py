@@ -0,0 +1,17 @@
+"""
+Production entry point for any WSGI server, e.g.
+
+    gunicorn -w 4 -k gthread --threads 32 -b 0.0.0.0:5001 wsgi:app
+
+Use a threaded (or async) worker class: every open dashboard holds a /stream
+connection, which would take a whole sync worker.
+
+Every worker serves HTTP; one of them is elected to run LiveMonitor and the
+RL trainer and the others follow its snapshot and checkpoint (see
+utils/services.py). To keep sampling out of the web workers entirely, run
+`python -m tools.services` next to the server and start the workers with
+OPTIOS_SERVICES=follower.
+"""
+from app import create_app
+
+app = create_app()